@@ -1,5 +1,6 @@
+import sys
 import click
-from typing import Dict
+from typing import Dict, List, Tuple
 
 import commands
 
@@ -11,12 +12,32 @@ class Boo:
         'multi-update': 'multi-update',
         "upgrade": "upgrade",
         "check-updates": "check-updates",
+        "serve": "serve",
+        "diff-versions": "diff-versions",
+        "merge-results": "merge-results",
     }
 
+    # Mirrors output.FORMATS, which is not imported here to keep the CLI startup free of csv/json.
+    __formats: Tuple[str, ...] = ("table", "json", "ndjson", "csv")
+
+    # Mirrors profiling.MODES, profiling is only imported when a command is profiled.
+    __profiles: Tuple[str, ...] = ("summary", "trace", "cprofile")
+
     @classmethod
     def run(cls):
         cls.__register()
-        cls.__tool()
+        cls.__tool(args=cls.__arguments(sys.argv[1:]))
+
+    @classmethod
+    def __arguments(cls, args: List[str]) -> List[str]:
+        """
+        Click reads the argument after an option with an optional value as its value, so a bare `--profile`
+        followed by the command name takes its default mode explicitly.
+        """
+        return [
+            f"--profile={cls.__profiles[0]}" if argument == "--profile" and following in cls.__commands else argument
+            for argument, following in zip(args, [*args[1:], None])
+        ]
 
     @classmethod
     def __register(cls):
@@ -25,18 +46,67 @@ class Boo:
         cls.__tool.add_command(cls.multi_update)
         cls.__tool.add_command(cls.upgrade)
         cls.__tool.add_command(cls.check_updates)
+        cls.__tool.add_command(cls.serve)
+        cls.__tool.add_command(cls.diff_versions)
+        cls.__tool.add_command(cls.merge_results)
 
     @staticmethod
     @click.group()
-    def __tool():
-        pass
+    @click.option("--profile", type=click.Choice(__profiles), is_flag=False, flag_value=__profiles[0],
+                  default=None,
+                  help="Profile the command. summary prints wall time, CPU time, bytes read and written and "
+                       "subprocesses per phase and per plugin, trace writes a Chrome trace and cprofile runs "
+                       "cProfile on the main thread. Default: summary")
+    @click.option("--profile-output", type=click.Path(dir_okay=False),
+                  help="File the trace or the cProfile stats are written to. Default: boo-trace.json for traces, "
+                       "printed stats for cProfile.")
+    @click.pass_context
+    def __tool(context, profile, profile_output):
+        if profile is not None:
+            import profiling
+
+            context.call_on_close(profiling.start(profile, profile_output))
+
+    @staticmethod
+    def packager(level, store, incremental, reproducible, ignore_patterns, no_ignore):
+        # Imported here so that commands without zip options do not load the packaging dependencies.
+        import archive
+
+        return archive.Packager(
+            level=archive.DEFAULT_LEVEL if level is None else level,
+            store=store,
+            incremental=incremental,
+            reproducible=reproducible,
+            ignore_files=not no_ignore,
+            ignore_patterns=ignore_patterns
+        )
 
     @staticmethod
     @click.command(__commands['versions'])
-    @click.option('--path', default="./", help='Plugins directory path. Default: ./')
+    @click.option('--path', multiple=True, default=["./"],
+                  help='Plugins directory path, can be repeated to scan several directories. Default: ./')
+    @click.option('--depth', type=click.IntRange(min=1), default=1,
+                  help="Directory levels below every plugins directory that may contain plugins. Default: 1")
     @click.option('--style', default="outline", help="Set tabulate output style. Default: outline")
-    def versions(path, style):
-        command: commands.VersionsCommand = commands.VersionsCommand(path=path, style=style)
+    @click.option('--no-cache', is_flag=True,
+                  help="Do not use the header index stored under <path>/.boo/ or a running daemon.")
+    @click.option('--format', 'output_format', type=click.Choice(__formats), default=__formats[0],
+                  help="Output format. json, ndjson and csv stream one uncolored record per plugin. Default: table")
+    @click.option('--strict', is_flag=True, help="Only list plugins that also pass the wppcpy plugin checks.")
+    @click.option('--zips', is_flag=True,
+                  help="Read the plugins from the zip files in --path, or from --path itself, without extracting them.")
+    @click.option('--ref', metavar="REVISION", help="Read the plugins as of a Git revision, without checking it out.")
+    def versions(path, depth, style, no_cache, output_format, strict, zips, ref):
+        command: commands.VersionsCommand = commands.VersionsCommand(
+            path=path,
+            depth=depth,
+            style=style,
+            cache=not no_cache,
+            output_format=output_format,
+            strict=strict,
+            zips=zips,
+            ref=ref
+        )
         command.run()
 
     @staticmethod
@@ -46,41 +116,196 @@ class Boo:
     @click.option("-d", "--decrease", "decrease", default="0.0.0", help="Decrease version of plugins.")
     @click.option("-c", "--commit", is_flag=True, help="Commit changes to Git after updating.")
     @click.option("-z", "--zip", type=str, help="Path to save the zip files of updated plugins.")
-    def update(plugin_absolute_path, increase, decrease, commit, zip):
-        command: commands.UpdateCommand = commands.UpdateCommand(plugin_absolute_path, increase, decrease, commit, zip)
+    @click.option("--zip-level", type=click.IntRange(0, 9), default=None,
+                  help="Deflate compression level of the zip files, 0 stores every file. Default: 6")
+    @click.option("--zip-store", multiple=True, help="File extension to store uncompressed in the zip files.")
+    @click.option("--zip-incremental", is_flag=True,
+                  help="Reuse the compressed data of unchanged files from the previous zip of the plugin.")
+    @click.option("--zip-reproducible", is_flag=True,
+                  help="Write byte-identical zip files for identical content and link them from a content-addressed "
+                       "store under the zip directory.")
+    @click.option("--zip-ignore", multiple=True, metavar="PATTERN",
+                  help="Leave files matching a gitignore pattern out of the zip files, in addition to the "
+                       ".distignore and .booignore files of the plugins.")
+    @click.option("--zip-no-ignore", is_flag=True,
+                  help="Package every file, ignoring the default patterns and the ignore files of the plugins.")
+    def update(plugin_absolute_path, increase, decrease, commit, zip, zip_level, zip_store, zip_incremental,
+               zip_reproducible, zip_ignore, zip_no_ignore):
+        command: commands.UpdateCommand = commands.UpdateCommand(
+            plugin_absolute_path,
+            increase,
+            decrease,
+            commit,
+            zip,
+            packager=Boo.packager(zip_level, zip_store, zip_incremental, zip_reproducible, zip_ignore, zip_no_ignore)
+        )
         command.run()
 
     @staticmethod
     @click.command(__commands['multi-update'])
-    @click.option("-p", "--path", "plugins_path", default="./", help="Plugins directory path. Default: ./")
+    @click.option("-p", "--path", "plugins_path", multiple=True, default=["./"],
+                  help="Plugins directory path, can be repeated to update several directories. Default: ./")
+    @click.option("--depth", type=click.IntRange(min=1), default=1,
+                  help="Directory levels below every plugins directory that may contain plugins. Default: 1")
     @click.option("-i", "--increase", "increase", default="0.0.0", help="Increase version of plugins.")
     @click.option("-d", "--decrease", "decrease", default="0.0.0", help="Decrease version of plugins.")
-    @click.option("-i", "--include", "include", multiple=True, help="Include version of plugins.")
-    @click.option("-e", "--exclude", "exclude", multiple=True, help="Exclude version of plugins.")
+    @click.option("-i", "--include", "include", multiple=True,
+                  help="Only update plugins matching a name, glob (acme-*), re: regular expression, header "
+                       "predicate (version<2.0.0, requires_php>=8.1) or the patterns of an @file.")
+    @click.option("-e", "--exclude", "exclude", multiple=True,
+                  help="Do not update plugins matching a pattern, of the same kinds as --include.")
     @click.option("-s", "--style", "style", default="outline", help="Set tabulate output style.")
     @click.option("-c", "--commit", is_flag=True, help="Commit changes to Git after updating.")
     @click.option("-z", "--zip", type=str, help="Path to save the zip files of updated plugins.")
-    def multi_update(plugins_path, increase, decrease, include, exclude, style, commit, zip):
+    @click.option("-j", "--jobs", type=click.IntRange(min=1), default=1,
+                  help="Number of plugins updated concurrently. Default: 1")
+    @click.option("--zip-level", type=click.IntRange(0, 9), default=None,
+                  help="Deflate compression level of the zip files, 0 stores every file. Default: 6")
+    @click.option("--zip-store", multiple=True, help="File extension to store uncompressed in the zip files.")
+    @click.option("--zip-incremental", is_flag=True,
+                  help="Reuse the compressed data of unchanged files from the previous zip of the plugin.")
+    @click.option("--zip-reproducible", is_flag=True,
+                  help="Write byte-identical zip files for identical content and link them from a content-addressed "
+                       "store under the zip directory.")
+    @click.option("--zip-ignore", multiple=True, metavar="PATTERN",
+                  help="Leave files matching a gitignore pattern out of the zip files, in addition to the "
+                       ".distignore and .booignore files of the plugins.")
+    @click.option("--zip-no-ignore", is_flag=True,
+                  help="Package every file, ignoring the default patterns and the ignore files of the plugins.")
+    @click.option("--commit-per-plugin", is_flag=True, help="Commit every updated plugin separately.")
+    @click.option("--format", "output_format", type=click.Choice(__formats), default=__formats[0],
+                  help="Output format. json, ndjson and csv stream one uncolored record per plugin. Default: table")
+    @click.option("--dry-run", is_flag=True, help="Print the planned changes without touching any file.")
+    @click.option("--plan", "plan_path", type=click.Path(dir_okay=False, allow_dash=True),
+                  help="Save the planned changes as JSON to this file, - for stdout, without touching any file.")
+    @click.option("--apply-plan", type=click.Path(exists=True, dir_okay=False),
+                  help="Execute a saved plan instead of scanning the plugins. Path, versions and zip files "
+                       "are taken from the plan.")
+    @click.option("--transactional", is_flag=True,
+                  help="Stage all main files and zip files first, then replace them all at once, or none of them "
+                       "if any plugin fails.")
+    @click.option("--recover", type=click.Choice(("forward", "back")),
+                  help="Roll an interrupted transaction forward to the new files or back to the old ones.")
+    @click.option("--strict", is_flag=True, help="Only update plugins that also pass the wppcpy plugin checks.")
+    @click.option("--changed-since", metavar="REVISION",
+                  help="Only update plugins with changes in the work tree since a Git revision.")
+    @click.option("--changed", is_flag=True,
+                  help="Only update plugins whose content changed since they were last updated.")
+    @click.option("--shard", metavar="I/N",
+                  help="Only update the I-th of N shards of the plugins, balanced by their size. Runners with the "
+                       "same tree get the same split.")
+    @click.option("--results", "results_path", type=click.Path(dir_okay=False),
+                  help="Save the results as JSON to this file, for merge-results. "
+                       "Default with --shard: boo-results-I-of-N.json")
+    def multi_update(plugins_path, depth, increase, decrease, include, exclude, style, commit, zip, jobs, zip_level,
+                     zip_store, zip_incremental, zip_reproducible, zip_ignore, zip_no_ignore, commit_per_plugin,
+                     output_format, dry_run, plan_path, apply_plan, transactional, recover, strict, changed_since,
+                     changed, shard, results_path):
         command: commands.MultiUpdateCommand = commands.MultiUpdateCommand(
-            plugins_path,
-            increase,
-            decrease,
-            include,
-            exclude,
-            style,
-            commit,
-            zip
+            plugins_path=plugins_path,
+            increase=increase,
+            decrease=decrease,
+            include=include,
+            exclude=exclude,
+            style=style,
+            commit=commit or commit_per_plugin,
+            zip=zip,
+            jobs=jobs,
+            packager=Boo.packager(zip_level, zip_store, zip_incremental, zip_reproducible, zip_ignore, zip_no_ignore),
+            commit_per_plugin=commit_per_plugin,
+            output_format=output_format,
+            dry_run=dry_run,
+            plan_path=plan_path,
+            apply_plan=apply_plan,
+            transactional=transactional,
+            recover=recover,
+            depth=depth,
+            strict=strict,
+            changed_since=changed_since,
+            changed=changed,
+            shard=shard,
+            results_path=results_path
         )
         command.run()
 
     @staticmethod
     @click.command(__commands['upgrade'])
-    def upgrade():
-        command: commands.UpgradeCommand = commands.UpgradeCommand()
+    @click.option("--timeout", type=click.FloatRange(min=0, min_open=True), default=10.0,
+                  help="Seconds after which fetching from the remote is aborted. Default: 10")
+    def upgrade(timeout):
+        command: commands.UpgradeCommand = commands.UpgradeCommand(timeout=timeout)
         command.run()
 
     @staticmethod
     @click.command(__commands['check-updates'])
-    def check_updates():
-        command: commands.CheckUpdatesCommand = commands.CheckUpdatesCommand()
+    @click.option("--ttl", type=click.FloatRange(min=0), default=3600.0,
+                  help="Seconds the result of the last check is reused for, an older result is reported while it "
+                       "is refreshed in the background. Default: 3600")
+    @click.option("--timeout", type=click.FloatRange(min=0, min_open=True), default=10.0,
+                  help="Seconds after which fetching from the remote is aborted. Default: 10")
+    @click.option("--refresh", is_flag=True, help="Fetch now instead of answering from the cache.")
+    def check_updates(ttl, timeout, refresh):
+        command: commands.CheckUpdatesCommand = commands.CheckUpdatesCommand(
+            ttl=ttl,
+            timeout=timeout,
+            refresh=refresh
+        )
+        command.run()
+
+    @staticmethod
+    @click.command(__commands['serve'])
+    @click.option('--path', default="./", help='Plugins directory path. Default: ./')
+    @click.option('--polling', is_flag=True, help="Poll the main files instead of using inotify.")
+    @click.option('--interval', type=click.FloatRange(min=0.01), default=1.0,
+                  help="Seconds between two polls. Default: 1.0")
+    def serve(path, polling, interval):
+        command: commands.ServeCommand = commands.ServeCommand(
+            path=path,
+            polling=polling,
+            interval=interval
+        )
+        command.run()
+
+    @staticmethod
+    @click.command(__commands['diff-versions'])
+    @click.argument("old_ref")
+    @click.argument("new_ref")
+    @click.option('--path', multiple=True, default=["./"],
+                  help='Plugins directory path, can be repeated to compare several directories. Default: ./')
+    @click.option('--depth', type=click.IntRange(min=1), default=1,
+                  help="Directory levels below every plugins directory that may contain plugins. Default: 1")
+    @click.option('--style', default="outline", help="Set tabulate output style. Default: outline")
+    @click.option('--format', 'output_format', type=click.Choice(__formats), default=__formats[0],
+                  help="Output format. Default: table")
+    @click.option('--all', 'unchanged', is_flag=True, help="Also list the plugins whose version did not change.")
+    def diff_versions(old_ref, new_ref, path, depth, style, output_format, unchanged):
+        command: commands.DiffVersionsCommand = commands.DiffVersionsCommand(
+            old_ref,
+            new_ref,
+            path=path,
+            depth=depth,
+            style=style,
+            output_format=output_format,
+            unchanged=unchanged
+        )
+        command.run()
+
+    @staticmethod
+    @click.command(__commands['merge-results'])
+    @click.argument("results_paths", metavar="RESULTS...", nargs=-1, required=True,
+                    type=click.Path(exists=True, dir_okay=False))
+    @click.option("-c", "--commit", is_flag=True,
+                  help="Write the new versions to the main files of this tree and commit them to Git.")
+    @click.option("--commit-per-plugin", is_flag=True, help="Commit every updated plugin separately.")
+    @click.option("-s", "--style", "style", default="outline", help="Set tabulate output style.")
+    @click.option("--format", "output_format", type=click.Choice(__formats), default=__formats[0],
+                  help="Output format. json, ndjson and csv stream one uncolored record per plugin. Default: table")
+    def merge_results(results_paths, commit, commit_per_plugin, style, output_format):
+        command: commands.MergeResultsCommand = commands.MergeResultsCommand(
+            results_paths,
+            commit=commit or commit_per_plugin,
+            commit_per_plugin=commit_per_plugin,
+            style=style,
+            output_format=output_format
+        )
         command.run()
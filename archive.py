@@ -0,0 +1,651 @@
+import hashlib
+import os
+import re
+import stat
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+import ignore
+import profiling
+
+if TYPE_CHECKING:
+    import artifacts
+
+DEFAULT_LEVEL = 6
+
+# Formats already compressed by their own codec; deflating them again costs CPU for (almost) no gain.
+STORED_EXTENSIONS = frozenset({
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".avif",
+    ".woff", ".woff2",
+    ".zip", ".gz", ".tgz", ".bz2", ".xz", ".7z", ".rar",
+    ".mp3", ".mp4", ".m4a", ".ogg", ".webm", ".mov",
+})
+
+# DOS timestamps stored in zip files have a two seconds resolution.
+DOS_TIME_RESOLUTION = 2
+
+# Timestamp of every member of a reproducible zip file, unless SOURCE_DATE_EPOCH is set.
+REPRODUCIBLE_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+UNIX_SYSTEM = 3
+KEY_VERSION = 2
+CHUNK_SIZE = 1 << 20
+
+# Files of at least this size are compressed chunk by chunk while they are written, instead of whole in memory
+# on the thread pool.
+STREAM_SIZE = 8 << 20
+
+ZIP64_LIMIT = (1 << 31) - 1
+ZIP_FILECOUNT_LIMIT = (1 << 16) - 1
+ZIP64_VERSION = 45
+UTF8_FLAG = 0x800
+DATA_DESCRIPTOR_FLAG = 0x8
+
+LOCAL_FILE_HEADER = struct.Struct("<4s2B4HL2L2H")
+CENTRAL_DIRECTORY = struct.Struct("<4s4B4HL2L5H2L")
+END_OF_CENTRAL_DIRECTORY = struct.Struct("<4s4H2LH")
+END_OF_CENTRAL_DIRECTORY_64 = struct.Struct("<4sQ2H2L4Q")
+END_OF_CENTRAL_DIRECTORY_64_LOCATOR = struct.Struct("<4sLQL")
+DATA_DESCRIPTOR = struct.Struct("<4sL2L")
+DATA_DESCRIPTOR_64 = struct.Struct("<4sL2Q")
+
+# Archive comment recording the deflate level, members of a zip file built with another level are not reused.
+LEVEL_COMMENT = "boo level={level}"
+LEVEL_COMMENT_REGEX = re.compile(rb"boo level=(\d+)")
+
+
+class Member(NamedTuple):
+    """
+    A zip member whose data is already compressed with `info.compress_type`, or a large member whose compressed
+    chunks are produced while it is written. The CRC and sizes of a streamed member are only set in `info` once
+    its chunks are exhausted.
+    """
+    info: zipfile.ZipInfo
+    data: Optional[bytes]
+    chunks: Optional[Iterator[bytes]] = None
+
+
+def compress(path: str, arcname: str, compress_type: int, level: int = DEFAULT_LEVEL,
+             date_time: Optional[Tuple[int, ...]] = None) -> Member:
+    """
+    Read and compress a single file into a zip member. Files of at least `STREAM_SIZE` bytes are not read yet,
+    their member streams them.
+
+    :param path: File path.
+    :param arcname: Name of the member inside the archive.
+    :param compress_type: `zipfile.ZIP_STORED` or `zipfile.ZIP_DEFLATED`.
+    :param level: Deflate compression level.
+    :param date_time: Make the member reproducible: use this timestamp instead of the file modification time and
+                      normalize the permissions to 644, or 755 for executable files.
+    :return: The compressed member.
+    """
+    info = zipfile.ZipInfo.from_file(path, arcname, strict_timestamps=False)
+    info.compress_type = compress_type
+
+    if date_time is not None:
+        info.date_time = date_time
+        info.external_attr = normalized_mode(info.external_attr >> 16) << 16
+        info.create_system = UNIX_SYSTEM
+
+    if info.file_size >= STREAM_SIZE:
+        return Member(info, None, _compress_chunks(path, info, level))
+
+    with open(path, 'rb') as source:
+        data = source.read()
+
+    profiling.count("bytes_read", len(data))
+    info.file_size = len(data)
+    info.CRC = zlib.crc32(data)
+
+    if compress_type == zipfile.ZIP_DEFLATED:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+        data = compressor.compress(data) + compressor.flush()
+
+    info.compress_size = len(data)
+
+    return Member(info, data)
+
+
+def _compress_chunks(path: str, info: zipfile.ZipInfo, level: int) -> Iterator[bytes]:
+    """
+    Yield the compressed data of a file `CHUNK_SIZE` bytes at a time, then set its CRC and sizes in `info`.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15) if info.compress_type == zipfile.ZIP_DEFLATED else None
+    crc, file_size, compress_size = 0, 0, 0
+
+    with open(path, 'rb') as source:
+        for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+            profiling.count("bytes_read", len(chunk))
+            crc = zlib.crc32(chunk, crc)
+            file_size += len(chunk)
+
+            if compressor is not None:
+                chunk = compressor.compress(chunk)
+
+            compress_size += len(chunk)
+            yield chunk
+
+    if compressor is not None:
+        chunk = compressor.flush()
+        compress_size += len(chunk)
+        yield chunk
+
+    info.CRC, info.file_size, info.compress_size = crc, file_size, compress_size
+
+
+def normalized_mode(mode: int) -> int:
+    """Return the mode of a regular file with rw-r--r-- permissions, rwxr-xr-x if any execute bit is set."""
+    return stat.S_IFREG | (0o755 if mode & 0o111 else 0o644)
+
+
+def reproducible_date_time() -> Tuple[int, ...]:
+    """
+    Return the timestamp of reproducible zip members: `SOURCE_DATE_EPOCH` when set, `REPRODUCIBLE_DATE_TIME`
+    otherwise. Timestamps before 1980 cannot be stored and are raised to it.
+    """
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+
+    if not epoch:
+        return REPRODUCIBLE_DATE_TIME
+
+    try:
+        date_time = tuple(time.gmtime(int(epoch))[:6])
+    except (ValueError, OverflowError, OSError):
+        return REPRODUCIBLE_DATE_TIME
+
+    # DOS timestamps have a two seconds resolution.
+    return max(REPRODUCIBLE_DATE_TIME, (*date_time[:5], date_time[5] - date_time[5] % 2))
+
+
+def previous_artifact(zip_directory: str, plugin_name: str) -> Optional[str]:
+    """
+    Find the zip file of the highest version previously written for a plugin as `{plugin}-{version}.zip`.
+
+    :param zip_directory: Directory the zip files are written to.
+    :param plugin_name: Plugin directory name.
+    :return: Path of the previous zip file or None.
+    """
+    pattern = re.compile(rf"{re.escape(plugin_name)}-(\d+)\.zip")
+
+    try:
+        names = os.listdir(zip_directory)
+    except OSError:
+        return None
+
+    versions = [(int(match.group(1)), name) for match, name in ((pattern.fullmatch(_), _) for _ in names) if match]
+
+    if not versions:
+        return None
+
+    return os.path.join(zip_directory, max(versions)[1])
+
+
+def skipped(path: str) -> None:
+    """
+    Count the files and bytes of an ignored file or directory while profiling. Ignored directories are only
+    walked for that purpose.
+    """
+    if not profiling.enabled():
+        return
+
+    if not os.path.isdir(path) or os.path.islink(path):
+        profiling.count("files_skipped")
+        profiling.count("bytes_skipped", os.lstat(path).st_size)
+        return
+
+    for root, _, files in os.walk(path):
+        for file_name in files:
+            profiling.count("files_skipped")
+            profiling.count("bytes_skipped", os.lstat(os.path.join(root, file_name)).st_size)
+
+
+class Artifact:
+    """
+    Read access to the raw, still compressed member data of an existing zip file.
+    """
+
+    def __init__(self, path: str) -> None:
+        with zipfile.ZipFile(path) as zip_file:
+            self.infos: Dict[str, zipfile.ZipInfo] = {info.filename: info for info in zip_file.infolist()}
+            match = LEVEL_COMMENT_REGEX.fullmatch(zip_file.comment)
+
+        # Deflate level the zip file was built with, None when it was not recorded.
+        self.level: Optional[int] = int(match.group(1)) if match else None
+
+        self._file = open(path, 'rb')
+        self._lock = threading.Lock()
+        self.mtime: float = os.fstat(self._file.fileno()).st_mtime
+
+    def __enter__(self) -> "Artifact":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def reusable(self, info: zipfile.ZipInfo, compress_type: int) -> Optional[zipfile.ZipInfo]:
+        """
+        Return the previous member of the same name if its compressed data may be reused for the new member.
+
+        Members are only candidates if their size and compression method match and they are not encrypted.
+        """
+        previous = self.infos.get(info.filename)
+
+        if previous is None or previous.flag_bits & 0x1:
+            return None
+
+        if previous.file_size != info.file_size or previous.compress_type != compress_type:
+            return None
+
+        return previous
+
+    def unchanged(self, previous: zipfile.ZipInfo, info: zipfile.ZipInfo, mtime: float) -> bool:
+        """
+        Whether a file is known unchanged from its timestamp alone.
+
+        The timestamp is only trusted when the file was last modified well before the previous zip was written,
+        a modification within the DOS timestamp resolution could otherwise keep the same timestamp.
+        """
+        return previous.date_time == info.date_time and mtime < self.mtime - DOS_TIME_RESOLUTION
+
+    def raw(self, info: zipfile.ZipInfo) -> bytes:
+        """
+        Read the compressed data of a member without decompressing it.
+        """
+        with self._lock:
+            self._file.seek(info.header_offset)
+            header = LOCAL_FILE_HEADER.unpack(self._file.read(LOCAL_FILE_HEADER.size))
+
+            if header[0] != b"PK\003\004":
+                raise zipfile.BadZipFile(f"Bad local file header for '{info.filename}'")
+
+            self._file.seek(header[-2] + header[-1], os.SEEK_CUR)
+            return self._file.read(info.compress_size)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ZipWriter:
+    """
+    Writes pre-compressed members into a standard zip archive, using zip64 records only when required.
+    """
+
+    def __init__(self, path: str, digest: bool = False, comment: bytes = b"") -> None:
+        """
+        :param path: Path of the zip file.
+        :param digest: Compute the sha256 digest of the written bytes, see `hexdigest`.
+        :param comment: Archive comment.
+        """
+        self._file = open(path, 'wb')
+        self._comment = comment
+        self._infos: List[zipfile.ZipInfo] = []
+        self._digest = hashlib.sha256() if digest else None
+
+    def __enter__(self) -> "ZipWriter":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def write(self, member: Member) -> None:
+        info = member.info
+        info.header_offset = self._file.tell()
+
+        if member.chunks is not None:
+            self.__stream(member)
+            return
+
+        zip64 = info.file_size > ZIP64_LIMIT or info.compress_size > ZIP64_LIMIT
+        header = info.FileHeader(zip64)
+        self.__write(header)
+        self.__write(member.data)
+        profiling.count("bytes_written", len(header) + len(member.data))
+
+        self._infos.append(info)
+
+    def __stream(self, member: Member) -> None:
+        """
+        Write a member whose CRC and sizes are only known once its data is written. They follow the data in a
+        data descriptor, so the archive is written in a single pass.
+        """
+        info = member.info
+        # Deflate can grow incompressible data slightly, the size of the file on disk decides the record format.
+        zip64 = info.file_size * 1.05 > ZIP64_LIMIT
+        info.flag_bits |= DATA_DESCRIPTOR_FLAG
+
+        header = info.FileHeader(zip64)
+        self.__write(header)
+        written = len(header)
+
+        for chunk in member.chunks:
+            self.__write(chunk)
+            written += len(chunk)
+
+        descriptor = (DATA_DESCRIPTOR_64 if zip64 else DATA_DESCRIPTOR).pack(
+            b"PK\007\010", info.CRC, info.compress_size, info.file_size
+        )
+        self.__write(descriptor)
+        profiling.count("bytes_written", written + len(descriptor))
+
+        self._infos.append(info)
+
+    def hexdigest(self) -> Optional[str]:
+        """Return the sha256 digest of the bytes written so far, None unless enabled."""
+        return self._digest.hexdigest() if self._digest is not None else None
+
+    def __write(self, data: bytes) -> None:
+        self._file.write(data)
+
+        if self._digest is not None:
+            self._digest.update(data)
+
+    def close(self) -> None:
+        if self._file.closed:
+            return
+
+        try:
+            start = self._file.tell()
+
+            for info in self._infos:
+                self.__write(self.__central_directory_header(info))
+
+            self.__write_end_record(start, self._file.tell() - start)
+        finally:
+            self._file.close()
+
+    @staticmethod
+    def __central_directory_header(info: zipfile.ZipInfo) -> bytes:
+        file_size, compress_size, header_offset = info.file_size, info.compress_size, info.header_offset
+        zip64_fields = []
+
+        if file_size > ZIP64_LIMIT or compress_size > ZIP64_LIMIT:
+            zip64_fields += [file_size, compress_size]
+            file_size = compress_size = 0xffffffff
+
+        if header_offset > ZIP64_LIMIT:
+            zip64_fields.append(header_offset)
+            header_offset = 0xffffffff
+
+        extra = info.extra
+        min_version = 0
+
+        if zip64_fields:
+            extra = struct.pack(f"<HH{len(zip64_fields)}Q", 1, 8 * len(zip64_fields), *zip64_fields) + extra
+            min_version = ZIP64_VERSION
+
+        filename, flag_bits = ZipWriter.__encode_filename(info)
+        dt = info.date_time
+        dosdate = (dt[0] - 1980) << 9 | dt[1] << 5 | dt[2]
+        dostime = dt[3] << 11 | dt[4] << 5 | (dt[5] // 2)
+
+        header = CENTRAL_DIRECTORY.pack(
+            b"PK\001\002", max(min_version, info.create_version), info.create_system,
+            max(min_version, info.extract_version), info.reserved, flag_bits, info.compress_type, dostime, dosdate,
+            info.CRC, compress_size, file_size, len(filename), len(extra), len(info.comment), 0, info.internal_attr,
+            info.external_attr, header_offset
+        )
+
+        return header + filename + extra + info.comment
+
+    @staticmethod
+    def __encode_filename(info: zipfile.ZipInfo) -> Tuple[bytes, int]:
+        try:
+            return info.filename.encode('ascii'), info.flag_bits
+        except UnicodeEncodeError:
+            return info.filename.encode('utf-8'), info.flag_bits | UTF8_FLAG
+
+    def __write_end_record(self, offset: int, size: int) -> None:
+        count = len(self._infos)
+
+        if count > ZIP_FILECOUNT_LIMIT or offset > ZIP64_LIMIT or size > ZIP64_LIMIT:
+            end_record_offset = self._file.tell()
+            self.__write(END_OF_CENTRAL_DIRECTORY_64.pack(
+                b"PK\006\006", 44, ZIP64_VERSION, ZIP64_VERSION, 0, 0, count, count, size, offset
+            ))
+            self.__write(END_OF_CENTRAL_DIRECTORY_64_LOCATOR.pack(b"PK\006\007", 0, end_record_offset, 1))
+
+            count = min(count, ZIP_FILECOUNT_LIMIT)
+            offset = min(offset, 0xffffffff)
+            size = min(size, 0xffffffff)
+
+        self.__write(END_OF_CENTRAL_DIRECTORY.pack(b"PK\005\006", 0, 0, count, count, size, offset, len(self._comment)))
+        self.__write(self._comment)
+
+
+class Packager:
+    """
+    Zips a plugin directory, compressing its files in parallel and storing already compressed formats as-is.
+    """
+
+    def __init__(self, level: int = DEFAULT_LEVEL, store: Iterable[str] = (), jobs: Optional[int] = None,
+                 incremental: bool = False, reproducible: bool = False, ignore_files: bool = True,
+                 ignore_patterns: Iterable[str] = ()) -> None:
+        """
+        :param level: Deflate compression level, 0 stores every file uncompressed.
+        :param store: Extra file extensions to store uncompressed, in addition to `STORED_EXTENSIONS`.
+        :param jobs: Number of compression threads. Default: number of CPUs.
+        :param incremental: Copy the compressed data of unchanged files from the previous zip file, unless it was
+                            built with another `level`.
+        :param reproducible: Write byte-identical zip files for identical content: members sorted by name, with a
+                             fixed timestamp and normalized permissions. The previous zip file is not reused, its
+                             members may have been compressed with other options.
+        :param ignore_files: Leave out the files matched by `ignore.DEFAULT_PATTERNS`, `ignore_patterns` and the
+                             `.distignore` and `.booignore` files of the plugin.
+        :param ignore_patterns: Extra patterns in the gitignore syntax that apply to every plugin.
+        """
+        self.level: int = level
+        self.store: frozenset = STORED_EXTENSIONS | {self.__normalize_extension(_) for _ in store}
+        self.jobs: int = jobs or os.cpu_count() or 1
+        self.incremental: bool = incremental and not reproducible
+        self.reproducible: bool = reproducible
+        self.date_time: Optional[Tuple[int, ...]] = reproducible_date_time() if reproducible else None
+        self.ignore_files: bool = ignore_files
+        self.ignore_patterns: Tuple[str, ...] = (*ignore.DEFAULT_PATTERNS, *ignore_patterns)
+
+    def create(self, directory_path: str, output_zip_path: str, previous_zip_path: Optional[str] = None,
+               substitutes: Optional[Dict[str, str]] = None,
+               artifact_store: Optional["artifacts.ArtifactStore"] = None) -> Optional[str]:
+        """
+        Create a zip archive whose members are rooted at the directory name.
+
+        The archive is written next to the output path and moved in place once complete, so the previous zip
+        file may be the output path itself.
+
+        :param directory_path: Directory to archive.
+        :param output_zip_path: Path of the zip file to write.
+        :param previous_zip_path: Zip file to reuse unchanged members from when the packager is incremental.
+        :param substitutes: Files whose member is read from another path, e.g. a staged main file, by absolute path.
+        :param artifact_store: Store of the reproducible zip files already written. A zip file of the same content
+                               is linked from the store instead of being written again.
+        :return: The sha256 digest of the zip file when the packager is reproducible, None otherwise.
+        """
+        partial_zip_path = f"{output_zip_path}.part"
+        artifact = self.__open_artifact(previous_zip_path)
+        files = self.files(directory_path, self.matcher(directory_path))
+
+        if substitutes:
+            files = ((substitutes.get(os.path.abspath(path), path), arcname) for path, arcname in files)
+
+        key = None
+
+        if self.reproducible:
+            files = sorted(files, key=lambda pair: pair[1])
+
+            if artifact_store is not None:
+                key = self.key(files)
+                digest = artifact_store.lookup(key)
+
+                if digest is not None:
+                    artifact_store.link(digest, output_zip_path)
+                    return digest
+
+        try:
+            comment = LEVEL_COMMENT.format(level=self.level).encode()
+
+            with ZipWriter(partial_zip_path, digest=self.reproducible, comment=comment) as writer:
+                for member in self.__compress(files, artifact):
+                    writer.write(member)
+
+            if key is not None:
+                artifact_store.add(key, writer.hexdigest(), partial_zip_path)
+                artifact_store.link(writer.hexdigest(), output_zip_path)
+            else:
+                os.replace(partial_zip_path, output_zip_path)
+        except BaseException:
+            if os.path.exists(partial_zip_path):
+                os.remove(partial_zip_path)
+            raise
+        finally:
+            if artifact is not None:
+                artifact.close()
+
+        return writer.hexdigest()
+
+    def key(self, files: Iterable[Tuple[str, str]]) -> str:
+        """
+        Digest everything a reproducible zip file depends on: the packaging options, the zlib version and the name,
+        permissions and content of every member. Equal keys give byte-identical zip files.
+
+        :param files: (path, arcname) pairs in member order.
+        """
+        key = hashlib.sha256(
+            f"{KEY_VERSION}\0{zlib.ZLIB_RUNTIME_VERSION}\0{self.level}\0{sorted(self.store)}\0{self.date_time}\n"
+            .encode()
+        )
+
+        for path, arcname in files:
+            content = hashlib.sha256()
+
+            with open(path, 'rb') as source:
+                mode = normalized_mode(os.fstat(source.fileno()).st_mode)
+
+                for chunk in iter(lambda: source.read(CHUNK_SIZE), b""):
+                    content.update(chunk)
+                    profiling.count("bytes_read", len(chunk))
+
+            key.update(f"{arcname}\0{mode:o}\0{content.hexdigest()}\n".encode())
+
+        return key.hexdigest()
+
+    def compress_type(self, path: str) -> int:
+        if self.level == 0 or os.path.splitext(path)[1].lower() in self.store:
+            return zipfile.ZIP_STORED
+
+        return zipfile.ZIP_DEFLATED
+
+    def matcher(self, directory_path: str) -> Optional[ignore.Matcher]:
+        """
+        :return: The matcher of the files of a plugin that are not packaged, None when nothing is ignored.
+        """
+        return ignore.Matcher.load(directory_path, self.ignore_patterns) if self.ignore_files else None
+
+    @staticmethod
+    def files(directory_path: str, matcher: Optional[ignore.Matcher] = None) -> Iterator[Tuple[str, str]]:
+        """
+        Yield the (path, arcname) pairs of every file under the directory.
+
+        :param matcher: Leave out the files it matches. Matching directories are not walked at all.
+        """
+        directory_name = os.path.basename(os.path.normpath(directory_path))
+
+        for root, directories, files in os.walk(directory_path):
+            relative_root = os.path.relpath(root, directory_path)
+            prefix = "" if relative_root == os.curdir else relative_root.replace(os.sep, "/") + "/"
+
+            if matcher is not None:
+                kept = []
+
+                for name in directories:
+                    if matcher.ignored(prefix + name, directory=True):
+                        skipped(os.path.join(root, name))
+                    else:
+                        kept.append(name)
+
+                directories[:] = kept
+
+            for file_name in files:
+                full_file_path = os.path.join(root, file_name)
+
+                if matcher is not None and matcher.ignored(prefix + file_name):
+                    skipped(full_file_path)
+                    continue
+
+                relative_file_path = os.path.join(directory_name, os.path.relpath(full_file_path, directory_path))
+                yield full_file_path, relative_file_path
+
+    def __compress(self, files: Iterable[Tuple[str, str]], artifact: Optional[Artifact]) -> Iterator[Member]:
+        """
+        Compress files on the thread pool and yield the members in input order.
+
+        At most two members per thread are kept in memory while they wait to be written.
+        """
+        compress_member = profiling.propagate(compress)
+        reuse_member = profiling.propagate(self.__reuse)
+
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            pending = []
+
+            for path, arcname in files:
+                if artifact is None:
+                    pending.append(executor.submit(
+                        compress_member, path, arcname, self.compress_type(path), self.level, self.date_time
+                    ))
+                else:
+                    pending.append(executor.submit(reuse_member, path, arcname, artifact))
+
+                if len(pending) >= self.jobs * 2:
+                    yield pending.pop(0).result()
+
+            for future in pending:
+                yield future.result()
+
+    def __reuse(self, path: str, arcname: str, artifact: Artifact) -> Member:
+        """
+        Build a member from the previous zip file when the file is unchanged, compress it otherwise.
+        """
+        compress_type = self.compress_type(path)
+        info = zipfile.ZipInfo.from_file(path, arcname, strict_timestamps=False)
+        previous = artifact.reusable(info, compress_type)
+
+        # The compressed data of large members is not held in memory, they are compressed again while written.
+        if info.file_size >= STREAM_SIZE:
+            previous = None
+
+        if previous is not None and not artifact.unchanged(previous, info, os.stat(path).st_mtime):
+            with open(path, 'rb') as source:
+                if zlib.crc32(source.read()) != previous.CRC:
+                    previous = None
+
+        if previous is None:
+            return compress(path, arcname, compress_type, self.level)
+
+        info.compress_type = compress_type
+        info.CRC = previous.CRC
+        info.compress_size = previous.compress_size
+
+        return Member(info, artifact.raw(previous))
+
+    def __open_artifact(self, previous_zip_path: Optional[str]) -> Optional[Artifact]:
+        if not self.incremental or previous_zip_path is None:
+            return None
+
+        try:
+            artifact = Artifact(previous_zip_path)
+        except (OSError, zipfile.BadZipFile):
+            return None
+
+        # Reusing members of another deflate level would keep their old compression indefinitely.
+        if artifact.level != self.level:
+            artifact.close()
+            return None
+
+        return artifact
+
+    @staticmethod
+    def __normalize_extension(extension: str) -> str:
+        extension = extension.strip().lower()
+        return extension if extension.startswith(".") else f".{extension}"
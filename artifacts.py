@@ -0,0 +1,138 @@
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import Dict, Iterable, Optional, Tuple
+
+import archive
+import helpers
+import index
+
+DIRECTORY = "artifacts"
+CHECKSUMS = "SHA256SUMS"
+
+
+class ArtifactStore:
+    """
+    Content-addressed store of the reproducible zip files of a zip directory, under `<zip path>/.boo/artifacts/`.
+
+    Every zip file is stored once as `objects/<sha256>.zip` and hard linked to its `{plugin}-{version}.zip` name,
+    or copied where hard links are not supported. `keys/<key>` maps the `archive.Packager.key` of the packaged
+    content to the digest of its zip file, so packaging content that was packaged before only costs hashing the
+    files. The checksums of the zip files are listed in `<zip path>/SHA256SUMS`, in the `sha256sum` format.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: Zip directory path.
+        """
+        self.path: str = os.path.abspath(path)
+        self.directory: str = os.path.join(self.path, index.DIRECTORY, DIRECTORY)
+        self.checksums_path: str = os.path.join(self.path, CHECKSUMS)
+
+    def lookup(self, key: str) -> Optional[str]:
+        """
+        :return: The digest of the zip file stored for a key, None when there is none.
+        """
+        try:
+            with open(self.__key_path(key), 'r') as file:
+                digest = file.read().strip()
+        except OSError:
+            return None
+
+        return digest if os.path.isfile(self.object_path(digest)) else None
+
+    def add(self, key: str, digest: str, path: str) -> None:
+        """
+        Move a zip file into the store, unless a zip file of the same digest is already stored.
+
+        :param key: Key of the packaged content.
+        :param digest: sha256 digest of the zip file.
+        :param path: Zip file path, removed once stored.
+        """
+        object_path = self.object_path(digest)
+        self.__create_directories()
+
+        if os.path.isfile(object_path):
+            os.remove(path)
+        else:
+            os.replace(path, object_path)
+
+        helpers.atomic_write(self.__key_path(key), [digest.encode()])
+
+    def link(self, digest: str, output_zip_path: str) -> None:
+        """
+        Put a stored zip file at a path, replacing the file there at once.
+        """
+        directory, name = os.path.split(os.path.abspath(output_zip_path))
+        descriptor, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+        os.close(descriptor)
+        os.remove(temp_path)
+
+        try:
+            try:
+                os.link(self.object_path(digest), temp_path)
+            except OSError:
+                shutil.copyfile(self.object_path(digest), temp_path)
+
+            os.replace(temp_path, output_zip_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def record(self, zip_files: Iterable[Tuple[str, Optional[str]]]) -> None:
+        """
+        Add zip files to the checksums file, replacing earlier entries of the same names.
+
+        :param zip_files: (zip file path, sha256 digest) pairs. Zip files without a digest are hashed.
+        """
+        checksums = {os.path.basename(path): digest or self.digest(path) for path, digest in zip_files}
+
+        if not checksums:
+            return
+
+        index.create_directory(self.path)
+
+        with helpers.FileLock(os.path.join(self.path, index.DIRECTORY, f"{CHECKSUMS}.lock")):
+            checksums = {**self.checksums(), **checksums}
+
+            # Created first so that it gets the default permissions, which atomic_write then keeps.
+            open(self.checksums_path, 'a').close()
+            helpers.atomic_write(
+                self.checksums_path, [f"{digest}  {name}\n".encode() for name, digest in sorted(checksums.items())]
+            )
+
+    def checksums(self) -> Dict[str, str]:
+        """
+        :return: The digests of the checksums file by zip file name.
+        """
+        try:
+            with open(self.checksums_path, 'r') as file:
+                lines = [line.rstrip("\n").split("  ", 1) for line in file]
+        except OSError:
+            return {}
+
+        return {line[1]: line[0] for line in lines if len(line) == 2}
+
+    def object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", f"{digest}.zip")
+
+    @staticmethod
+    def digest(path: str) -> str:
+        digest = hashlib.sha256()
+
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(archive.CHUNK_SIZE), b""):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def __key_path(self, key: str) -> str:
+        return os.path.join(self.directory, "keys", key)
+
+    def __create_directories(self) -> None:
+        index.create_directory(self.path)
+
+        for name in ("objects", "keys"):
+            os.makedirs(os.path.join(self.directory, name), exist_ok=True)
@@ -0,0 +1,64 @@
+"""
+Compares zip packaging throughput of the serial `zipfile` implementation and `archive.Packager`.
+
+Usage: python -m benchmarks.bench_archive --files 400 --size 65536
+"""
+import os
+import time
+import zipfile
+from tempfile import TemporaryDirectory
+
+import click
+
+import archive
+from benchmarks import generator
+
+
+def size_of(path: str) -> int:
+    """
+    :return: Total bytes of the files below `path`.
+    """
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def legacy_create(directory_path: str, output_zip_path: str) -> None:
+    directory_name = os.path.basename(directory_path)
+
+    with zipfile.ZipFile(output_zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
+        for root, _, files in os.walk(directory_path):
+            for file_name in files:
+                full_file_path = os.path.join(root, file_name)
+                relative_file_path = os.path.join(directory_name, os.path.relpath(full_file_path, directory_path))
+                zip_file.write(full_file_path, relative_file_path)
+
+
+def measure(callback, plugin_path: str, output_zip_path: str, total: int) -> str:
+    started = time.perf_counter()
+    callback(plugin_path, output_zip_path)
+    elapsed = time.perf_counter() - started
+
+    return f"{elapsed:.3f}s, {total / elapsed / 1024 / 1024:.1f} MB/s, {os.path.getsize(output_zip_path)} bytes"
+
+
+@click.command()
+@click.option("--files", default=400, help="Number of files in the synthetic plugin. Default: 400")
+@click.option("--size", default=65536, help="Size of every file in bytes. Default: 65536")
+@click.option("--jobs", type=int, default=None, help="Packager threads. Default: number of CPUs")
+def main(files, size, jobs):
+    with TemporaryDirectory() as path:
+        # The first generated plugin is asset heavy.
+        plugin_path = generator.generate(os.path.join(path, "plugins"), 1, assets=files, asset_size=size)[0].path
+        total = size_of(plugin_path)
+        output_zip_path = os.path.join(path, "plugin.zip")
+
+        click.echo(f"legacy:   {measure(legacy_create, plugin_path, output_zip_path, total)}")
+
+        packager = archive.Packager(jobs=jobs)
+        click.echo(f"packager: {measure(packager.create, plugin_path, output_zip_path, total)}")
+
+        packager = archive.Packager(level=1, jobs=jobs)
+        click.echo(f"level 1:  {measure(packager.create, plugin_path, output_zip_path, total)}")
+
+
+if "__main__" == __name__:
+    main()
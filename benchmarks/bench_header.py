@@ -0,0 +1,44 @@
+"""
+Compares whole-file version extraction with the bounded header read over large main files.
+
+Usage: python -m benchmarks.bench_header --plugins 200 --size 524288
+"""
+import re
+import time
+from tempfile import TemporaryDirectory
+
+import click
+
+import versioning
+from benchmarks import generator
+
+
+def legacy_extract(path: str) -> str:
+    with open(path, 'r') as file:
+        return re.search(versioning.VERSION_PATTERN, file.read()).group(1)
+
+
+def measure(callback, main_files: list) -> str:
+    started = time.perf_counter()
+
+    for main_file in main_files:
+        callback(main_file)
+
+    elapsed = time.perf_counter() - started
+    return f"{elapsed:.3f}s, {elapsed / len(main_files) * 1e6:.0f}us per file"
+
+
+@click.command()
+@click.option("--plugins", default=200, help="Number of synthetic plugins. Default: 200")
+@click.option("--size", default=524288, help="Bytes of code after the header of every main file. Default: 524288")
+def main(plugins, size):
+    with TemporaryDirectory() as path:
+        generated = generator.generate(path, plugins, main_file_sizes=(size,), asset_heavy_every=0)
+        main_files = [plugin.main_file_path for plugin in generated]
+
+        click.echo(f"whole file: {measure(legacy_extract, main_files)}")
+        click.echo(f"header:     {measure(versioning.extract_version_from_file, main_files)}")
+
+
+if "__main__" == __name__:
+    main()
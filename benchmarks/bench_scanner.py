@@ -0,0 +1,117 @@
+"""
+Counts the files opened per plugin by `boo versions` before and after the single-pass scanner.
+
+The "before" side validates with the uncached `wppcpy` constraints of the original flow and is skipped when
+`wppcpy` is not installed.
+
+Usage: python -m benchmarks.bench_scanner --plugins 1500
+"""
+import os
+import sys
+import time
+from collections import Counter
+from tempfile import TemporaryDirectory
+
+import click
+
+import scanner
+from benchmarks import generator
+from helpers import MAIN_FILES
+
+AUDITED_EVENTS = ("open", "os.listdir", "os.scandir")
+
+_events: Counter = Counter()
+_recording = False
+
+
+def _audit(event: str, args: tuple) -> None:
+    if _recording and event in AUDITED_EVENTS:
+        _events[event] += 1
+
+
+def legacy_validate(path: str) -> bool:
+    """
+    The pre-scanner validation: the three `wppcpy` constraints, checked again on every call.
+    """
+    import wppcpy
+
+    main_file = next((name for name in MAIN_FILES if os.path.isfile(os.path.join(path, name))), MAIN_FILES[0])
+    constraints = [
+        wppcpy.constraints.file.MainFile(path, files=main_file),
+        wppcpy.constraints.header.PluginName(path, main_file_name=main_file),
+        wppcpy.constraints.header.Version(path, main_file_name=main_file),
+    ]
+
+    try:
+        return all(constraint.validate() for constraint in constraints)
+    except wppcpy.exceptions.base.PcpyException:
+        return False
+
+
+def legacy_versions(path: str) -> list:
+    """
+    The pre-scanner `boo versions` flow: validate in `Plugin.list`, again in `Plugin.__init__`,
+    and once more plus a full read for every `plugin.version` access.
+    """
+    import file
+
+    rows = []
+
+    for entry in sorted(os.listdir(path)):
+        plugin_path = os.path.join(path, entry)
+
+        if not legacy_validate(plugin_path):
+            continue
+
+        legacy_validate(plugin_path)
+        plugin = file.Plugin(plugin_path)
+
+        for _ in range(2):
+            legacy_validate(plugin_path)
+
+        rows.append((plugin.name, str(plugin.version), int(plugin.version)))
+
+    return rows
+
+
+def scanner_versions(path: str) -> list:
+    return [(record.name, record.version) for record in scanner.Scanner.scan(path)]
+
+
+def measure(callback, path: str, plugins: int) -> str:
+    global _recording
+
+    _events.clear()
+    _recording = True
+    started = time.perf_counter()
+
+    try:
+        callback(path)
+    finally:
+        _recording = False
+
+    elapsed = time.perf_counter() - started
+    per_plugin = ", ".join(f"{event}: {_events[event] / plugins:.2f}" for event in AUDITED_EVENTS)
+
+    return f"{elapsed:.3f}s, per plugin -> {per_plugin}"
+
+
+@click.command()
+@click.option("--plugins", default=1500, help="Number of synthetic plugins. Default: 1500")
+def main(plugins):
+    sys.addaudithook(_audit)
+
+    with TemporaryDirectory() as path:
+        # Neither flow reads the assets of a plugin.
+        generator.generate(path, plugins, asset_heavy_every=0)
+
+        try:
+            click.echo(f"before: {measure(legacy_versions, path, plugins)}")
+        except ImportError as e:
+            click.echo(f"before: skipped, the original flow needs wppcpy ({e})")
+
+        click.echo(f"after:  {measure(scanner_versions, path, plugins)}")
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,72 @@
+"""
+Cold startup regression check for `boo --help`.
+
+Runs the CLI in fresh interpreters with `-X importtime`, reports the best wall time and the slowest imports,
+and exits with status 1 when the wall time exceeds the budget or a command dependency is imported.
+
+Usage: python -m benchmarks.bench_startup --budget 150 --runs 10
+"""
+import os
+import subprocess
+import sys
+import time
+
+import click
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main")
+
+# Modules only needed once a command runs; `--help` must not import them.
+COMMAND_DEPENDENCIES = ("tabulate", "wppcpy", "zipfile", "subprocess", "sqlite3", "file", "git", "archive", "daemon",
+                        "profiling", "sources")
+
+
+def run(args: tuple) -> tuple:
+    """
+    Run the CLI once with import timing enabled.
+
+    :return: (wall time in seconds, {module: cumulative import time in microseconds})
+    """
+    started = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", MAIN, *args],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True
+    )
+    elapsed = time.perf_counter() - started
+
+    imports = {}
+    for line in process.stderr.decode().splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+
+        _, cumulative, module = line[len("import time:"):].split("|")
+        imports[module.strip()] = int(cumulative)
+
+    return elapsed, imports
+
+
+@click.command()
+@click.option("--budget", default=150, help="Maximum wall time of the fastest run in milliseconds. Default: 150")
+@click.option("--runs", default=10, help="Number of runs. Default: 10")
+@click.option("--top", default=10, help="Number of slowest imports to report. Default: 10")
+def main(budget, runs, top):
+    results = [run(("--help",)) for _ in range(runs)]
+    elapsed, imports = min(results, key=lambda result: result[0])
+
+    click.echo(f"--help: best of {runs} runs {elapsed * 1000:.1f}ms (budget {budget}ms)")
+
+    for module, cumulative in sorted(imports.items(), key=lambda item: -item[1])[:top]:
+        click.echo(f"  {cumulative / 1000:8.1f}ms  {module}")
+
+    failures = [f"'{module}' is imported" for module in COMMAND_DEPENDENCIES if module in imports]
+
+    if elapsed * 1000 > budget:
+        failures.append(f"startup took {elapsed * 1000:.1f}ms, budget is {budget}ms")
+
+    for failure in failures:
+        click.echo(f"FAIL: {failure}", err=True)
+
+    sys.exit(1 if failures else 0)
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,132 @@
+"""
+Synthetic WordPress plugin trees for the benchmarks and the unit tests.
+
+Usage: python -m benchmarks.generator <path> --plugins 500 --assets 20
+"""
+import os
+import random
+from typing import List, NamedTuple, Sequence
+
+import click
+
+from helpers import MAIN_FILES
+
+MAIN_FILE_HEADER = """<?php
+/**
+ * Plugin Name: {name}
+ * Description: Synthetic plugin generated for benchmarking.
+ * Version: {version}
+ * Author: Boo
+ */
+"""
+
+BODY_LINE = "function boo_{index}_{line}() {{ return esc_html__( 'Version: 0.0.1', 'boo' ); }}\n"
+
+# Main file sizes in bytes, assigned round-robin: a bare header, a typical file and bundled code past `HEADER_SIZE`.
+DEFAULT_MAIN_FILE_SIZES = (0, 4096, 262144)
+
+
+class GeneratedPlugin(NamedTuple):
+    """
+    A plugin written by `generate`.
+    """
+    path: str
+    main_file: str
+    plugin_name: str
+    version: str
+    assets: int
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def main_file_path(self) -> str:
+        return os.path.join(self.path, self.main_file)
+
+
+def generate(path: str, plugins: int = 100, main_file_sizes: Sequence[int] = DEFAULT_MAIN_FILE_SIZES,
+             index_every: int = 4, asset_heavy_every: int = 10, assets: int = 20, asset_size: int = 16384,
+             seed: int = 0) -> List[GeneratedPlugin]:
+    """
+    Write a plugins directory with varied plugins. The same arguments always produce the same tree.
+
+    :param path: Plugins directory, created when missing.
+    :param plugins: Number of plugins.
+    :param main_file_sizes: Bytes of code after the header of the main files, assigned round-robin.
+    :param index_every: Every n-th plugin uses `index.php` as main file instead of `init.php`, 0 for none.
+    :param asset_heavy_every: Every n-th plugin gets `assets` asset files, 0 for none.
+    :param assets: Number of asset files of asset heavy plugins, a mix of compressible sources and
+                   incompressible images.
+    :param asset_size: Size of every asset file in bytes.
+    :param seed: Seed of the versions and of the image contents.
+    :return: The generated plugins sorted by directory name.
+    """
+    generator = random.Random(seed)
+    generated = []
+
+    for index in range(plugins):
+        plugin_path = os.path.join(path, f"plugin-{index:05d}")
+        main_file = MAIN_FILES[1] if index_every and index % index_every == index_every - 1 else MAIN_FILES[0]
+        version = f"{generator.randint(0, 9)}.{generator.randint(0, 99)}.{generator.randint(0, 99)}"
+        plugin_name = f"Plugin {index}"
+
+        os.makedirs(plugin_path, exist_ok=True)
+        write_main_file(os.path.join(plugin_path, main_file), plugin_name, version,
+                        main_file_sizes[index % len(main_file_sizes)] if main_file_sizes else 0, index)
+
+        asset_count = assets if asset_heavy_every and index % asset_heavy_every == 0 else 0
+        write_assets(plugin_path, asset_count, asset_size, generator)
+
+        generated.append(GeneratedPlugin(plugin_path, main_file, plugin_name, version, asset_count))
+
+    return generated
+
+
+def write_main_file(path: str, plugin_name: str, version: str, size: int = 0, index: int = 0) -> None:
+    """
+    Write a main file with a plugin header followed by `size` bytes of code.
+    """
+    lines, length = [], 0
+
+    while length < size:
+        lines.append(BODY_LINE.format(index=index, line=len(lines)))
+        length += len(lines[-1])
+
+    with open(path, 'w') as f:
+        f.write(MAIN_FILE_HEADER.format(name=plugin_name, version=version))
+        f.write("".join(lines)[:size])
+
+
+def write_assets(plugin_path: str, count: int, size: int, generator: random.Random) -> None:
+    """
+    Write `count` asset files below `assets/`, every third one an incompressible image.
+    """
+    source = b"<?php echo esc_html__( 'Boo', 'boo' ); // compressible source line\n"
+
+    for index in range(count):
+        directory = os.path.join(plugin_path, "assets", f"group-{index % 5}")
+        os.makedirs(directory, exist_ok=True)
+
+        if index % 3 == 0:
+            name, content = f"image-{index}.png", generator.randbytes(size)
+        else:
+            name, content = f"source-{index}.php", (source * (size // len(source) + 1))[:size]
+
+        with open(os.path.join(directory, name), 'wb') as f:
+            f.write(content)
+
+
+@click.command()
+@click.argument("path", type=click.Path(file_okay=False))
+@click.option("--plugins", default=100, help="Number of plugins. Default: 100")
+@click.option("--assets", default=20, help="Asset files of every tenth plugin. Default: 20")
+@click.option("--seed", default=0, help="Seed of the versions and of the image contents. Default: 0")
+def main(path, plugins, assets, seed):
+    generated = generate(path, plugins, assets=assets, seed=seed)
+
+    click.echo(f"{len(generated)} plugins written to {os.path.abspath(path)}")
+
+
+if "__main__" == __name__:
+    main()
@@ -0,0 +1,220 @@
+"""
+Times the commands and the hot functions on a synthetic plugin tree and stores the results as JSON, so that runs
+can be compared across commits.
+
+Usage: python -m benchmarks.suite --plugins 300 --repeat 5 --output before.json
+       python -m benchmarks.suite --plugins 300 --repeat 5 --output after.json --compare before.json
+"""
+import contextlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from tempfile import TemporaryDirectory
+from typing import Callable, Dict, List, Optional, Tuple
+
+import click
+
+import versioning
+from benchmarks import generator
+
+SCHEMA_VERSION = 1
+VERSIONS_PER_RUN = 10000
+
+# Relative slowdown of the best run above which a benchmark counts as a regression.
+DEFAULT_THRESHOLD = 0.2
+
+
+def measure(callback: Callable[[], object], repeat: int) -> Dict:
+    """
+    Run a callback `repeat` times, with the command output discarded.
+
+    :return: {"runs": seconds of every run, "best": fastest run, "mean": mean run} or {"skipped": reason} when the
+             callback cannot be imported in this environment.
+    """
+    runs = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                callback()
+        except ImportError as e:
+            return {"skipped": str(e)}
+
+        runs.append(time.perf_counter() - started)
+
+    return {"runs": runs, "best": min(runs), "mean": sum(runs) / len(runs)}
+
+
+def benchmarks(path: str, plugins: List[generator.GeneratedPlugin], zip_path: str) \
+        -> List[Tuple[str, Callable[[], object]]]:
+    """
+    :param path: Plugins directory generated with `generator.generate`.
+    :param plugins: The generated plugins.
+    :param zip_path: Directory the zip files are written to.
+    :return: (name, callback) of every benchmark, in run order. Commands are imported when they run.
+    """
+    dn_versions = [plugin.version for plugin in plugins]
+    dn_versions = (dn_versions * (VERSIONS_PER_RUN // len(dn_versions) + 1))[:VERSIONS_PER_RUN] if plugins else []
+
+    def versions(cache: bool) -> Callable[[], None]:
+        def command() -> None:
+            from commands import VersionsCommand
+
+            VersionsCommand(path, cache=cache).run()
+
+        return command
+
+    def update() -> None:
+        from commands import UpdateCommand
+
+        UpdateCommand(plugins[0].path, increase="0.0.1", zip=None).run()
+
+    def multi_update(zip: Optional[str]) -> Callable[[], None]:
+        def command() -> None:
+            from commands import MultiUpdateCommand
+
+            MultiUpdateCommand(path, increase="0.0.1", zip=zip).run()
+
+        return command
+
+    def plugin_list() -> None:
+        import file
+
+        file.Plugin.list(path)
+
+    return [
+        ("versions", versions(cache=False)),
+        ("versions (cached)", versions(cache=True)),
+        ("update", update),
+        ("multi-update", multi_update(zip=None)),
+        ("multi-update --zip", multi_update(zip=zip_path)),
+        ("Plugin.list", plugin_list),
+        ("read_header", lambda: [versioning.read_header(plugin.main_file_path) for plugin in plugins]),
+        ("version_to_int", lambda: [versioning.version_to_int(version) for version in dn_versions]),
+        ("VersionColumn", lambda: versioning.VersionColumn.parse(dn_versions).bump(1).format()),
+    ]
+
+
+def run(plugins: int = 300, repeat: int = 5, assets: int = 20, seed: int = 0,
+        only: Tuple[str, ...] = ()) -> Dict:
+    """
+    Generate a plugin tree in a temporary directory and time every benchmark on it.
+
+    :param plugins: Number of generated plugins.
+    :param repeat: Runs per benchmark.
+    :param assets: Asset files of every tenth plugin.
+    :param seed: Seed of the generated tree.
+    :param only: Names of the benchmarks to run, all when empty.
+    :return: The results document, see `save`.
+    """
+    results = {}
+
+    with TemporaryDirectory() as directory:
+        path = os.path.join(directory, "plugins")
+        zip_path = os.path.join(directory, "zips")
+        os.makedirs(zip_path)
+
+        generated = generator.generate(path, plugins, assets=assets, seed=seed)
+
+        for name, callback in benchmarks(path, generated, zip_path):
+            if not only or name in only:
+                results[name] = measure(callback, repeat)
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "commit": commit(),
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "parameters": {"plugins": plugins, "repeat": repeat, "assets": assets, "seed": seed},
+        "results": results,
+    }
+
+
+def commit() -> Optional[str]:
+    """
+    :return: The checked out commit of the repository, None outside of a Git work tree.
+    """
+    try:
+        output = subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL,
+                                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    return output.decode().strip()
+
+
+def compare(previous: Dict, current: Dict, threshold: float = DEFAULT_THRESHOLD) \
+        -> List[Tuple[str, float, float, bool]]:
+    """
+    Compare the best runs of two result documents.
+
+    :return: (name, previous best, current best, regressed) of the benchmarks timed in both documents.
+    """
+    rows = []
+
+    for name, result in current["results"].items():
+        before = previous["results"].get(name, {})
+
+        if "best" in result and "best" in before:
+            rows.append((name, before["best"], result["best"], result["best"] > before["best"] * (1 + threshold)))
+
+    return rows
+
+
+def save(document: Dict, path: str) -> None:
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=2)
+
+
+def load(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+@click.command()
+@click.option("--plugins", default=300, help="Number of synthetic plugins. Default: 300")
+@click.option("--repeat", default=5, help="Runs per benchmark. Default: 5")
+@click.option("--assets", default=20, help="Asset files of every tenth plugin. Default: 20")
+@click.option("--seed", default=0, help="Seed of the generated tree. Default: 0")
+@click.option("--only", multiple=True, help="Only run this benchmark, can be repeated.")
+@click.option("--output", type=click.Path(dir_okay=False), help="Save the results as JSON to this file.")
+@click.option("--compare", "previous", type=click.Path(exists=True, dir_okay=False),
+              help="Results of an earlier run to compare with, exits with status 1 on regressions.")
+@click.option("--threshold", default=DEFAULT_THRESHOLD,
+              help=f"Relative slowdown counted as a regression. Default: {DEFAULT_THRESHOLD}")
+def main(plugins, repeat, assets, seed, only, output, previous, threshold):
+    document = run(plugins, repeat, assets, seed, only)
+
+    for name, result in document["results"].items():
+        if "skipped" in result:
+            click.echo(f"{name:<20} skipped ({result['skipped']})")
+        else:
+            click.echo(f"{name:<20} best {result['best'] * 1000:9.1f}ms  mean {result['mean'] * 1000:9.1f}ms")
+
+    if output:
+        save(document, output)
+
+    if not previous:
+        return
+
+    rows = compare(load(previous), document, threshold)
+
+    click.echo(f"\ncompared with {previous}:")
+
+    for name, before, after, regressed in rows:
+        click.echo(f"{name:<20} {before * 1000:9.1f}ms -> {after * 1000:9.1f}ms  {(after / before - 1) * 100:+6.1f}%"
+                   f"{'  REGRESSION' if regressed else ''}")
+
+    sys.exit(1 if any(regressed for *_, regressed in rows) else 0)
+
+
+if "__main__" == __name__:
+    main()
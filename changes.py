@@ -0,0 +1,162 @@
+import hashlib
+import json
+import os
+import subprocess
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import archive
+import exceptions
+import git
+import helpers
+import ignore
+import index
+import versioning
+
+MANIFEST = "manifest.json"
+SCHEMA_VERSION = 1
+CHUNK_SIZE = 1 << 20
+
+# [inode, mtime, size, sha256 hex digest] of a file.
+FileEntry = List
+
+
+def changed_since(path: str, revision: str) -> Set[str]:
+    """
+    Find the directories under a plugins directory that contain changes since a Git revision, with a single
+    `git diff` and a single `git ls-files` process.
+
+    :param path: Plugins directory path, inside a Git work tree.
+    :param revision: Revision to compare the work tree with.
+    :return: Every directory, relative to `path`, containing a changed or untracked file at any depth.
+    :raise BooException: The directory is not in a Git work tree or the revision does not exist.
+    """
+    try:
+        paths = git.Git.changed_paths(path, revision)
+    except subprocess.CalledProcessError as e:
+        raise exceptions.BooException(f"Could not list the changes of '{path}' since '{revision}': {e}")
+
+    directories = set()
+
+    for changed_path in paths:
+        directory = os.path.dirname(os.path.normpath(changed_path))
+
+        while directory and directory not in directories:
+            directories.add(directory)
+            directory = os.path.dirname(directory)
+
+    return directories
+
+
+class Manifest:
+    """
+    Content digests of the plugins of a plugins directory as of their last update, stored in
+    `<plugins path>/.boo/manifest.json`.
+
+    A plugin digest covers the name and content of every file that is packaged with the default ignore patterns,
+    except for the 'Version' header value of the main file, so bumping a plugin does not change its digest. File
+    digests are kept with the stat signature of the file and only files whose signature changed are read again.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: Plugins directory path.
+        """
+        self.path: str = os.path.abspath(path)
+        self.manifest_path: str = os.path.join(self.path, index.DIRECTORY, MANIFEST)
+        self.plugins: Dict[str, Dict] = {}
+        self._files: Dict[str, Dict[str, FileEntry]] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "Manifest":
+        """
+        Read the manifest of a plugins directory. A missing or unreadable manifest is empty, every plugin counts
+        as changed.
+        """
+        manifest = cls(path)
+
+        try:
+            with open(manifest.manifest_path, 'r') as file:
+                data = json.load(file)
+
+            if data.get("schema") == SCHEMA_VERSION and isinstance(data.get("plugins"), dict):
+                manifest.plugins = data["plugins"]
+        except (OSError, ValueError, AttributeError):
+            pass
+
+        return manifest
+
+    def changed(self, plugin_path: str, main_file: str) -> bool:
+        """
+        :param plugin_path: Plugin directory path.
+        :param main_file: Name of the main file of the plugin.
+        :return: Whether the plugin content differs from the recorded digest, True when none is recorded.
+        """
+        entry = self.plugins.get(self.__key(plugin_path))
+
+        return entry is None or entry.get("digest") != self.digest(plugin_path, main_file)
+
+    def record(self, plugins: Iterable[Tuple[str, str]]) -> None:
+        """
+        Record the current digest of plugins and save the manifest.
+
+        :param plugins: (plugin directory path, main file name) pairs.
+        """
+        for plugin_path, main_file in plugins:
+            digest = self.digest(plugin_path, main_file)
+            self.plugins[self.__key(plugin_path)] = {"digest": digest, "files": self._files[plugin_path]}
+
+        index.create_directory(self.path)
+        data = {"schema": SCHEMA_VERSION, "plugins": self.plugins}
+
+        helpers.atomic_write(self.manifest_path, [json.dumps(data, separators=(",", ":")).encode()])
+
+    def digest(self, plugin_path: str, main_file: str) -> str:
+        """
+        :return: The sha256 hex digest of the plugin content.
+        """
+        known = {**self.plugins.get(self.__key(plugin_path), {}).get("files", {}), **self._files.get(plugin_path, {})}
+        main_file_path = os.path.join(plugin_path, main_file)
+        entries = {}
+        plugin_digest = hashlib.sha256()
+
+        files = archive.Packager.files(plugin_path, ignore.Matcher.load(plugin_path))
+
+        for file_path, arcname in sorted(files, key=lambda pair: pair[1]):
+            name = os.path.relpath(file_path, plugin_path)
+            signature = list(index.signature(os.stat(file_path)))
+            entry = known.get(name)
+
+            if entry is None or entry[:3] != signature:
+                entry = [*signature, self.__file_digest(file_path, file_path == main_file_path)]
+
+            entries[name] = entry
+            plugin_digest.update(f"{name}\0{entry[3]}\n".encode())
+
+        self._files[plugin_path] = entries
+
+        return plugin_digest.hexdigest()
+
+    def __key(self, plugin_path: str) -> str:
+        return os.path.relpath(os.path.abspath(plugin_path), self.path)
+
+    @staticmethod
+    def __file_digest(path: str, main_file: bool) -> str:
+        digest = hashlib.sha256()
+        skip: Optional[Tuple[int, int]] = None
+
+        if main_file:
+            try:
+                start, end, _ = versioning.locate_version(path)
+                skip = (start, end)
+            except exceptions.SearchNotFound:
+                pass
+
+        with open(path, 'rb') as file:
+            if skip is not None:
+                digest.update(file.read(skip[0]))
+                file.seek(skip[1])
+
+            for chunk in iter(lambda: file.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+
+        return digest.hexdigest()
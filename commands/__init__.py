@@ -1,2 +1,25 @@
+from importlib import import_module
+
 from .base_command import BaseCommand
-from .commands import *
\ No newline at end of file
+
+# Command modules are only imported when their class is first accessed, so invoking one
+# command does not pay for the dependencies of all the others.
+COMMANDS = {
+    "VersionsCommand": "commands.versions",
+    "UpdateCommand": "commands.update",
+    "MultiUpdateCommand": "commands.multi_update",
+    "UpgradeCommand": "commands.upgrade",
+    "CheckUpdatesCommand": "commands.check_updates",
+    "ServeCommand": "commands.serve",
+    "DiffVersionsCommand": "commands.diff_versions",
+    "MergeResultsCommand": "commands.merge_results",
+}
+
+__all__ = ["BaseCommand", *COMMANDS]
+
+
+def __getattr__(name: str):
+    if name not in COMMANDS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    return getattr(import_module(COMMANDS[name]), name)
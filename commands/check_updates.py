@@ -0,0 +1,78 @@
+import os
+
+import click
+
+import exceptions
+import helpers
+import updates
+from commands.base_command import BaseCommand
+
+
+class CheckUpdatesCommand(BaseCommand):
+    """
+    Command to check if there are new commits in the repository located at /opt/boo.
+    """
+    REPO_PATH = os.path.expanduser("~/boo")  # Updated path to user's home directory
+
+    def __init__(self, repo_path: str = REPO_PATH, ttl: float = updates.DEFAULT_TTL,
+                 timeout: float = updates.DEFAULT_TIMEOUT, refresh: bool = False) -> None:
+        """
+        :param repo_path: The path to the boo repository.
+        :param ttl: Seconds the answer of the last check is reused for. A staler answer is still reported while
+                    it is refreshed in the background.
+        :param timeout: Seconds after which fetching from the remote is aborted.
+        :param refresh: Fetch now instead of answering from the cache.
+        """
+        self.repo_path: str = repo_path
+        self.ttl: float = ttl
+        self.timeout: float = timeout
+        self.refresh: bool = refresh
+
+    def run(self):
+        """
+        Executes the check-update command.
+        """
+        if not os.path.isdir(self.repo_path):
+            raise exceptions.BooException(f"Repository path '{self.repo_path}' does not exist.")
+
+        try:
+            check = updates.UpdateCheck(self.repo_path, self.ttl, self.timeout)
+            status = check.refresh() if self.refresh else check.check()[0]
+        except PermissionError:
+            suggested_fix = self.__suggest_permission_fix()
+            raise exceptions.BooException(
+                f"Permission denied while accessing the repository at '{self.repo_path}'.\n"
+                f"Please check the file permissions and try again. {suggested_fix}"
+            )
+
+        except Exception as e:
+            raise exceptions.BooException(f"An error occurred during the check-update process: {e}")
+
+        if status.error is not None:
+            raise exceptions.BooException(
+                f"{status.error}\n"
+                f"Please make sure you have the necessary permissions to access the repository at '{self.repo_path}'."
+            )
+
+        if status.available:
+            click.echo(helpers.stylize("boo has new updates! Run the `boo upgrade` command to apply the updates."))
+        else:
+            click.echo("boo is already up to date.")
+
+    def __suggest_permission_fix(self) -> str:
+        """
+        Suggests potential fixes for permission issues.
+
+        :return: A string with suggestions for fixing permission issues.
+        """
+        user = os.getenv("USER", "the current user")
+        group = os.getenv("GROUP", "the appropriate group")
+
+        return (
+            f"Did you mean to run the command with elevated privileges? "
+            f"Try using 'sudo' before the command if necessary.\n"
+            f"Alternatively, you can change the ownership of the repository using:\n"
+            f"  chown -R {user}:{group} {self.repo_path}\n"
+            f"Or, you can adjust the permissions with:\n"
+            f"  chmod -R 755 {self.repo_path}"
+        )
@@ -0,0 +1,115 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Optional, Sequence, Tuple, Union
+
+import click
+from tabulate import tabulate
+
+import exceptions
+import helpers
+import output
+import profiling
+import scanner
+import sources
+import versioning
+from commands.base_command import BaseCommand
+
+ADDED = "added"
+REMOVED = "removed"
+UPGRADED = "upgraded"
+DOWNGRADED = "downgraded"
+CHANGED = "changed"
+UNCHANGED = "unchanged"
+
+COLORS = {ADDED: "green", REMOVED: "red", UPGRADED: "green", DOWNGRADED: "yellow", CHANGED: "yellow"}
+
+
+class DiffVersionsCommand(BaseCommand):
+    FIELDS: Tuple[str, ...] = ("name", "change", "old_version", "new_version", "path")
+
+    def __init__(self, old_ref: str, new_ref: str, path: Union[str, Sequence[str]] = "./", depth: int = 1,
+                 style: str = "outline", output_format: str = output.TABLE, unchanged: bool = False) -> None:
+        """
+        Compare the plugin versions of two Git revisions, without checking either of them out.
+
+        :param old_ref: Revision compared from.
+        :param new_ref: Revision compared to.
+        :param path: Plugins directory path, or several paths.
+        :param depth: Directory levels below every plugins directory that may contain plugins.
+        :param style: Table output style.
+        :param output_format: One of `output.FORMATS`.
+        :param unchanged: Also list the plugins whose version is the same in both revisions.
+        """
+        self.old_ref: str = old_ref
+        self.new_ref: str = new_ref
+        self.paths: Tuple[str, ...] = (path,) if isinstance(path, str) else tuple(path)
+        self.depth: int = depth
+        self.style: str = style
+        self.output_format: str = output_format
+        self.unchanged: bool = unchanged
+
+    def run(self) -> None:
+        rows = self.__diff()
+
+        if self.output_format != output.TABLE:
+            with output.writer(self.output_format, self.FIELDS) as writer:
+                for row in rows:
+                    writer.write(row)
+            return
+
+        table_data = [(helpers.stylize(row["name"]), row["old_version"] or "", row["new_version"] or "",
+                       click.style(row["change"], fg=COLORS.get(row["change"]))) for row in rows]
+
+        click.echo(tabulate(table_data, tablefmt=self.style,
+                            headers=("Plugin Name", self.old_ref, self.new_ref, "Change")))
+
+    def __diff(self) -> Iterator[Dict]:
+        """
+        Both revisions are read concurrently, each with its own `git ls-tree` and `git cat-file` processes.
+        """
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            old, new = executor.map(profiling.propagate(self.__records), (self.old_ref, self.new_ref))
+
+        for full_path in sorted(old.keys() | new.keys()):
+            old_record, new_record = old.get(full_path), new.get(full_path)
+            change = self.change(old_record and old_record.version, new_record and new_record.version)
+
+            if change == UNCHANGED and not self.unchanged:
+                continue
+
+            yield {
+                "name": os.path.basename(full_path),
+                "change": change,
+                "old_version": old_record and old_record.version,
+                "new_version": new_record and new_record.version,
+                "path": full_path,
+            }
+
+    def __records(self, ref: str) -> Dict[str, scanner.PluginRecord]:
+        with profiling.span("ref", ref=ref):
+            return {record.full_path: record
+                    for path in self.paths for record in sources.ref_records(path, ref, self.depth)}
+
+    @staticmethod
+    def change(old_version: Optional[str], new_version: Optional[str]) -> str:
+        """
+        :return: How a plugin changed between two versions, None standing for a missing plugin.
+        """
+        if old_version is None:
+            return ADDED
+
+        if new_version is None:
+            return REMOVED
+
+        if old_version == new_version:
+            return UNCHANGED
+
+        try:
+            old, new = versioning.VersionNumber.parse(old_version), versioning.VersionNumber.parse(new_version)
+        except exceptions.InvalidArgumentError:
+            return CHANGED
+
+        if old == new:
+            return CHANGED
+
+        return UPGRADED if old < new else DOWNGRADED
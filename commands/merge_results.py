@@ -0,0 +1,61 @@
+import os
+from typing import Sequence, Tuple
+
+import click
+
+import exceptions
+import output
+import profiling
+import shards
+from commands.base_command import BaseCommand
+from commands.multi_update import MultiUpdateCommand
+
+
+class MergeResultsCommand(BaseCommand):
+    def __init__(self, results_paths: Sequence[str], commit: bool = False, commit_per_plugin: bool = False,
+                 style: str = "outline", output_format: str = output.TABLE) -> None:
+        """
+        Combine the results files of the shards of a `multi-update --shard` run into a single report and commit.
+
+        :param results_paths: Results file of every shard.
+        :param commit: Write the new versions to the main files of this tree and commit them, as a single
+                       multi-update does.
+        :param commit_per_plugin: Commit every updated plugin separately instead of a single commit.
+        :param style: Table output style.
+        :param output_format: One of `output.FORMATS`.
+        """
+        self.results_paths: Tuple[str, ...] = tuple(results_paths)
+        self.commit: bool = commit
+        self.commit_per_plugin: bool = commit_per_plugin
+        self.style: str = style
+        self.output_format: str = output_format
+
+    def run(self) -> None:
+        with profiling.span("merge"):
+            merged = shards.Results.merge(shards.Results.load(path) for path in self.results_paths)
+
+        if self.commit:
+            with profiling.span("apply"):
+                applied = merged.apply()
+        else:
+            applied = [(result, result.updated()) for result in merged.results]
+
+        results = [(os.path.dirname(result.main_file), updated) for result, updated in applied]
+
+        if self.output_format == output.TABLE:
+            click.echo(MultiUpdateCommand.create_table(results, self.style))
+        else:
+            MultiUpdateCommand.stream(results, self.output_format)
+
+        updated = [(result, updated) for result, updated in applied if not isinstance(updated, Exception)]
+
+        if self.commit and updated:
+            MultiUpdateCommand.commit_updates([result.main_file for result, _ in updated],
+                                              [(result.name, data) for result, data in updated],
+                                              self.commit_per_plugin)
+
+        failures = len(applied) - len(updated)
+
+        if failures:
+            raise exceptions.BooException(f"{failures} of {len(applied)} plugins could not be updated.")
+
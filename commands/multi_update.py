@@ -0,0 +1,408 @@
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import click
+from tabulate import tabulate
+
+import archive
+import artifacts
+import changes
+import exceptions
+import git
+import helpers
+import journal
+import output
+import plan
+import profiling
+import scanner
+import selection
+import shards
+import validation
+from commands.base_command import BaseCommand
+from commands.update import UpdateCommand
+
+
+class MultiUpdateCommand(BaseCommand):
+    FIELDS: Tuple[str, ...] = ("name", "status", "old_version", "new_version", "error")
+    PLAN_FIELDS: Tuple[str, ...] = ("name", "old_version", "new_version", "write_bytes", "zip_path", "error")
+    TABLE_HEADERS: Tuple[str, ...] = ("Plugin Name", "Info")
+    RESULTS_PATH: str = "boo-results-{index}-of-{count}.json"
+
+    def __init__(self, plugins_path: Union[str, Sequence[str]] = "./", increase: str = "0.0.0",
+                 decrease: str = "0.0.0", include: tuple = (), exclude: tuple = (), style: str = "outline",
+                 commit: bool = False, zip: str = "./", jobs: int = 1, packager: archive.Packager = None,
+                 commit_per_plugin: bool = False, output_format: str = output.TABLE, dry_run: bool = False,
+                 plan_path: str = None, apply_plan: str = None, transactional: bool = False, recover: str = None,
+                 depth: int = 1, strict: bool = False, changed_since: str = None, changed: bool = False,
+                 shard: str = None, results_path: str = None) -> None:
+        """
+        :param plugins_path: Plugins directory path, or several paths that are scanned concurrently.
+        :param jobs: Number of plugins updated concurrently.
+        :param packager: Packaging options for the zip files.
+        :param commit_per_plugin: Commit every updated plugin separately instead of a single commit.
+        :param output_format: One of `output.FORMATS`. Formats other than the table stream one record per plugin.
+        :param dry_run: Only print the planned changes.
+        :param plan_path: Only save the planned changes as JSON to this path, `-` for stdout.
+        :param apply_plan: Path of a saved plan to execute instead of scanning the plugins directory.
+        :param transactional: Stage every main file and zip file first and replace them all at once, or none of them
+                              when any plugin fails.
+        :param recover: Only recover an interrupted transaction, `journal.FORWARD` or `journal.BACK`.
+        :param depth: Directory levels below every plugins directory that may contain plugins.
+        :param strict: Only update plugins that also pass the `wppcpy` constraints.
+        :param changed_since: Only update plugins with changes in the work tree since this Git revision.
+        :param changed: Only update plugins whose content changed since their last update, according to the
+                        `changes.Manifest` of their plugins directory. Only runs with `changed` record it.
+        :param shard: Only update the i-th of n shards of the plugins, `i/n`, split by `shards.select`. Runners
+                      with the same tree get the same split.
+        :param results_path: Path of the `shards.Results` of the run, merged by `merge-results`. Defaults to
+                             `RESULTS_PATH` when sharding.
+        """
+        self.plugins_paths: Tuple[str, ...] = (plugins_path,) if isinstance(plugins_path, str) else tuple(plugins_path)
+        self.depth: int = depth
+        self.increase: str = increase
+        self.decrease: str = decrease
+        self.include: tuple = include
+        self.exclude: tuple = exclude
+        self.selector: selection.Selector = selection.Selector(include, exclude)
+        self.style: str = style
+        self.commit: bool = commit
+        self.zip: str = zip
+        self.jobs: int = jobs
+        self.packager: archive.Packager = packager
+        self.commit_per_plugin: bool = commit_per_plugin
+        self.output_format: str = output_format
+        self.dry_run: bool = dry_run
+        self.plan_path: str = plan_path
+        self.apply_plan: str = apply_plan
+        self.transactional: bool = transactional
+        self.recover: str = recover
+        self.strict: bool = strict
+        self.changed_since: str = changed_since
+        self.changed: bool = changed
+        self.shard: Optional[shards.Shard] = shards.parse(shard) if shard else None
+        self.results_path: Optional[str] = results_path
+
+        if self.shard and not results_path:
+            self.results_path = self.RESULTS_PATH.format(index=self.shard[0], count=self.shard[1])
+
+        if self.shard and self.commit:
+            raise exceptions.InvalidArgumentError("A shard cannot commit, commit the merged results of all shards "
+                                                  "with `merge-results --commit` instead.")
+
+    def run(self):
+        if self.recover:
+            self.__recover()
+            return
+
+        with profiling.span("plan"):
+            change_plan = self.__load_plan() if self.apply_plan else self.__plan()
+
+        self.__check_zip_paths(change_plan.changes)
+
+        if self.plan_path:
+            self.__save_plan(change_plan)
+            return
+
+        if self.dry_run:
+            self.__print_plan(change_plan)
+            return
+
+        planned = {change.path: change for change in change_plan.changes}
+
+        with profiling.span("update"), ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            if self.transactional:
+                pending = iter(self.__transaction(executor, planned))
+            else:
+                update = profiling.propagate(self.__update)
+                futures = [executor.submit(update, change) for change in planned.values()]
+                pending = (self.__result(plugin_abspath, future) for plugin_abspath, future in zip(planned, futures))
+
+            if self.output_format == output.TABLE:
+                results = list(pending)
+                click.echo(self.create_table(results, self.style))
+            else:
+                results = self.stream(pending, self.output_format)
+
+        data = [(os.path.basename(plugin_abspath), updated) for plugin_abspath, updated in results
+                if not isinstance(updated, Exception)]
+        failures = [plugin_abspath for plugin_abspath, updated in results if isinstance(updated, Exception)]
+
+        if self.changed:
+            self.__record([planned[plugin_abspath] for plugin_abspath, updated in results
+                           if not isinstance(updated, Exception)])
+
+        if self.results_path:
+            shards.Results.build(
+                ((os.path.basename(plugin_abspath), planned[plugin_abspath].main_file, updated)
+                 for plugin_abspath, updated in results),
+                self.shard or (1, 1)
+            ).save(self.results_path)
+
+        if self.commit and data:
+            updated_main_files = [planned[plugin_abspath].main_file for plugin_abspath, updated in results
+                                  if not isinstance(updated, Exception)]
+            self.commit_updates(updated_main_files, data, self.commit_per_plugin)
+
+        if failures:
+            raise exceptions.BooException(f"{len(failures)} of {len(results)} plugins could not be updated.")
+
+    @classmethod
+    def stream(cls, results: Iterable[Tuple[str, Union[Dict, Exception]]], output_format: str) \
+            -> List[Tuple[str, Union[Dict, Exception]]]:
+        """
+        Writes every result as soon as the plugin is done, in plugin order.
+        """
+        written = []
+
+        with output.writer(output_format, cls.FIELDS) as writer:
+            for plugin_abspath, updated in results:
+                record = {"name": os.path.basename(plugin_abspath)}
+
+                if isinstance(updated, Exception):
+                    record.update(status="failed", error=str(updated))
+                else:
+                    record.update(status="updated", old_version=updated["old_version"],
+                                  new_version=updated["new_version"])
+
+                writer.write(record)
+                written.append((plugin_abspath, updated))
+
+        return written
+
+    def __plan(self) -> plan.Plan:
+        with profiling.span("scan"):
+            records = list(scanner.Scanner.discover(self.plugins_paths, self.depth))
+
+        with profiling.span("select"):
+            records = {record.full_path: record for record in self.selector.select(records)
+                       if not self.strict or validation.validate(record.full_path, strict=True)}
+
+        plugin_abspaths = list(records)
+
+        if self.shard:
+            plugin_abspaths = [plugin_abspaths[position] for position in self.__select(plugin_abspaths)]
+
+        return plan.Plan.build(
+            self.__changed([records[plugin_abspath] for plugin_abspath in plugin_abspaths]),
+            self.increase,
+            self.decrease,
+            self.zip
+        )
+
+    def __load_plan(self) -> plan.Plan:
+        change_plan = plan.Plan.load(self.apply_plan)
+
+        if self.shard:
+            change_plan.changes = [change_plan.changes[position]
+                                   for position in self.__select([change.path for change in change_plan.changes])]
+
+        return change_plan
+
+    @staticmethod
+    def __check_zip_paths(changes: Iterable[plan.Change]) -> None:
+        """
+        :raise BooException: Plugins with the same directory name in different plugins directories would be zipped
+                             to the same path, and one zip file would silently replace the other.
+        """
+        zipped: Dict[str, str] = {}
+
+        for change in changes:
+            if change.zip_path is None or change.error is not None:
+                continue
+
+            if change.zip_path in zipped:
+                raise exceptions.BooException(f"The plugins {zipped[change.zip_path]} and {change.path} would both be "
+                                              f"zipped to {change.zip_path}, rename one of them or update them "
+                                              f"separately.")
+
+            zipped[change.zip_path] = change.path
+
+    def __select(self, plugin_abspaths: List[str]) -> List[int]:
+        with profiling.span("shard", shard=f"{self.shard[0]}/{self.shard[1]}"):
+            return shards.select(plugin_abspaths, self.shard)
+
+    def __changed(self, records: List[scanner.PluginRecord]) -> List[scanner.PluginRecord]:
+        """
+        Keep the plugins changed since `changed_since` and, with `changed`, since their recorded update.
+        """
+        if self.changed_since is not None:
+            directories = {path: changes.changed_since(path, self.changed_since)
+                           for path in {os.path.dirname(record.full_path) for record in records}}
+            records = [record for record in records
+                       if record.name in directories[os.path.dirname(record.full_path)]]
+
+        if self.changed:
+            manifests = {}
+            records = [record for record in records
+                       if self.__manifest(manifests, record.full_path).changed(record.full_path, record.main_file)]
+
+        return records
+
+    def __record(self, updated: List[plan.Change]) -> None:
+        """
+        Record the content of the updated plugins in the manifests of their plugins directories.
+        """
+        manifests = {}
+
+        for change in updated:
+            self.__manifest(manifests, change.path)
+
+        for path, manifest in manifests.items():
+            manifest.record((change.path, os.path.relpath(change.main_file, change.path)) for change in updated
+                            if os.path.dirname(change.path) == path)
+
+    @staticmethod
+    def __manifest(manifests: Dict[str, changes.Manifest], plugin_abspath: str) -> changes.Manifest:
+        path = os.path.dirname(plugin_abspath)
+
+        if path not in manifests:
+            manifests[path] = changes.Manifest.load(path)
+
+        return manifests[path]
+
+    def __save_plan(self, change_plan: plan.Plan) -> None:
+        if self.plan_path == "-":
+            change_plan.save(click.get_text_stream('stdout'))
+            return
+
+        try:
+            with open(self.plan_path, 'w') as stream:
+                change_plan.save(stream)
+        except IOError as e:
+            raise exceptions.BooException(f"An error occurred while writing the plan '{self.plan_path}': {e}")
+
+    def __print_plan(self, change_plan: plan.Plan) -> None:
+        if self.output_format == output.TABLE:
+            click.echo(self.__create_plan_table(change_plan.changes))
+        else:
+            with output.writer(self.output_format, self.PLAN_FIELDS) as writer:
+                for change in change_plan.changes:
+                    writer.write(change._asdict())
+
+        failures = change_plan.failures
+
+        if failures:
+            raise exceptions.BooException(f"{len(failures)} of {len(change_plan.changes)} plugins cannot be updated.")
+
+    def __transaction(self, executor: ThreadPoolExecutor, planned: Dict[str, plan.Change]) \
+            -> List[Tuple[str, Union[Dict, Exception]]]:
+        """
+        Stages every plugin concurrently, then replaces all main files and zip files at once.
+
+        The journal is kept in the plugins directory, see `__journal_path`.
+        """
+        if not planned:
+            return []
+
+        with journal.Transaction(self.__journal_path(list(planned))) as transaction:
+            update = profiling.propagate(self.__update)
+            futures = [executor.submit(update, change, transaction) for change in planned.values()]
+            results = [self.__result(plugin_abspath, future) for plugin_abspath, future in zip(planned, futures)]
+
+            if any(isinstance(updated, Exception) for plugin_abspath, updated in results):
+                rolled_back = exceptions.BooException("Not updated, another plugin failed and nothing was changed.")
+                return [(plugin_abspath, updated if isinstance(updated, Exception) else rolled_back)
+                        for plugin_abspath, updated in results]
+
+            try:
+                with profiling.span("transaction_commit"):
+                    transaction.commit()
+            except exceptions.BooException as e:
+                return [(plugin_abspath, e) for plugin_abspath, updated in results]
+
+        if self.packager is not None and self.packager.reproducible:
+            zip_paths = [change.zip_path for change in planned.values() if change.zip_path]
+
+            for path in {os.path.dirname(zip_path) for zip_path in zip_paths}:
+                artifacts.ArtifactStore(path).record(
+                    (zip_path, None) for zip_path in zip_paths if os.path.dirname(zip_path) == path
+                )
+
+        return results
+
+    def __journal_path(self, plugin_abspaths: List[str]) -> str:
+        """
+        The journal of a transaction is kept in the first `--path` that contains the first planned plugin, where
+        `__recover` looks for it whatever the depth of the plugins. A plan applied from outside of its plugins
+        directories keeps the journal in the parent directory of that plugin.
+        """
+        plugin_abspath = plugin_abspaths[0]
+
+        for path in map(os.path.abspath, self.plugins_paths):
+            if os.path.commonpath([path, plugin_abspath]) == path:
+                return path
+
+        return os.path.dirname(plugin_abspath)
+
+    def __recover(self) -> None:
+        paths = {os.path.abspath(path) for path in self.plugins_paths}
+
+        if self.apply_plan:
+            change_plan = self.__load_plan()
+
+            if change_plan.changes:
+                paths.add(self.__journal_path([change.path for change in change_plan.changes]))
+
+        recovered = sum(journal.Transaction.recover(path, self.recover) for path in sorted(paths))
+
+        if recovered:
+            click.echo(f"Rolled {self.recover} the {recovered} files of the interrupted transaction.")
+        else:
+            click.echo("There is no interrupted transaction.")
+
+    def __update(self, change: plan.Change, transaction: journal.Transaction = None) -> Dict:
+        update_command: UpdateCommand = UpdateCommand(
+            plugin_abspath=change.path,
+            zip=self.zip,
+            packager=self.packager,
+            change=change,
+            transaction=transaction
+        )
+
+        with profiling.span("plugin", plugin=change.name):
+            return update_command.run()
+
+    @staticmethod
+    def __result(plugin_abspath: str, future: Future) -> Tuple[str, Union[Dict, Exception]]:
+        try:
+            return plugin_abspath, future.result()
+        except Exception as e:
+            return plugin_abspath, e
+
+    @staticmethod
+    def commit_updates(main_files: List[str], data: List[Tuple[str, dict]], commit_per_plugin: bool = False):
+        commit_messages = [helpers.prepare_update_message(**updated_info) for plugin_name, updated_info in data]
+
+        if commit_per_plugin:
+            with profiling.span("commit"):
+                git.Git.commit_each((message, [main_file]) for message, main_file in zip(commit_messages, main_files))
+        else:
+            helpers.commit(main_files, "\n".join(commit_messages))
+
+    @classmethod
+    def create_table(cls, results: List[Tuple[str, Union[Dict, Exception]]], style: str = "outline") -> str:
+        table_data = [(helpers.stylize(os.path.basename(plugin_abspath)),
+                       click.style(str(updated), fg='red') if isinstance(updated, Exception)
+                       else helpers.prepare_update_message(**updated, color=True))
+                      for plugin_abspath, updated in results]
+
+        return tabulate(
+            table_data,
+            tablefmt=style,
+            headers=cls.TABLE_HEADERS
+        )
+
+    def __create_plan_table(self, planned: List[plan.Change]) -> str:
+        table_data = [(helpers.stylize(change.name),
+                       click.style(change.error, fg='red') if change.error is not None
+                       else f"{change.old_version} -> {helpers.stylize(change.new_version)}",
+                       change.write_bytes,
+                       change.zip_path or "")
+                      for change in planned]
+
+        return tabulate(
+            table_data,
+            tablefmt=self.style,
+            headers=("Plugin Name", "Change", "Bytes To Write", "Zip File")
+        )
@@ -0,0 +1,38 @@
+import signal
+
+import click
+
+import daemon
+from commands.base_command import BaseCommand
+
+
+class ServeCommand(BaseCommand):
+    def __init__(self, path: str = "./", polling: bool = False, interval: float = daemon.POLL_INTERVAL) -> None:
+        """
+        :param path: Plugins directory path.
+        :param polling: Poll the main files instead of using inotify.
+        :param interval: Seconds between two polls.
+        """
+        self.path: str = path
+        self.polling: bool = polling
+        self.interval: float = interval
+
+    def run(self) -> None:
+        """
+        Serves the plugins directory until interrupted or terminated.
+        """
+        server = daemon.Server(self.path, daemon.watcher(self.path, self.polling, self.interval))
+        signal.signal(signal.SIGTERM, self.__terminate)
+
+        click.echo(f"Serving {server.path} on {server.server_address} ({type(server.watcher).__name__})")
+
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+    @staticmethod
+    def __terminate(signum, frame) -> None:
+        raise KeyboardInterrupt
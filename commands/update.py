@@ -0,0 +1,91 @@
+import os
+from typing import Dict, Optional
+
+import archive
+import artifacts
+import exceptions
+import file
+import helpers
+import journal
+import plan
+import scanner
+from commands.base_command import BaseCommand
+
+
+class UpdateCommand(BaseCommand):
+    def __init__(self, plugin_abspath: str = "./", increase: str = "0.0.0", decrease: str = "0.0.0",
+                 commit: bool = False, zip: str = "./", record: scanner.PluginRecord = None,
+                 packager: archive.Packager = None, change: plan.Change = None,
+                 transaction: journal.Transaction = None) -> None:
+        """
+        :param plugin_abspath: Plugin directory path.
+        :param record: Already scanned record of the plugin. The plugin is scanned on run when omitted.
+        :param packager: Packaging options for the zip file.
+        :param change: Already planned change, e.g. from a saved plan. Planned from the record when omitted.
+        :param transaction: Stage the main file and the zip file in this transaction instead of writing them.
+        """
+        self.plugin_abspath: str = plugin_abspath
+        self.record: scanner.PluginRecord = record
+        self.increase: str = increase
+        self.decrease: str = decrease
+        self.commit: bool = commit
+        self.zip: str = zip
+        self.packager: archive.Packager = packager
+        self.change: plan.Change = change
+        self.transaction: journal.Transaction = transaction
+
+    def run(self) -> Dict:
+        try:
+            if self.change is None:
+                if self.record is None:
+                    self.record = scanner.Scanner.read(self.plugin_abspath)
+
+                self.change = plan.Plan.build([self.record], self.increase, self.decrease, self.zip).changes[0]
+
+            if self.transaction is None:
+                plan.apply(self.change)
+                substitutes = None
+            else:
+                substitutes = {self.change.main_file: plan.stage(self.change, self.transaction)}
+
+            data = {
+                "plugin_name": self.change.name,
+                "old_version": self.change.old_version,
+                "new_version": self.change.new_version,
+            }
+        except Exception as e:
+            plugin_name = os.path.basename(os.path.normpath(self.plugin_abspath))
+            raise exceptions.BooException(f"An error occurred while updating the '{plugin_name}' version: {e}")
+
+        if self.change.zip_path:
+            self.__zip(substitutes)
+
+        if self.commit:
+            self.__commit(data)
+
+        return data
+
+    def __zip(self, substitutes: Optional[Dict[str, str]]):
+        zip_path = self.change.zip_path
+
+        previous_zip_path = None
+        if self.packager is not None and self.packager.incremental:
+            previous_zip_path = archive.previous_artifact(os.path.dirname(zip_path), self.change.name)
+
+        artifact_store = None
+        if self.packager is not None and self.packager.reproducible:
+            artifact_store = artifacts.ArtifactStore(os.path.dirname(zip_path))
+
+        if self.transaction is not None:
+            zip_path = self.transaction.stage(zip_path)
+
+        digest = file.Zip.create(self.change.path, zip_path, self.packager, previous_zip_path, substitutes,
+                                 artifact_store)
+
+        # A staged zip file is only in place once the transaction commits, its checksum is recorded then.
+        if artifact_store is not None and self.transaction is None:
+            artifact_store.record([(zip_path, digest)])
+
+    def __commit(self, data: Dict) -> None:
+        commit_message = helpers.prepare_update_message(**data)
+        helpers.commit([self.change.main_file], commit_message)
@@ -0,0 +1,87 @@
+import os
+import subprocess
+
+import click
+
+import exceptions
+import git
+import updates
+from commands.base_command import BaseCommand
+
+
+class UpgradeCommand(BaseCommand):
+    """
+    Upgrade tool by checking for new commits in the repository located at /opt/boo.
+    If new commits exist, pull them.
+    """
+    REPO_PATH = os.path.expanduser("~/boo")  # Updated path to user's home directory
+
+    def __init__(self, repo_path: str = REPO_PATH, timeout: float = updates.DEFAULT_TIMEOUT) -> None:
+        """
+        :param repo_path: The path to the boo repository.
+        :param timeout: Seconds after which fetching from the remote is aborted.
+        """
+        self.repo_path: str = repo_path
+        self.timeout: float = timeout
+
+    def run(self):
+        """
+        Executes the upgrade command.
+        """
+        if not os.path.isdir(self.repo_path):
+            raise exceptions.BooException(f"Repository path '{self.repo_path}' does not exist.")
+
+        try:
+            click.echo("Checking for updates...")
+
+            # Fetch with a timeout, the result also refreshes the cache of `check-updates`.
+            check = updates.UpdateCheck(self.repo_path, timeout=self.timeout)
+            status = check.refresh()
+
+            if status.error is not None:
+                raise exceptions.BooException(status.error)
+
+            if status.available:
+                click.echo("New updates found! Pulling the latest changes...")
+                git.Git.pull(self.repo_path)
+                check.store(status._replace(local=status.remote))
+                click.echo("Update complete!")
+            else:
+                click.echo("Already up to date.")
+
+        except subprocess.CalledProcessError as e:
+            raise exceptions.BooException(
+                f"An error occurred while executing a Git command: {e}\n"
+                f"Please make sure you have the necessary permissions to access the repository at '{self.repo_path}'."
+            )
+
+        except PermissionError:
+            suggested_fix = self.__suggest_permission_fix()
+            raise exceptions.BooException(
+                f"Permission denied while accessing the repository at '{self.repo_path}'.\n"
+                f"Please check the file permissions and try again. {suggested_fix}"
+            )
+
+        except exceptions.BooException:
+            raise
+
+        except Exception as e:
+            raise exceptions.BooException(f"An error occurred during the upgrade process: {e}")
+
+    def __suggest_permission_fix(self) -> str:
+        """
+        Suggests potential fixes for permission issues.
+
+        :return: A string with suggestions for fixing permission issues.
+        """
+        user = os.getenv("USER", "the current user")
+        group = os.getenv("GROUP", "the appropriate group")
+
+        return (
+            f"Did you mean to run the command with elevated privileges? "
+            f"Try using 'sudo' before the command if necessary.\n"
+            f"Alternatively, you can change the ownership of the repository using:\n"
+            f"  chown -R {user}:{group} {self.repo_path}\n"
+            f"Or, you can adjust the permissions with:\n"
+            f"  chmod -R 755 {self.repo_path}"
+        )
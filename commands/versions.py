@@ -0,0 +1,147 @@
+from typing import AnyStr, Iterable, Iterator, Sequence, Tuple, Union
+
+import click
+from tabulate import tabulate
+
+import daemon
+import exceptions
+import helpers
+import index
+import output
+import scanner
+import sources
+import validation
+from commands.base_command import BaseCommand
+from version import Version
+
+
+class VersionsCommand(BaseCommand):
+    FIELDS: Tuple[str, ...] = ("name", "plugin_name", "version", "version_int", "main_file", "path", "error")
+
+    def __init__(self, path: Union[str, Sequence[str]] = "./", style: str = "outline", cache: bool = True,
+                 output_format: str = output.TABLE, depth: int = 1, strict: bool = False, zips: bool = False,
+                 ref: str = None):
+        """
+        Initializes the VersionsCommand with default path and style.
+
+        :param path: Plugins directory path, or several paths that are scanned concurrently.
+        :param style: Table output style.
+        :param cache: Use a running daemon, or the persistent header index under the plugins directory.
+        :param output_format: One of `output.FORMATS`. Formats other than the table stream one record per plugin.
+        :param depth: Directory levels below every plugins directory that may contain plugins.
+        :param strict: Only list plugins that also pass the `wppcpy` constraints.
+        :param zips: Read the plugins from the zip files in the paths instead of plugin directories.
+        :param ref: Read the plugins as of this Git revision instead of from the work tree.
+        """
+        self.paths: Tuple[str, ...] = (path,) if isinstance(path, str) else tuple(path)
+        self.depth: int = depth
+        self.style: str = style
+        self.cache: bool = cache
+        self.output_format: str = output_format
+        self.strict: bool = strict
+        self.zips: bool = zips
+        self.ref: str = ref
+        self.table_headers: Tuple[str, str, str] = (
+            "Plugin Name",
+            "Plugin DN Version",
+            "Plugin Version"
+        )
+
+    def run(self) -> None:
+        """
+        Executes the command to display plugin versions.
+        """
+        if self.output_format != output.TABLE:
+            self.__stream()
+            return
+
+        output_table: AnyStr = self.__get_output()
+        click.echo(output_table)
+
+    def __stream(self) -> None:
+        """
+        Writes every plugin record as soon as it is scanned.
+        """
+        with output.writer(self.output_format, self.FIELDS) as writer:
+            for record in self.__get_records():
+                version_int = self.__to_int(record.version)
+                error = version_int if isinstance(version_int, str) else None
+
+                writer.write({
+                    "name": record.name,
+                    "plugin_name": record.plugin_name,
+                    "version": record.version,
+                    "version_int": None if error else version_int,
+                    "main_file": record.main_file,
+                    "path": record.full_path,
+                    "error": error,
+                })
+
+    def __get_output(self) -> AnyStr:
+        """
+        Generates the output table string.
+
+        :return: Formatted table string.
+        """
+        data = self.__get_data(self.__get_records())
+        return tabulate(data, tablefmt=self.style, headers=self.table_headers)
+
+    def __get_records(self) -> Iterator[scanner.PluginRecord]:
+        if self.zips or self.ref is not None:
+            return self.__get_snapshot_records()
+
+        records = scanner.Scanner.discover(self.paths, self.depth, self.__scan)
+
+        if self.strict:
+            records = (record for record in records if validation.validate(record.full_path, strict=True))
+
+        return records
+
+    def __get_snapshot_records(self) -> Iterator[scanner.PluginRecord]:
+        """
+        Records of zip files or of a Git revision, which are not plugin directories the other options apply to.
+        """
+        if self.strict:
+            raise exceptions.BooException("--strict only checks plugin directories, not zip files or Git revisions.")
+
+        if self.zips and self.ref is not None:
+            raise exceptions.BooException("Zip files cannot be read at a Git revision.")
+
+        for path in self.paths:
+            if self.zips:
+                yield from sources.zip_records(path)
+            else:
+                yield from sources.ref_records(path, self.ref, self.depth)
+
+    def __scan(self, path: str, depth: int) -> Iterator[scanner.PluginRecord]:
+        if not self.cache:
+            yield from scanner.Scanner.iterate(path, depth=depth)
+            return
+
+        # The daemon only serves plugins right below its directory.
+        records = daemon.records(path) if depth == 1 else None
+
+        if records is not None:
+            yield from records
+            return
+
+        with index.HeaderIndex(path) as header_index:
+            yield from scanner.Scanner.iterate(path, header_index, depth)
+
+    def __get_data(self, records: Iterable[scanner.PluginRecord]) -> object:
+        for record in records:
+            yield [
+                helpers.stylize(record.name),
+                helpers.stylize(record.version),
+                helpers.stylize(self.__to_int(record.version)),
+            ]
+
+    @staticmethod
+    def __to_int(version: str) -> Union[int, str]:
+        """
+        :return: The packed version, or why it cannot be parsed, as `multi-update` would report it.
+        """
+        try:
+            return Version.to_int(version, strict=True)
+        except exceptions.InvalidArgumentError as e:
+            return str(e)
@@ -0,0 +1,447 @@
+import hashlib
+import json
+import os
+import select
+import socket
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, Iterator, List, Optional
+
+import exceptions
+import helpers
+import index
+import scanner
+
+SOCKET = "daemon.sock"
+# `sun_path` is 108 bytes on Linux and 104 on macOS, longer socket paths move to the temporary directory.
+SOCKET_PATH_LIMIT = 100
+CONNECT_TIMEOUT = 0.5
+POLL_INTERVAL = 1.0
+
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+INOTIFY_EVENT = struct.Struct("iIII")
+PLUGINS_DIRECTORY_EVENTS = IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_ONLYDIR
+PLUGIN_EVENTS = (IN_CLOSE_WRITE | IN_MODIFY | IN_ATTRIB | IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO
+                 | IN_ONLYDIR)
+
+
+def socket_path(path: str) -> str:
+    """
+    Return the socket the daemon of a plugins directory listens on, `<path>/.boo/daemon.sock`.
+    """
+    path = os.path.abspath(path)
+    candidate = os.path.join(path, index.DIRECTORY, SOCKET)
+
+    if len(os.fsencode(candidate)) <= SOCKET_PATH_LIMIT:
+        return candidate
+
+    digest = hashlib.sha1(os.fsencode(path)).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f"boo-{digest}.sock")
+
+
+def records(path: str) -> Optional[List[scanner.PluginRecord]]:
+    """
+    Ask the daemon of a plugins directory for the records of all plugins.
+
+    :return: Records sorted by directory name, None when no daemon is serving the directory.
+    """
+    client = Client.connect(path)
+
+    if client is None:
+        return None
+
+    try:
+        with client:
+            return client.versions()
+    except exceptions.BooException:
+        return None
+
+
+class Client:
+    """
+    A connection to the daemon of a plugins directory. Requests and responses are JSON lines.
+    """
+
+    def __init__(self, connection: socket.socket) -> None:
+        self._connection: socket.socket = connection
+        self._reader = connection.makefile('rb')
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @classmethod
+    def connect(cls, path: str, timeout: float = CONNECT_TIMEOUT) -> Optional["Client"]:
+        """
+        :param path: Plugins directory path.
+        :return: The connection, None when no daemon is listening.
+        """
+        address = socket_path(path)
+
+        if not os.path.exists(address):
+            return None
+
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.settimeout(timeout)
+
+        try:
+            connection.connect(address)
+        except OSError:
+            connection.close()
+            return None
+
+        return cls(connection)
+
+    def request(self, command: str, **arguments) -> Dict:
+        """
+        :raise BooException: The daemon could not be reached or did not answer the request.
+        """
+        try:
+            self._connection.sendall(json.dumps({"command": command, **arguments}).encode() + b"\n")
+            response = json.loads(self._reader.readline() or b"null")
+        except (OSError, ValueError) as e:
+            raise exceptions.BooException(f"An error occurred while querying the daemon: {e}")
+
+        if not isinstance(response, dict) or "error" in response:
+            error = response.get("error") if isinstance(response, dict) else "no response"
+            raise exceptions.BooException(f"The daemon could not answer '{command}': {error}")
+
+        return response
+
+    def versions(self) -> List[scanner.PluginRecord]:
+        return [scanner.PluginRecord(**record) for record in self.request("versions")["records"]]
+
+    def lookup(self, name: str) -> Optional[scanner.PluginRecord]:
+        record = self.request("lookup", name=name)["record"]
+
+        return scanner.PluginRecord(**record) if record is not None else None
+
+    def close(self) -> None:
+        self._reader.close()
+        self._connection.close()
+
+
+class Watcher(ABC):
+    """
+    Reports which plugin directories of a plugins directory changed.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path: str = path
+
+    def watch(self, names: List[str]) -> None:
+        """Start watching the initially scanned plugin directories."""
+
+    @abstractmethod
+    def changes(self, timeout: float) -> Optional[List[str]]:
+        """
+        Wait for changes.
+
+        :return: Names of the plugin directories that may have changed, None when everything must be rescanned.
+        """
+
+    def close(self) -> None:
+        pass
+
+
+class PollingWatcher(Watcher):
+    """
+    Compares the stat signatures of every main file candidate on an interval.
+    """
+
+    def __init__(self, path: str, interval: float = POLL_INTERVAL) -> None:
+        super().__init__(path)
+        self.interval: float = interval
+        self._signatures: Dict[str, tuple] = {}
+        self._polled: float = 0.0
+
+    def watch(self, names: List[str]) -> None:
+        self._signatures = self.__signatures()
+        self._polled = time.monotonic()
+
+    def changes(self, timeout: float) -> Optional[List[str]]:
+        remaining = self._polled + self.interval - time.monotonic()
+
+        if remaining > 0:
+            time.sleep(min(timeout, remaining))
+
+            if remaining > timeout:
+                return []
+
+        signatures = self.__signatures()
+        changed = [name for name in signatures.keys() | self._signatures.keys()
+                   if signatures.get(name) != self._signatures.get(name)]
+
+        self._signatures = signatures
+        self._polled = time.monotonic()
+
+        return sorted(changed)
+
+    def __signatures(self) -> Dict[str, tuple]:
+        signatures = {}
+
+        try:
+            names = os.listdir(self.path)
+        except OSError:
+            return signatures
+
+        for name in names:
+            signature = []
+
+            for main_file in helpers.MAIN_FILES:
+                try:
+                    signature.append(index.signature(os.stat(os.path.join(self.path, name, main_file))))
+                except OSError:
+                    signature.append(None)
+
+            signatures[name] = tuple(signature)
+
+        return signatures
+
+
+class InotifyWatcher(Watcher):
+    """
+    Watches the plugins directory and every plugin directory with Linux inotify, through ctypes.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :raise OSError: inotify is not available.
+        """
+        super().__init__(path)
+
+        import ctypes
+
+        self._libc = ctypes.CDLL(None, use_errno=True)
+
+        if not hasattr(self._libc, "inotify_init1"):
+            raise OSError("inotify is not available")
+
+        self._fd: int = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self._directories: Dict[int, Optional[str]] = {}
+        self._root: int = self.__add_watch(None, PLUGINS_DIRECTORY_EVENTS)
+
+        if self._root < 0:
+            self.close()
+            raise OSError(ctypes.get_errno(), f"Cannot watch {path}")
+
+    def watch(self, names: List[str]) -> None:
+        for name in names:
+            self.__add_watch(name, PLUGIN_EVENTS)
+
+    def changes(self, timeout: float) -> Optional[List[str]]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+
+        if not readable:
+            return []
+
+        changed = set()
+
+        for wd, mask, name in self.__events():
+            if mask & IN_Q_OVERFLOW:
+                return None
+
+            if mask & IN_IGNORED:
+                self._directories.pop(wd, None)
+                continue
+
+            if wd == self._root:
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    self.__add_watch(name, PLUGIN_EVENTS)
+                changed.add(name)
+            elif wd in self._directories and name in helpers.MAIN_FILES:
+                changed.add(self._directories[wd])
+
+        return sorted(changed)
+
+    def close(self) -> None:
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def __add_watch(self, name: Optional[str], mask: int) -> int:
+        path = self.path if name is None else os.path.join(self.path, name)
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask)
+
+        # Files are not watched, and a directory may disappear before it is watched.
+        if wd >= 0 and name is not None:
+            self._directories[wd] = name
+
+        return wd
+
+    def __events(self) -> Iterator[tuple]:
+        try:
+            buffer = os.read(self._fd, 65536)
+        except BlockingIOError:
+            return
+
+        offset = 0
+
+        while offset < len(buffer):
+            wd, mask, cookie, length = INOTIFY_EVENT.unpack_from(buffer, offset)
+            offset += INOTIFY_EVENT.size
+            name = os.fsdecode(buffer[offset:offset + length].rstrip(b"\0"))
+            offset += length
+
+            yield wd, mask, name
+
+
+def watcher(path: str, polling: bool = False, interval: float = POLL_INTERVAL) -> Watcher:
+    """
+    Create an inotify watcher, or a polling watcher when polling is requested or inotify is not available.
+    """
+    if not polling:
+        try:
+            return InotifyWatcher(path)
+        except (OSError, AttributeError):
+            pass
+
+    return PollingWatcher(path, interval)
+
+
+class Server(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Keeps the records of a plugins directory current and answers queries about them over a Unix socket.
+
+    The directory is scanned once on start, afterwards only the plugin directories reported by the watcher
+    are read again.
+    """
+    daemon_threads = True
+
+    def __init__(self, path: str, plugins_watcher: Optional[Watcher] = None) -> None:
+        """
+        :param path: Plugins directory path.
+        :param plugins_watcher: Change source. Default: inotify, or polling where inotify is not available.
+        """
+        helpers.validate_path(path)
+
+        self.path: str = os.path.abspath(path)
+        self.watcher: Watcher = plugins_watcher or watcher(self.path)
+        self.records: Dict[str, scanner.PluginRecord] = {}
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._watch_thread: Optional[threading.Thread] = None
+
+        address = socket_path(self.path)
+        self.__remove_stale_socket(address)
+        index.create_directory(self.path)
+
+        super().__init__(address, Handler)
+
+    def serve_forever(self, poll_interval: float = 0.5) -> None:
+        self.__scan()
+        self._watch_thread = threading.Thread(target=self.__watch, name="boo-watcher", daemon=True)
+        self._watch_thread.start()
+
+        super().serve_forever(poll_interval)
+
+    def server_close(self) -> None:
+        self._stopped.set()
+
+        if self._watch_thread is not None:
+            self._watch_thread.join()
+
+        self.watcher.close()
+        super().server_close()
+
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+    def answer(self, request: Dict) -> Dict:
+        command = request.get("command")
+
+        with self._lock:
+            if command == "ping":
+                return {"path": self.path, "plugins": len(self.records)}
+
+            if command == "versions":
+                return {"records": [self.records[name]._asdict() for name in sorted(self.records)]}
+
+            if command == "lookup":
+                record = self.records.get(request.get("name"))
+                return {"record": record._asdict() if record is not None else None}
+
+        return {"error": f"Unknown command {command!r}"}
+
+    def __scan(self) -> None:
+        with index.HeaderIndex(self.path) as header_index:
+            scanned = {record.name: record for record in scanner.Scanner.iterate(self.path, header_index)}
+
+        with self._lock:
+            self.records = scanned
+
+        self.watcher.watch(list(scanned))
+
+    def __watch(self) -> None:
+        while not self._stopped.is_set():
+            changed = self.watcher.changes(timeout=0.5)
+
+            if changed is None:
+                self.__scan()
+                continue
+
+            for name in changed:
+                self.__refresh(name)
+
+    def __refresh(self, name: str) -> None:
+        try:
+            record = scanner.Scanner.read(os.path.join(self.path, name))
+        except exceptions.BooException:
+            record = None
+
+        with self._lock:
+            if record is None:
+                self.records.pop(name, None)
+            else:
+                self.records[name] = record
+
+    @staticmethod
+    def __remove_stale_socket(address: str) -> None:
+        if not os.path.exists(address):
+            return
+
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+
+        try:
+            connection.connect(address)
+        except OSError:
+            os.remove(address)
+            return
+        finally:
+            connection.close()
+
+        raise exceptions.BooException(f"A daemon is already listening on {address}")
+
+
+class Handler(socketserver.StreamRequestHandler):
+    def handle(self) -> None:
+        for line in self.rfile:
+            try:
+                response = self.server.answer(json.loads(line))
+            except (ValueError, AttributeError) as e:
+                response = {"error": str(e)}
+
+            self.wfile.write(json.dumps(response).encode() + b"\n")
+            self.wfile.flush()
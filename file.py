@@ -1,29 +1,32 @@
 import os
-import zipfile
-import wppcpy
+from typing import Dict, Optional
 
+import archive
+import artifacts
 import exceptions
+import helpers
+import profiling
+import scanner
+import selection
+import validation
 from helpers import MAIN_FILES
 from version import Version
 
 
 class Zip:
     @staticmethod
-    def create(directory_path: str, output_zip_path: str) -> None:
-        directory_name = os.path.basename(directory_path)
+    def create(directory_path: str, output_zip_path: str, packager: archive.Packager = None,
+               previous_zip_path: str = None, substitutes: Dict[str, str] = None,
+               artifact_store: artifacts.ArtifactStore = None) -> Optional[str]:
+        if packager is None:
+            packager = archive.Packager()
 
-        with zipfile.ZipFile(output_zip_path, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-            for root, _, files in os.walk(directory_path):
-                for file_name in files:
-                    full_file_path = os.path.join(root, file_name)
-                    relative_file_path = os.path.join(str(directory_name),
-                                                      os.path.relpath(str(full_file_path), directory_path))
-                    zip_file.write(str(full_file_path), relative_file_path)
+        with profiling.span("zip", plugin=os.path.basename(os.path.normpath(directory_path))):
+            return packager.create(directory_path, output_zip_path, previous_zip_path, substitutes, artifact_store)
 
 
 class Plugin:
     def __init__(self, path: str) -> None:
-        self.validate(path)
         self._path = path
 
     @property
@@ -63,22 +66,16 @@ class Plugin:
 
     @staticmethod
     def filter(abspaths: list[str], include: list[str], exclude: list[str]) -> list[str]:
-        f = lambda abspaths, callback: [_ for _ in abspaths if callback(_)]
-
-        if include:
-            callback: callable(str) = lambda path: any(_.strip("/") == os.path.basename(path) for _ in include)
-            abspaths: list[str] = f(abspaths, callback)
-
-        if exclude:
-            callback: callable(str) = lambda path: all(_.strip("/") != os.path.basename(path) for _ in exclude)
-            abspaths: list[str] = f(abspaths, callback)
-
-        return abspaths
+        """
+        Filter plugin paths by the patterns of `selection.Selector`.
+        """
+        return selection.Selector(include, exclude).filter(abspaths)
 
     def update(self, content: str) -> None:
+        plugin = self.plugin
+
         try:
-            with open(self.plugin, 'w') as plugin:
-                plugin.write(content)
+            helpers.atomic_write(plugin, [content.encode()])
         except IOError as e:
             raise exceptions.BooException(f"An error occurred while writing the file '{plugin}': {e}")
 
@@ -92,25 +89,14 @@ class Plugin:
         return content
 
     @staticmethod
-    def validate(path: str) -> bool:
-        main_file_name = "init.php"
-
-        plugin_constraints = [
-            wppcpy.constraints.file.MainFile(path, files=main_file_name),
-            wppcpy.constraints.header.PluginName(path, main_file_name=main_file_name),
-            wppcpy.constraints.header.Version(path, main_file_name=main_file_name),
-        ]
-
-        try:
-            return all(cons.validate() for cons in plugin_constraints)
-        except wppcpy.exceptions.base.PcpyException:
-            return False
-
+    def validate(path: str, strict: bool = False) -> bool:
+        """
+        :param strict: Validate with the `wppcpy` constraints instead of the built-in header check.
+        """
+        return validation.validate(path, strict)
 
     @staticmethod
-    def list(path: str) -> list:
-        plugins = [Plugin(os.path.join(path, _))
-                   for _ in sorted(os.listdir(path))
-                   if Plugin.validate(os.path.join(path, _))]
+    def list(path: str, depth: int = 1) -> list:
+        plugins = [Plugin(record.path) for record in scanner.Scanner.scan(path, depth=depth)]
 
         return plugins
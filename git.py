@@ -1,5 +1,20 @@
 import os
+import signal
 import subprocess
+import tempfile
+from contextlib import contextmanager
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+import profiling
+
+
+@contextmanager
+def _process(command: str) -> Iterator[None]:
+    """Profile a git process, counted as a subprocess of the open spans."""
+    with profiling.span("git", command=command):
+        profiling.count("subprocesses")
+        yield
+
 
 class Git:
     """
@@ -7,13 +22,92 @@ class Git:
     """
 
     @staticmethod
-    def fetch(repo_path: str) -> None:
+    def fetch(repo_path: str, timeout: Optional[float] = None) -> None:
+        """
+        Fetch the latest changes from the remote repository, without ever prompting for credentials.
+
+        :param repo_path: The path to the Git repository.
+        :param timeout: Seconds after which git is killed together with the transport processes it started.
+        :raise subprocess.TimeoutExpired: The fetch took longer than the timeout.
+        :raise subprocess.CalledProcessError: The fetch failed.
+        """
+        command = ["git", "fetch", "--quiet"]
+
+        with _process("fetch"):
+            process = subprocess.Popen(
+                command, cwd=repo_path, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                env={**os.environ, "GIT_TERMINAL_PROMPT": "0"}, start_new_session=timeout is not None
+            )
+
+            try:
+                returncode = process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                os.killpg(process.pid, signal.SIGKILL)
+                process.wait()
+                raise
+
+        if returncode:
+            raise subprocess.CalledProcessError(returncode, command)
+
+    @staticmethod
+    def rev_parse(repo_path: Optional[str], *revisions: str) -> List[str]:
         """
-        Fetch the latest changes from the remote repository.
+        Resolve any number of revisions with a single `git rev-parse` process.
 
         :param repo_path: The path to the Git repository.
+        :param revisions: Revisions to resolve.
+        :return: Object names in the order of the revisions.
+        """
+        with _process("rev-parse"):
+            output = subprocess.check_output(["git", "rev-parse", *revisions], cwd=repo_path)
+
+        return output.decode().split()
+
+    @staticmethod
+    def changed_paths(repo_path: str, revision: str) -> List[str]:
+        """
+        List the files of the work tree that differ from a revision, staged or not, and the untracked files.
+
+        :param repo_path: Directory inside the Git repository, the only one that is looked at.
+        :param revision: Revision to compare with.
+        :return: Paths relative to `repo_path`.
+        """
+        with _process("diff"):
+            changed = subprocess.check_output(
+                ["git", "diff", "--name-only", "--relative", "--no-renames", "-z", revision, "--"], cwd=repo_path
+            )
+
+        with _process("ls-files"):
+            untracked = subprocess.check_output(["git", "ls-files", "--others", "--exclude-standard", "-z"],
+                                                cwd=repo_path)
+
+        return [os.fsdecode(path) for path in (changed + untracked).split(b"\0") if path]
+
+    @staticmethod
+    def ls_tree(repo_path: str, revision: str) -> List[Tuple[str, str]]:
+        """
+        List the files of a revision below a directory, without checking it out.
+
+        :param repo_path: Directory inside the Git repository, the only one that is looked at.
+        :param revision: Revision whose tree is listed.
+        :return: (object name, path relative to `repo_path`) of every blob, in path order.
         """
-        subprocess.run(["git", "fetch"], cwd=repo_path, check=True, stdout=open(os.devnull, 'wb'))
+        with _process("ls-tree"):
+            output = subprocess.check_output(["git", "ls-tree", "-r", "-z", revision, "--", "."], cwd=repo_path)
+
+        entries = []
+
+        for line in output.split(b"\0"):
+            if not line:
+                continue
+
+            metadata, path = line.split(b"\t", 1)
+            mode, object_type, name = metadata.decode().split()
+
+            if object_type == "blob":
+                entries.append((name, os.fsdecode(path)))
+
+        return entries
 
     @staticmethod
     def has_new_commits(repo_path: str) -> bool:
@@ -23,15 +117,7 @@ class Git:
         :param repo_path: The path to the Git repository.
         :return: True if there are new commits, otherwise False.
         """
-        local_head = subprocess.check_output(
-            ["git", "rev-parse", "@{0}"],
-            cwd=repo_path
-        ).strip()
-
-        remote_head = subprocess.check_output(
-            ["git", "rev-parse", "@{u}"],
-            cwd=repo_path
-        ).strip()
+        local_head, remote_head = Git.rev_parse(repo_path, "@{0}", "@{u}")
 
         return local_head != remote_head
 
@@ -42,4 +128,127 @@ class Git:
 
         :param repo_path: The path to the Git repository.
         """
-        subprocess.run(["git", "pull"], cwd=repo_path, check=True)
+        with _process("pull"):
+            subprocess.run(["git", "pull"], cwd=repo_path, check=True)
+
+    @staticmethod
+    def add(paths: Iterable[str], repo_path: Optional[str] = None) -> None:
+        """
+        Stage paths with a single `git add` process, passing them on stdin instead of the command line.
+
+        :param paths: Paths to stage.
+        :param repo_path: The path to the Git repository. Default: current directory.
+        """
+        pathspec = b"".join(os.fsencode(path) + b"\0" for path in paths)
+
+        with _process("add"):
+            subprocess.run(
+                ["git", "--literal-pathspecs", "add", "--pathspec-from-file=-", "--pathspec-file-nul"],
+                cwd=repo_path, input=pathspec, check=True
+            )
+
+    @staticmethod
+    def commit(message: str, paths: Iterable[str] = (), repo_path: Optional[str] = None) -> None:
+        """
+        Commit with the message passed on stdin.
+
+        :param message: Commit message.
+        :param paths: Only commit these paths, regardless of what else is staged.
+        :param repo_path: The path to the Git repository. Default: current directory.
+        """
+        paths = list(paths)
+        command = ["git", "--literal-pathspecs", "commit", "-F", "-", "--quiet"]
+
+        if not paths:
+            with _process("commit"):
+                subprocess.run(command, cwd=repo_path, input=message.encode(), check=True)
+            return
+
+        with _process("commit"), tempfile.NamedTemporaryFile() as pathspec:
+            pathspec.write(b"".join(os.fsencode(path) + b"\0" for path in paths))
+            pathspec.flush()
+
+            subprocess.run(
+                [*command, "--only", f"--pathspec-from-file={pathspec.name}", "--pathspec-file-nul"],
+                cwd=repo_path, input=message.encode(), check=True
+            )
+
+    @staticmethod
+    def commit_each(commits: Iterable[Tuple[str, Iterable[str]]], repo_path: Optional[str] = None) -> None:
+        """
+        Create one commit per group of paths, staging every path once up front.
+
+        N groups cost N + 1 processes: one `git add` and one `git commit --only` per group.
+
+        :param commits: (message, paths) pairs committed in order.
+        :param repo_path: The path to the Git repository. Default: current directory.
+        """
+        commits = [(message, list(paths)) for message, paths in commits]
+
+        Git.add([path for message, paths in commits for path in paths], repo_path)
+
+        for message, paths in commits:
+            Git.commit(message, paths, repo_path)
+
+
+class CatFile:
+    """
+    A long-lived `git cat-file --batch` process answering any number of object lookups.
+    """
+
+    def __init__(self, repo_path: Optional[str] = None) -> None:
+        """
+        :param repo_path: The path to the Git repository. Default: current directory.
+        """
+        with _process("cat-file"):
+            self._process = subprocess.Popen(
+                ["git", "cat-file", "--batch"],
+                cwd=repo_path, stdin=subprocess.PIPE, stdout=subprocess.PIPE
+            )
+
+    def __enter__(self) -> "CatFile":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def read(self, revision: str) -> Optional[Tuple[str, str, bytes]]:
+        """
+        Read an object.
+
+        :param revision: Any object name `git rev-parse` understands, e.g. `HEAD` or `v1.0:plugin/init.php`.
+        :return: (object name, object type, content) or None when the object does not exist.
+        """
+        self._process.stdin.write(revision.encode() + b"\n")
+        self._process.stdin.flush()
+
+        header = self._process.stdout.readline().decode().split()
+
+        if len(header) != 3:
+            return None
+
+        name, object_type, size = header
+        content = self._process.stdout.read(int(size))
+        self._process.stdout.read(1)
+
+        return name, object_type, content
+
+    def resolve(self, *revisions: str) -> List[Optional[str]]:
+        """
+        Resolve revisions to object names without spawning a process per revision.
+
+        :param revisions: Revisions to resolve.
+        :return: Object names in the order of the revisions, None for missing objects.
+        """
+        return [self.__name(self.read(revision)) for revision in revisions]
+
+    def close(self) -> None:
+        if self._process.poll() is None:
+            self._process.stdin.close()
+            self._process.wait()
+
+        self._process.stdout.close()
+
+    @staticmethod
+    def __name(obj: Optional[Tuple[str, str, bytes]]) -> Optional[str]:
+        return obj[0] if obj is not None else None
@@ -1,10 +1,12 @@
-from typing import Any
+from typing import Any, Iterable
+import fcntl
 import os
-import zipfile
-import subprocess
+import shutil
+import tempfile
 import click
 
 import exceptions
+import profiling
 import versioning
 
 MAIN_FILES = ("init.php", "index.php")
@@ -51,18 +53,10 @@ def prepare_plugins_report(path_version_dict: dict) -> list:
 
 
 def get_filtered_plugin_paths(path, include, exclude):
-    """Get plugin paths filtered by include and exclude lists."""
-    plugin_absolute_paths = get_plugin_paths(path)
+    """Get plugin paths filtered by include and exclude patterns, see `selection.Selector`."""
+    import selection
 
-    if include:
-        plugin_absolute_paths = [p for p in plugin_absolute_paths if
-                                 any(inc.strip("/") == os.path.basename(p) for inc in include)]
-
-    if exclude:
-        plugin_absolute_paths = [p for p in plugin_absolute_paths if
-                                 all(exc.strip("/") != os.path.basename(p) for exc in exclude)]
-
-    return plugin_absolute_paths
+    return selection.Selector(include, exclude).filter(get_plugin_paths(path))
 
 
 def update_plugin(plugin_absolute_path, increase, decrease):
@@ -80,6 +74,58 @@ def update_plugin(plugin_absolute_path, increase, decrease):
         "new_version": new_version,
     }
 
+def atomic_write(path: str, chunks: Iterable[bytes]) -> None:
+    """
+    Write chunks to a temporary file next to `path` and move it over `path` once complete.
+
+    The file keeps its permissions, and a crash before the final rename leaves the original intact.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    descriptor, temp_path = tempfile.mkstemp(prefix=f".{name}.", suffix=".tmp", dir=directory)
+
+    try:
+        with os.fdopen(descriptor, 'wb') as temp_file:
+            for chunk in chunks:
+                temp_file.write(chunk)
+                profiling.count("bytes_written", len(chunk))
+
+            temp_file.flush()
+            os.fsync(temp_file.fileno())
+
+        if os.path.exists(path):
+            shutil.copymode(path, temp_path)
+
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class FileLock:
+    """
+    An advisory lock on a file, entered as True when it was acquired.
+    """
+
+    def __init__(self, path: str, blocking: bool = True) -> None:
+        self.path: str = path
+        self.blocking: bool = blocking
+        self._file = None
+
+    def __enter__(self) -> bool:
+        self._file = open(self.path, 'a')
+
+        try:
+            fcntl.flock(self._file, fcntl.LOCK_EX if self.blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+
+        return True
+
+    def __exit__(self, *args) -> None:
+        self._file.close()
+
+
 def stylize(value: Any) -> str:
     return click.style(value, fg='green', bold=True)
 
@@ -97,17 +143,17 @@ def prepare_update_message(plugin_name, old_version, new_version, color: bool =
     return message
 
 def commit(add: list, message: str) -> None:
-    subprocess.run(["git", "add", *add], check=True)
-    subprocess.run(["git", "commit", "-m", message, "--quiet"], check=True)
-
-def create_zip(plugin_directory, zip_path):
-    base_name = os.path.basename(plugin_directory)
-    temp_zip_path = zip_path
-
-    with zipfile.ZipFile(temp_zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-        for root, _, files in os.walk(plugin_directory):
-            for file in files:
-                file_path = os.path.join(root, file)
-                arcname = os.path.join(str(base_name), str(os.path.relpath(str(file_path), plugin_directory)))
-                zipf.write(str(file_path), arcname)
+    import git
+
+    with profiling.span("commit"):
+        git.Git.add(add)
+        git.Git.commit(message)
+
+def create_zip(plugin_directory, zip_path, packager=None):
+    import archive
+
+    if packager is None:
+        packager = archive.Packager()
+
+    packager.create(plugin_directory, zip_path)
 
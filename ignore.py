@@ -0,0 +1,168 @@
+import functools
+import os
+import re
+from typing import Iterable, List, NamedTuple, Optional, Pattern
+
+# Read from the root of a plugin, in this order. `.distignore` is the file `wp dist-archive` reads.
+IGNORE_FILES = (".distignore", ".booignore")
+
+# Never packaged unless a plugin negates them in its ignore files.
+DEFAULT_PATTERNS = (
+    ".git/", ".svn/", ".hg/", ".boo/", "node_modules/",
+    ".DS_Store", "Thumbs.db",
+    *IGNORE_FILES,
+)
+
+
+class Rule(NamedTuple):
+    """
+    A compiled ignore pattern, matched against paths relative to the plugin directory with `/` separators.
+    """
+    regex: Pattern
+    negated: bool
+    directory_only: bool
+
+
+@functools.lru_cache(maxsize=None)
+def compile_pattern(pattern: str) -> Optional[Rule]:
+    """
+    Compile a pattern in the gitignore syntax.
+
+    :param pattern: A line of an ignore file.
+    :return: The compiled rule, None for blank lines and comments.
+    """
+    pattern = re.sub(r"(?<!\\) +$", "", pattern.rstrip("\r\n"))
+
+    if not pattern or pattern.startswith("#"):
+        return None
+
+    negated = pattern.startswith("!")
+    if negated:
+        pattern = pattern[1:]
+
+    directory_only = pattern.endswith("/")
+    pattern = pattern.rstrip("/")
+
+    if not pattern:
+        return None
+
+    # A pattern with a separator at the start or in the middle is relative to the plugin directory, any other
+    # pattern matches at any depth.
+    anchored = "/" in pattern
+    segments = pattern.lstrip("/").split("/")
+    regex = "" if anchored else "(?:.*/)?"
+
+    for position, segment in enumerate(segments):
+        last = position == len(segments) - 1
+
+        if segment == "**":
+            regex += ".*" if last else "(?:.*/)?"
+        else:
+            regex += _translate(segment) + ("" if last else "/")
+
+    return Rule(re.compile(regex, re.DOTALL), negated, directory_only)
+
+
+def _translate(segment: str) -> str:
+    """Translate the wildcards of a path segment to a regular expression."""
+    regex = ""
+    position = 0
+
+    while position < len(segment):
+        character = segment[position]
+        position += 1
+
+        if character == "\\" and position < len(segment):
+            regex += re.escape(segment[position])
+            position += 1
+        elif character == "*":
+            if not regex.endswith("[^/]*"):
+                regex += "[^/]*"
+        elif character == "?":
+            regex += "[^/]"
+        elif character == "[" and _bracket_end(segment, position) != -1:
+            end = _bracket_end(segment, position)
+            content = segment[position:end]
+            position = end + 1
+
+            if content[:1] in ("!", "^"):
+                content = "^" + content[1:]
+
+            regex += "[" + content.replace("\\", "\\\\") + "]"
+        else:
+            regex += re.escape(character)
+
+    return regex
+
+
+def _bracket_end(segment: str, position: int) -> int:
+    """Return the position of the `]` closing a bracket expression opened before `position`, -1 if unclosed."""
+    if segment[position:position + 1] in ("!", "^"):
+        position += 1
+
+    # A `]` right after the opening bracket is part of the set.
+    if segment[position:position + 1] == "]":
+        position += 1
+
+    return segment.find("]", position)
+
+
+class Matcher:
+    """
+    Decides which files of a plugin are left out of its zip file, from gitignore patterns where the last
+    matching pattern wins.
+
+    Directories are matched on their own, so that a packager can prune an ignored directory instead of listing
+    its files. As in Git, a file inside an ignored directory cannot be included again.
+    """
+
+    def __init__(self, patterns: Iterable[str] = ()) -> None:
+        """
+        :param patterns: Patterns in the gitignore syntax, in increasing priority.
+        """
+        self.rules: List[Rule] = [rule for rule in map(compile_pattern, patterns) if rule is not None]
+        self._files: Optional[Pattern] = None
+        self._directories: Optional[Pattern] = None
+
+        # Without negations the order does not matter and a single alternation answers every query.
+        if not any(rule.negated for rule in self.rules):
+            self._files = self.__combine(rule for rule in self.rules if not rule.directory_only)
+            self._directories = self.__combine(self.rules)
+
+    @classmethod
+    def load(cls, directory_path: str, patterns: Iterable[str] = DEFAULT_PATTERNS) -> "Matcher":
+        """
+        Build the matcher of a plugin, its ignore files taking priority over the given patterns.
+
+        :param directory_path: Plugin directory path.
+        :param patterns: Patterns that apply to every plugin.
+        """
+        patterns = list(patterns)
+
+        for name in IGNORE_FILES:
+            try:
+                with open(os.path.join(directory_path, name), 'r', encoding='utf-8', errors='surrogateescape') as f:
+                    patterns.extend(f)
+            except OSError:
+                pass
+
+        return cls(patterns)
+
+    def ignored(self, path: str, directory: bool = False) -> bool:
+        """
+        :param path: Path relative to the plugin directory, with `/` separators.
+        :param directory: Whether the path is a directory.
+        """
+        if self._directories is not None:
+            return (self._directories if directory else self._files).fullmatch(path) is not None
+
+        for rule in reversed(self.rules):
+            if (directory or not rule.directory_only) and rule.regex.fullmatch(path):
+                return not rule.negated
+
+        return False
+
+    @staticmethod
+    def __combine(rules: Iterable[Rule]) -> Pattern:
+        # An empty alternation would match the empty path only, which is never queried.
+        return re.compile("|".join(f"(?:{rule.regex.pattern})" for rule in rules) or "(?!)", re.DOTALL)
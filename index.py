@@ -0,0 +1,167 @@
+import os
+import sqlite3
+from typing import Iterable, Optional, Tuple
+
+DIRECTORY = ".boo"
+DATABASE = "index.sqlite3"
+SCHEMA_VERSION = 1
+
+Signature = Tuple[int, int, int]
+
+
+def signature(stat: os.stat_result) -> Signature:
+    """Return the (inode, mtime, size) signature of a stat result."""
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def create_directory(path: str) -> str:
+    """
+    Create `<plugins path>/.boo/` with a `.gitignore` that keeps its content out of Git.
+
+    :return: The directory path.
+    """
+    directory = os.path.join(path, DIRECTORY)
+    gitignore = os.path.join(directory, ".gitignore")
+
+    os.makedirs(directory, exist_ok=True)
+
+    if not os.path.exists(gitignore):
+        with open(gitignore, 'w') as file:
+            file.write("*\n")
+
+    return directory
+
+
+class HeaderIndex:
+    """
+    Persistent cache of parsed plugin headers stored under `<plugins path>/.boo/`.
+
+    Rows are keyed by the absolute main file path and are only trusted while the (inode, mtime, size)
+    signature of that file is unchanged. Any error while opening or writing the database disables the
+    index for the rest of the run instead of failing the command.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: Plugins directory path the index belongs to.
+        """
+        self.directory: str = os.path.join(path, DIRECTORY)
+        self.database: str = os.path.join(self.directory, DATABASE)
+        self._connection: Optional[sqlite3.Connection] = None
+        self._disabled: bool = False
+
+    def __enter__(self) -> "HeaderIndex":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def lookup(self, main_file_path: str, stat_signature: Signature) -> Optional[Tuple[str, str]]:
+        """
+        Return the cached (plugin name, version) of a main file if its signature is unchanged.
+
+        :param main_file_path: Main file path.
+        :param stat_signature: Current signature of the main file.
+        :return: Cached header values or None.
+        """
+        connection = self.__connect()
+
+        if connection is None:
+            return None
+
+        try:
+            row = connection.execute(
+                "SELECT inode, mtime_ns, size, plugin_name, version FROM headers WHERE main_file_path = ?",
+                (os.path.abspath(main_file_path),)
+            ).fetchone()
+        except sqlite3.Error:
+            self.__disable()
+            return None
+
+        if row is None or tuple(row[:3]) != tuple(stat_signature):
+            return None
+
+        return row[3], row[4]
+
+    def store(self, main_file_path: str, stat_signature: Signature, plugin_name: str, version: str) -> None:
+        """
+        Cache the parsed header values of a main file.
+
+        :param main_file_path: Main file path.
+        :param stat_signature: Signature of the main file the values were parsed from.
+        :param plugin_name: Parsed 'Plugin Name' header.
+        :param version: Parsed 'Version' header.
+        """
+        connection = self.__connect()
+
+        if connection is None:
+            return
+
+        try:
+            connection.execute(
+                "INSERT OR REPLACE INTO headers VALUES (?, ?, ?, ?, ?, ?)",
+                (os.path.abspath(main_file_path), *stat_signature, plugin_name, version)
+            )
+        except sqlite3.Error:
+            self.__disable()
+
+    def prune(self, main_file_paths: Iterable[str]) -> None:
+        """
+        Drop every row except the given main files.
+
+        :param main_file_paths: Main files that are still part of the plugins directory.
+        """
+        connection = self.__connect()
+
+        if connection is None:
+            return
+
+        keep = {os.path.abspath(path) for path in main_file_paths}
+
+        try:
+            stored = [row[0] for row in connection.execute("SELECT main_file_path FROM headers")]
+            connection.executemany(
+                "DELETE FROM headers WHERE main_file_path = ?",
+                [(path,) for path in stored if path not in keep]
+            )
+        except sqlite3.Error:
+            self.__disable()
+
+    def close(self) -> None:
+        if self._connection is None:
+            return
+
+        try:
+            self._connection.commit()
+        except sqlite3.Error:
+            pass
+        finally:
+            self._connection.close()
+            self._connection = None
+
+    def __connect(self) -> Optional[sqlite3.Connection]:
+        if self._connection is not None or self._disabled:
+            return self._connection
+
+        try:
+            create_directory(os.path.dirname(self.directory))
+            connection = sqlite3.connect(self.database, timeout=1)
+
+            if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                connection.execute("DROP TABLE IF EXISTS headers")
+                connection.execute(
+                    "CREATE TABLE headers ("
+                    "main_file_path TEXT PRIMARY KEY, inode INTEGER, mtime_ns INTEGER, size INTEGER, "
+                    "plugin_name TEXT, version TEXT)"
+                )
+                connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+        except (OSError, sqlite3.Error):
+            self._disabled = True
+            return None
+
+        self._connection = connection
+        return connection
+
+    def __disable(self) -> None:
+        self.close()
+        self._disabled = True
@@ -0,0 +1,251 @@
+import json
+import os
+import shutil
+import tempfile
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import exceptions
+import helpers
+import index
+
+DIRECTORY = "journal"
+JOURNAL = "journal.json"
+LOCK = "journal.lock"
+FORWARD = "forward"
+BACK = "back"
+
+
+class Operation(NamedTuple):
+    """
+    A staged file that replaces its target when the transaction commits.
+    """
+    source: str
+    target: str
+    backup: Optional[str] = None
+
+
+class Transaction:
+    """
+    Replaces a set of files all at once, journaled under `<plugins path>/.boo/journal/`.
+
+    New contents are staged in the journal directory first, so the slow work happens before any target is
+    touched. Committing links a backup of every existing target, writes the journal and then only runs one
+    `os.replace` per file. After a crash in that phase `recover` rolls every file forward to the staged
+    contents or back to the backups.
+
+    The transaction holds a lock next to the journal directory from `open` until `discard`, so that a second run
+    on the same plugins directory fails instead of removing the files staged by the first one.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        :param path: Plugins directory path the journal belongs to.
+        """
+        self.path: str = path
+        self.directory: str = os.path.join(path, index.DIRECTORY, DIRECTORY)
+        self.journal_path: str = os.path.join(self.directory, JOURNAL)
+        self.lock_path: str = os.path.join(path, index.DIRECTORY, LOCK)
+        self.operations: List[Operation] = []
+        self.signatures: Dict[str, index.Signature] = {}
+        self._open: bool = False
+        self._lock: Optional[helpers.FileLock] = None
+
+    def __enter__(self) -> "Transaction":
+        self.open()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.discard()
+
+    def open(self) -> None:
+        """
+        :raise BooException: Another transaction on the same plugins directory is running, or an interrupted
+                             transaction has not been recovered.
+        """
+        self.__acquire()
+
+        if os.path.isfile(self.journal_path):
+            self.__release()
+            raise exceptions.BooException(
+                f"An interrupted transaction was found in {self.directory}, recover it first with "
+                f"'--recover {FORWARD}' or '--recover {BACK}'."
+            )
+
+        # Files staged by a run that never started committing are of no use.
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory)
+
+        self._open = True
+
+    def stage(self, target: str, signature: Optional[index.Signature] = None) -> str:
+        """
+        Reserve the staged path whose content replaces `target` on commit. The caller writes the file.
+
+        :param target: Path of the file to replace.
+        :param signature: Stat signature `target` must still have when the transaction commits.
+        :return: Staged file path.
+        """
+        target = os.path.abspath(target)
+        descriptor, source = tempfile.mkstemp(prefix=f".{os.path.basename(target)}.", suffix=".boo-staged",
+                                              dir=self.__staging_directory(target))
+        os.close(descriptor)
+
+        self.operations.append(Operation(source, target))
+
+        if signature is not None:
+            self.signatures[target] = tuple(signature)
+
+        return source
+
+    def commit(self) -> None:
+        """
+        Replace every target with its staged file.
+
+        :raise BooException: A target changed since it was staged, or a file could not be backed up, and no target
+                             has been replaced. Or a target could not be replaced, and the transaction has to be
+                             recovered.
+        """
+        for target, signature in self.signatures.items():
+            try:
+                changed = index.signature(os.stat(target)) != signature
+            except OSError:
+                changed = True
+
+            if changed:
+                raise exceptions.BooException(f"The file {target} has changed since the transaction started")
+
+        try:
+            for position, operation in enumerate(self.operations):
+                self.__sync(operation.source)
+
+                if os.path.exists(operation.target):
+                    backup = os.path.join(os.path.dirname(operation.source), f".boo-backup-{position}")
+                    self.__link(operation.target, backup)
+                    self.operations[position] = operation._replace(backup=backup)
+
+            helpers.atomic_write(self.journal_path, [json.dumps([_._asdict() for _ in self.operations]).encode()])
+        except OSError as e:
+            self.__remove(operation.backup for operation in self.operations)
+            raise exceptions.BooException(f"An error occurred while preparing the transaction, no file has been "
+                                          f"replaced: {e}")
+
+        try:
+            for operation in self.operations:
+                os.replace(operation.source, operation.target)
+        except OSError as e:
+            raise exceptions.BooException(
+                f"An error occurred while replacing the file {operation.target}: {e}. The transaction is "
+                f"interrupted, recover it with '--recover {FORWARD}' or '--recover {BACK}'."
+            )
+
+        os.remove(self.journal_path)
+        self.__remove(operation.backup for operation in self.operations)
+
+    def discard(self) -> None:
+        """Remove the journal directory, together with staged files that were not committed, and release the lock."""
+        if self._open and not os.path.isfile(self.journal_path):
+            self.__remove(operation.source for operation in self.operations)
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+        self._open = False
+        self.__release()
+
+    @classmethod
+    def recover(cls, path: str, direction: str = FORWARD) -> int:
+        """
+        Finish or undo an interrupted commit.
+
+        :param path: Plugins directory path.
+        :param direction: `FORWARD` to replace the remaining targets with their staged files, `BACK` to restore
+                          every target to its content from before the commit.
+        :return: Number of files the transaction covered, 0 when there was nothing to recover.
+        :raise BooException: Another transaction on the same plugins directory is running.
+        """
+        transaction = cls(path)
+
+        if not os.path.isfile(transaction.journal_path):
+            return 0
+
+        transaction.__acquire()
+
+        try:
+            return cls.__recover(transaction, direction)
+        finally:
+            transaction.__release()
+
+    @classmethod
+    def __recover(cls, transaction: "Transaction", direction: str) -> int:
+        # The transaction that held the lock may have finished in the meantime.
+        if not os.path.isfile(transaction.journal_path):
+            return 0
+
+        try:
+            with open(transaction.journal_path, 'r') as file:
+                operations = [Operation(**operation) for operation in json.load(file)]
+        except (OSError, ValueError, TypeError) as e:
+            raise exceptions.BooException(
+                f"An error occurred while reading the journal {transaction.journal_path}: {e}"
+            )
+
+        for operation in operations:
+            if direction == FORWARD:
+                if os.path.exists(operation.source):
+                    os.replace(operation.source, operation.target)
+            elif operation.backup is not None:
+                if os.path.exists(operation.backup):
+                    os.replace(operation.backup, operation.target)
+            elif not os.path.exists(operation.source) and os.path.exists(operation.target):
+                os.remove(operation.target)
+
+        os.remove(transaction.journal_path)
+        cls.__remove(path for operation in operations for path in (operation.source, operation.backup))
+        shutil.rmtree(transaction.directory, ignore_errors=True)
+
+        return len(operations)
+
+    def __acquire(self) -> None:
+        index.create_directory(self.path)
+        lock = helpers.FileLock(self.lock_path, blocking=False)
+
+        if not lock.__enter__():
+            lock.__exit__()
+            raise exceptions.BooException(
+                f"Another transaction on {self.path} is running, the lock {self.lock_path} is held."
+            )
+
+        self._lock = lock
+
+    def __release(self) -> None:
+        if self._lock is not None:
+            self._lock.__exit__()
+            self._lock = None
+
+    def __staging_directory(self, target: str) -> str:
+        """
+        Files are staged in the journal directory unless the target is on another file system, where
+        `os.replace` could not move them, in which case they are staged next to the target.
+        """
+        target_directory = os.path.dirname(target)
+
+        if os.stat(target_directory).st_dev != os.stat(self.directory).st_dev:
+            return target_directory
+
+        return self.directory
+
+    @staticmethod
+    def __remove(paths: Iterable[Optional[str]]) -> None:
+        for path in paths:
+            if path is not None and os.path.exists(path):
+                os.remove(path)
+
+    @staticmethod
+    def __link(target: str, backup: str) -> None:
+        try:
+            os.link(target, backup)
+        except OSError:
+            shutil.copy2(target, backup)
+
+    @staticmethod
+    def __sync(path: str) -> None:
+        with open(path, 'rb') as file:
+            os.fsync(file.fileno())
@@ -0,0 +1,104 @@
+import csv
+import json
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Sequence, TextIO
+
+import click
+
+TABLE = "table"
+FORMATS = (TABLE, "json", "ndjson", "csv")
+
+
+class Writer(ABC):
+    """
+    Streams records to a text stream as soon as they are written, without colors and without buffering rows.
+    """
+
+    def __init__(self, fields: Sequence[str], stream: Optional[TextIO] = None) -> None:
+        """
+        :param fields: Record keys, in output order.
+        :param stream: Output stream. Default: stdout.
+        """
+        self.fields: Sequence[str] = fields
+        self.stream: TextIO = stream or click.get_text_stream('stdout')
+
+    def __enter__(self) -> "Writer":
+        self.open()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def open(self) -> None:
+        pass
+
+    @abstractmethod
+    def write(self, record: Dict) -> None:
+        pass
+
+    def close(self) -> None:
+        self.stream.flush()
+
+    def _record(self, record: Dict) -> Dict:
+        return {field: record.get(field) for field in self.fields}
+
+
+class JsonWriter(Writer):
+    """Writes a single JSON array, one element per record."""
+
+    def __init__(self, fields: Sequence[str], stream: Optional[TextIO] = None) -> None:
+        super().__init__(fields, stream)
+        self._separator = "\n"
+
+    def open(self) -> None:
+        self.stream.write("[")
+
+    def write(self, record: Dict) -> None:
+        self.stream.write(f"{self._separator}{json.dumps(self._record(record))}")
+        self.stream.flush()
+        self._separator = ",\n"
+
+    def close(self) -> None:
+        self.stream.write("\n]\n")
+        super().close()
+
+
+class NdjsonWriter(Writer):
+    """Writes one JSON object per line."""
+
+    def write(self, record: Dict) -> None:
+        self.stream.write(f"{json.dumps(self._record(record))}\n")
+        self.stream.flush()
+
+
+class CsvWriter(Writer):
+    """Writes a header row followed by one row per record."""
+
+    def __init__(self, fields: Sequence[str], stream: Optional[TextIO] = None) -> None:
+        super().__init__(fields, stream)
+        self._writer = csv.DictWriter(self.stream, fieldnames=list(self.fields), lineterminator="\n")
+
+    def open(self) -> None:
+        self._writer.writeheader()
+
+    def write(self, record: Dict) -> None:
+        self._writer.writerow(self._record(record))
+        self.stream.flush()
+
+
+WRITERS = {
+    "json": JsonWriter,
+    "ndjson": NdjsonWriter,
+    "csv": CsvWriter,
+}
+
+
+def writer(output_format: str, fields: Sequence[str], stream: Optional[TextIO] = None) -> Writer:
+    """
+    Create the streaming writer of an output format.
+
+    :param output_format: One of `FORMATS` except `TABLE`.
+    :param fields: Record keys, in output order.
+    :param stream: Output stream. Default: stdout.
+    """
+    return WRITERS[output_format](fields, stream)
@@ -0,0 +1,180 @@
+import json
+import os
+from typing import Dict, Iterable, List, NamedTuple, Optional, TextIO
+
+import exceptions
+import index
+import journal
+import scanner
+import versioning
+
+SCHEMA_VERSION = 1
+
+
+class Change(NamedTuple):
+    """
+    The version change of a single plugin, or the reason it cannot be changed.
+    """
+    name: str
+    path: str
+    main_file: str
+    old_version: Optional[str] = None
+    new_version: Optional[str] = None
+    start: int = 0
+    end: int = 0
+    write_bytes: int = 0
+    signature: Optional[index.Signature] = None
+    zip_path: Optional[str] = None
+    error: Optional[str] = None
+
+
+class Plan:
+    """
+    The full change set of a version bump, computed from a single scan without touching any file.
+
+    Every change records the byte range of the version value and the stat signature of the main file it was
+    computed from, so applying a saved plan only needs one stat per plugin instead of another scan.
+    """
+
+    def __init__(self, changes: Iterable[Change], increase: str = "0.0.0", decrease: str = "0.0.0") -> None:
+        self.changes: List[Change] = list(changes)
+        self.increase: str = increase
+        self.decrease: str = decrease
+
+    @property
+    def failures(self) -> List[Change]:
+        return [change for change in self.changes if change.error is not None]
+
+    @classmethod
+    def build(cls, records: Iterable[scanner.PluginRecord], increase: str = "0.0.0", decrease: str = "0.0.0",
+              zip_directory: Optional[str] = None) -> "Plan":
+        """
+        Plan the bump of already scanned plugins.
+
+        :param records: Plugin records.
+        :param increase: Version to add.
+        :param decrease: Version to subtract.
+        :param zip_directory: Directory of the zip files of updated plugins. No zip files when omitted.
+        :raise InvalidArgumentError: `increase` or `decrease` is not a valid version.
+        """
+        records = list(records)
+        delta = int(versioning.VersionNumber.parse(increase)) - int(versioning.VersionNumber.parse(decrease))
+
+        old_versions = versioning.VersionColumn.parse(record.version for record in records)
+        new_versions = old_versions.bump(delta)
+
+        changes = [cls.__change(record, old_version, new_version, delta, zip_directory)
+                   for record, old_version, new_version in zip(records, old_versions, new_versions)]
+
+        return cls(changes, increase, decrease)
+
+    @staticmethod
+    def __change(record: scanner.PluginRecord, old_version: Optional[versioning.VersionNumber],
+                 new_version: Optional[versioning.VersionNumber], delta: int,
+                 zip_directory: Optional[str]) -> Change:
+        change = Change(record.name, record.full_path, os.path.abspath(record.main_file_path))
+
+        try:
+            # The batch bump only marks invalid versions, the scalar type reports why.
+            if old_version is None:
+                old_version = versioning.VersionNumber.parse(record.version)
+
+            if new_version is None:
+                new_version = versioning.VersionNumber(int(old_version) + delta)
+
+            start, end, stat = versioning.locate_version(change.main_file)
+        except exceptions.BooException as e:
+            return change._replace(old_version=record.version, error=str(e))
+
+        value = str(new_version)
+        in_place = len(value.encode()) == end - start
+
+        zip_path = None
+        if zip_directory:
+            zip_path = os.path.abspath(os.path.join(zip_directory, f"{record.name}-{int(new_version)}.zip"))
+
+        return change._replace(
+            old_version=str(old_version),
+            new_version=value,
+            start=start,
+            end=end,
+            write_bytes=len(value.encode()) if in_place else stat.st_size - (end - start) + len(value.encode()),
+            signature=index.signature(stat),
+            zip_path=zip_path,
+        )
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": SCHEMA_VERSION,
+            "increase": self.increase,
+            "decrease": self.decrease,
+            "changes": [change._asdict() for change in self.changes],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Plan":
+        if data.get("version") != SCHEMA_VERSION:
+            raise exceptions.InvalidArgumentError(f"Unsupported plan version {data.get('version')!r}")
+
+        changes = []
+
+        for change in data["changes"]:
+            change = Change(**change)
+            changes.append(change._replace(signature=tuple(change.signature) if change.signature else None))
+
+        return cls(changes, data["increase"], data["decrease"])
+
+    def save(self, stream: TextIO) -> None:
+        json.dump(self.to_dict(), stream, indent=2)
+        stream.write("\n")
+
+    @classmethod
+    def load(cls, path: str) -> "Plan":
+        try:
+            with open(path, 'r') as file:
+                return cls.from_dict(json.load(file))
+        except IOError as e:
+            raise exceptions.BooException(f"An error occurred while reading the plan '{path}': {e}")
+        except (ValueError, KeyError, TypeError) as e:
+            raise exceptions.InvalidArgumentError(f"Invalid plan '{path}': {e}")
+
+
+def apply(change: Change) -> None:
+    """
+    Write the new version of a planned change.
+
+    :raise BooException: The change could not be planned, or the main file changed since it was planned.
+    """
+    verify(change)
+    versioning.write_version(change.main_file, change.start, change.end, change.new_version)
+
+
+def stage(change: Change, transaction: journal.Transaction) -> str:
+    """
+    Stage the new main file of a planned change in a transaction instead of writing it.
+
+    :return: Staged main file path.
+    :raise BooException: The change could not be planned, or the main file changed since it was planned.
+    """
+    verify(change)
+
+    staged_path = transaction.stage(change.main_file, change.signature)
+    versioning.stage_version(change.main_file, change.start, change.end, change.new_version, staged_path)
+
+    return staged_path
+
+
+def verify(change: Change) -> None:
+    """
+    :raise BooException: The change could not be planned, or the main file changed since it was planned.
+    """
+    if change.error is not None:
+        raise exceptions.BooException(change.error)
+
+    try:
+        stat_signature = index.signature(os.stat(change.main_file))
+    except IOError as e:
+        raise exceptions.BooException(f"An error occurred while reading the file {change.main_file}: {e}")
+
+    if stat_signature != change.signature:
+        raise exceptions.BooException(f"The file {change.main_file} has changed since the plan was made")
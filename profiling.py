@@ -0,0 +1,262 @@
+import json
+import os
+import threading
+import time
+from contextlib import nullcontext
+from typing import Callable, ContextManager, Dict, List, Optional
+
+SUMMARY = "summary"
+TRACE = "trace"
+CPROFILE = "cprofile"
+MODES = (SUMMARY, TRACE, CPROFILE)
+
+DEFAULT_TRACE_PATH = "boo-trace.json"
+COUNTERS = ("bytes_read", "bytes_written", "subprocesses", "files_skipped", "bytes_skipped")
+TOP_PLUGINS = 10
+
+_NULL_SPAN = nullcontext()
+_recorder: Optional["Recorder"] = None
+
+
+class Span:
+    """
+    A timed region of a command, e.g. a phase or the update of a single plugin.
+
+    Counters added while a span is open on its thread are added to it and to every span it is nested in.
+    """
+    __slots__ = ("recorder", "name", "attributes", "counters", "start", "wall", "cpu", "thread", "_cpu_start")
+
+    def __init__(self, recorder: "Recorder", name: str, attributes: Dict) -> None:
+        self.recorder: Recorder = recorder
+        self.name: str = name
+        self.attributes: Dict = attributes
+        self.counters: Dict[str, int] = {}
+        self.start: float = 0.0
+        self.wall: float = 0.0
+        self.cpu: float = 0.0
+        self.thread: int = 0
+        self._cpu_start: float = 0.0
+
+    def __enter__(self) -> "Span":
+        self.thread = threading.get_ident()
+        self.recorder.stack().append(self)
+        self._cpu_start = time.thread_time()
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        self.wall = time.perf_counter() - self.start
+        self.cpu = time.thread_time() - self._cpu_start
+
+        if exc_type is not None:
+            self.attributes["error"] = exc_type.__name__
+
+        self.recorder.stack().pop()
+        self.recorder.finish(self)
+
+
+class Recorder:
+    """
+    Collects the spans and counters of a single run from every thread.
+    """
+
+    def __init__(self) -> None:
+        self.spans: List[Span] = []
+        self.totals: Dict[str, int] = dict.fromkeys(COUNTERS, 0)
+        self.origin: float = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def stack(self) -> List[Span]:
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+
+        return self._local.stack
+
+    def count(self, counter: str, value: int) -> None:
+        # Spans shared with pool threads through `propagate` are counted into from several threads.
+        with self._lock:
+            for span in self.stack():
+                span.counters[counter] = span.counters.get(counter, 0) + value
+
+            self.totals[counter] = self.totals.get(counter, 0) + value
+
+    def propagate(self, function: Callable) -> Callable:
+        parents = list(self.stack())
+
+        def run(*args, **kwargs):
+            stack = self.stack()
+            depth = len(stack)
+            stack[depth:] = parents
+
+            try:
+                return function(*args, **kwargs)
+            finally:
+                del stack[depth:]
+
+        return run
+
+    def finish(self, span: Span) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> str:
+        """
+        :return: Tables of the spans grouped by name and of the slowest plugins.
+        """
+        from tabulate import tabulate
+
+        phases: Dict[str, list] = {}
+        plugins: Dict[str, list] = {}
+
+        for span in self.spans:
+            self.__add(phases.setdefault(span.name, [0, 0.0, 0.0, {}]), span)
+
+            if "plugin" in span.attributes and span.name == "plugin":
+                self.__add(plugins.setdefault(span.attributes["plugin"], [0, 0.0, 0.0, {}]), span)
+
+        headers = ("Calls", "Wall (ms)", "CPU (ms)", *(counter.replace("_", " ").capitalize() for counter in COUNTERS))
+        phase_rows = [(name, *self.__row(values)) for name, values in phases.items()]
+        phase_rows.append(("total", "", f"{(time.perf_counter() - self.origin) * 1e3:.1f}", "",
+                           *(self.totals[counter] for counter in COUNTERS)))
+
+        tables = [tabulate(phase_rows, headers=("Span", *headers), tablefmt="outline")]
+
+        if plugins:
+            slowest = sorted(plugins.items(), key=lambda item: -item[1][1])[:TOP_PLUGINS]
+            plugin_rows = [(name, *self.__row(values)) for name, values in slowest]
+            tables.append(tabulate(plugin_rows, headers=("Plugin", *headers), tablefmt="outline"))
+
+        return "\n".join(tables)
+
+    def trace(self) -> Dict:
+        """
+        :return: The spans in the Chrome trace event format, for chrome://tracing or Perfetto.
+        """
+        pid = os.getpid()
+        events = [{
+            "name": span.name,
+            "cat": "boo",
+            "ph": "X",
+            "ts": round((span.start - self.origin) * 1e6, 3),
+            "dur": round(span.wall * 1e6, 3),
+            "pid": pid,
+            "tid": span.thread,
+            "args": {**span.attributes, **span.counters, "cpu_ms": round(span.cpu * 1e3, 3)},
+        } for span in self.spans]
+
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": dict(self.totals)}
+
+    @staticmethod
+    def __add(values: list, span: Span) -> None:
+        values[0] += 1
+        values[1] += span.wall
+        values[2] += span.cpu
+
+        for counter, value in span.counters.items():
+            values[3][counter] = values[3].get(counter, 0) + value
+
+    @staticmethod
+    def __row(values: list) -> tuple:
+        calls, wall, cpu, counters = values
+        return (calls, f"{wall * 1e3:.1f}", f"{cpu * 1e3:.1f}", *(counters.get(counter, 0) for counter in COUNTERS))
+
+
+def span(name: str, **attributes) -> ContextManager:
+    """
+    Time a region while profiling is enabled, otherwise do nothing.
+
+    :param name: Span name, spans of the same name are summed up in the summary.
+    :param attributes: Extra values shown in the trace, `plugin` groups the per-plugin summary.
+    """
+    if _recorder is None:
+        return _NULL_SPAN
+
+    return Span(_recorder, name, attributes)
+
+
+def count(counter: str, value: int = 1) -> None:
+    """
+    Add to a counter of the open spans while profiling is enabled, one of `COUNTERS`.
+    """
+    if _recorder is not None:
+        _recorder.count(counter, value)
+
+
+def propagate(function: Callable) -> Callable:
+    """
+    Wrap a function submitted to a thread pool so that its counters add up to the spans open on the submitting
+    thread, as they would if it ran there. Returns the function itself while profiling is disabled.
+    """
+    if _recorder is None:
+        return function
+
+    return _recorder.propagate(function)
+
+
+def enabled() -> bool:
+    return _recorder is not None
+
+
+def enable() -> Recorder:
+    global _recorder
+
+    _recorder = Recorder()
+    return _recorder
+
+
+def disable() -> None:
+    global _recorder
+
+    _recorder = None
+
+
+def start(mode: str, output_path: Optional[str] = None) -> Callable[[], None]:
+    """
+    Start profiling a command.
+
+    :param mode: `SUMMARY` prints the span tables, `TRACE` writes a Chrome trace and `CPROFILE` runs cProfile
+                 on the main thread.
+    :param output_path: Trace or cProfile stats file. Default: `DEFAULT_TRACE_PATH` for traces, printed stats
+                        for cProfile.
+    :return: Stops profiling and reports, to be called once the command is done.
+    """
+    import click
+
+    if mode == CPROFILE:
+        import cProfile
+        import pstats
+
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+        def report() -> None:
+            profiler.disable()
+
+            if output_path:
+                profiler.dump_stats(output_path)
+                click.echo(f"cProfile stats written to {output_path}", err=True)
+            else:
+                pstats.Stats(profiler, stream=click.get_text_stream('stderr')).sort_stats("cumulative").print_stats(30)
+
+        return report
+
+    recorder = enable()
+    root = span("command")
+    root.__enter__()
+
+    def report() -> None:
+        root.__exit__(None, None, None)
+        disable()
+
+        if mode == TRACE:
+            path = output_path or DEFAULT_TRACE_PATH
+
+            with open(path, 'w') as file:
+                json.dump(recorder.trace(), file)
+
+            click.echo(f"Trace of {len(recorder.spans)} spans written to {path}", err=True)
+        else:
+            click.echo(recorder.summary(), err=True)
+
+    return report
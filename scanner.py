@@ -0,0 +1,202 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+import exceptions
+import helpers
+import index
+import versioning
+
+# Directories that never contain plugins and are not descended into.
+IGNORED_DIRECTORIES = frozenset({"node_modules", "vendor", ".git", index.DIRECTORY})
+
+
+class PluginRecord(NamedTuple):
+    """
+    Immutable snapshot of a plugin's main file header, produced by a single read.
+    """
+    path: str
+    main_file: str
+    plugin_name: str
+    version: str
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.full_path)
+
+    @property
+    def full_path(self) -> str:
+        return os.path.abspath(self.path)
+
+    @property
+    def main_file_path(self) -> str:
+        return os.path.join(self.path, self.main_file)
+
+
+class Scanner:
+    """
+    Walks plugins directories once and parses every plugin header with a single open per plugin.
+
+    Directories are listed with `os.scandir`, whose entry types answer which main file exists without a stat
+    per candidate. A directory with a main file is a plugin, other directories are plugin groups that are
+    descended into up to the requested depth.
+    """
+
+    @staticmethod
+    def scan(path: str, header_index: Optional[index.HeaderIndex] = None, depth: int = 1) -> List[PluginRecord]:
+        """
+        Scan a plugins directory and return the records of all valid plugins sorted by directory name.
+
+        :param path: Plugins directory path.
+        :param header_index: Persistent header index to answer unchanged plugins from.
+        :param depth: Directory levels below the plugins directory that may contain plugins.
+        :return: List of plugin records.
+        """
+        return list(Scanner.iterate(path, header_index, depth))
+
+    @staticmethod
+    def iterate(path: str, header_index: Optional[index.HeaderIndex] = None, depth: int = 1,
+                ignore: Iterable[str] = IGNORED_DIRECTORIES) -> Iterator[PluginRecord]:
+        """
+        Yield the records of all valid plugins sorted by directory name, each one as soon as it is read.
+
+        :param path: Plugins directory path.
+        :param header_index: Persistent header index to answer unchanged plugins from.
+        :param depth: Directory levels below the plugins directory that may contain plugins.
+        :param ignore: Directory names that are neither plugins nor descended into.
+        """
+        helpers.validate_path(path)
+
+        main_file_paths = []
+
+        for record in Scanner.__walk(Scanner.__entries(path), header_index, depth, frozenset(ignore)):
+            main_file_paths.append(record.main_file_path)
+            yield record
+
+        if header_index is not None:
+            header_index.prune(main_file_paths)
+
+    @staticmethod
+    def discover(paths: Sequence[str], depth: int = 1,
+                 scan: Callable[[str, int], Iterable[PluginRecord]] = None) -> Iterator[PluginRecord]:
+        """
+        Scan several plugins directories concurrently, one thread per directory.
+
+        Records are yielded directory by directory in the given order, a plugin reachable from several
+        directories only once. A single directory is scanned on the calling thread and streamed.
+
+        :param paths: Plugins directory paths.
+        :param depth: Directory levels below every plugins directory that may contain plugins.
+        :param scan: Scans a single directory, `Scanner.iterate` by default.
+        """
+        scan = scan or (lambda path, levels: Scanner.iterate(path, depth=levels))
+
+        if len(paths) == 1:
+            yield from Scanner.__unique([scan(paths[0], depth)])
+            return
+
+        with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+            futures = [executor.submit(lambda path: list(scan(path, depth)), path) for path in paths]
+            yield from Scanner.__unique(future.result() for future in futures)
+
+    @staticmethod
+    def read(path: str, header_index: Optional[index.HeaderIndex] = None) -> PluginRecord:
+        """
+        Read the header of a single plugin.
+
+        The first existing file of `helpers.MAIN_FILES` is the main file, it is opened once and must contain
+        both the 'Plugin Name' and the 'Version' headers. When an index is given, the main file is only
+        opened if its stat signature differs from the cached one.
+
+        :param path: Plugin directory path.
+        :param header_index: Persistent header index to answer unchanged plugins from.
+        :return: The plugin record.
+        """
+        for main_file in helpers.MAIN_FILES:
+            try:
+                return Scanner.__read(path, main_file, header_index)
+            except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+                continue
+
+        plugin_name = os.path.basename(os.path.normpath(path))
+        raise exceptions.SearchNotFound(f"Main file does not exist for the '{plugin_name}'")
+
+    @staticmethod
+    def __walk(entries: List[os.DirEntry], header_index: Optional[index.HeaderIndex], depth: int,
+               ignore: frozenset) -> Iterator[PluginRecord]:
+        for entry in entries:
+            if entry.name in ignore or not entry.is_dir():
+                continue
+
+            children = Scanner.__entries(entry.path)
+            files = {child.name for child in children if child.is_file()}
+            main_file = next((main_file for main_file in helpers.MAIN_FILES if main_file in files), None)
+
+            if main_file is not None:
+                try:
+                    yield Scanner.__read(entry.path, main_file, header_index)
+                except (exceptions.BooException, OSError):
+                    continue
+            elif depth > 1:
+                yield from Scanner.__walk(children, header_index, depth - 1, ignore)
+
+    @staticmethod
+    def __unique(groups: Iterable[Iterable[PluginRecord]]) -> Iterator[PluginRecord]:
+        seen = set()
+
+        for records in groups:
+            for record in records:
+                if record.full_path not in seen:
+                    seen.add(record.full_path)
+                    yield record
+
+    @staticmethod
+    def __entries(path: str) -> List[os.DirEntry]:
+        try:
+            with os.scandir(path) as entries:
+                return sorted(entries, key=lambda entry: entry.name)
+        except OSError:
+            return []
+
+    @staticmethod
+    def __read(path: str, main_file: str, header_index: Optional[index.HeaderIndex]) -> PluginRecord:
+        """
+        :raise FileNotFoundError: The main file does not exist.
+        :raise SearchNotFound: The main file misses the 'Plugin Name' or the 'Version' header.
+        """
+        main_file_path = os.path.join(path, main_file)
+
+        try:
+            if header_index is None:
+                header = Scanner.__read_header(main_file_path)
+            else:
+                header = Scanner.__read_indexed_header(main_file_path, header_index)
+        except (FileNotFoundError, NotADirectoryError, IsADirectoryError):
+            raise
+        except IOError as e:
+            raise exceptions.BooException(f"An error occurred while reading the file '{main_file_path}': {e}")
+
+        if not header["Plugin Name"] or not header["Version"]:
+            plugin_name = os.path.basename(os.path.normpath(path))
+            raise exceptions.SearchNotFound(f"Plugin header does not exist for the '{plugin_name}'")
+
+        return PluginRecord(path, main_file, header["Plugin Name"], header["Version"])
+
+    @staticmethod
+    def __read_header(main_file_path: str) -> dict:
+        return versioning.read_header(main_file_path)
+
+    @staticmethod
+    def __read_indexed_header(main_file_path: str, header_index: index.HeaderIndex) -> dict:
+        stat_signature = index.signature(os.stat(main_file_path))
+        cached = header_index.lookup(main_file_path, stat_signature)
+
+        if cached is not None:
+            return {"Plugin Name": cached[0], "Version": cached[1]}
+
+        header = versioning.read_header(main_file_path)
+
+        if header["Plugin Name"] and header["Version"]:
+            header_index.store(main_file_path, stat_signature, header["Plugin Name"], header["Version"])
+
+        return header
@@ -0,0 +1,256 @@
+import fnmatch
+import operator
+import os
+import re
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Pattern, Sequence, Tuple
+
+import exceptions
+import helpers
+import scanner
+import versioning
+
+REGEX_PREFIX = "re:"
+FILE_PREFIX = "@"
+GLOB_CHARACTERS = frozenset("*?[")
+
+OPERATORS: Dict[str, Callable] = {
+    "<=": operator.le,
+    ">=": operator.ge,
+    "==": operator.eq,
+    "=": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    ">": operator.gt,
+}
+
+PREDICATE_REGEX = re.compile(r"([A-Za-z][A-Za-z0-9_ -]*?)\s*(<=|>=|==|!=|=|<|>)\s*(.*)")
+
+# Leading numeric components of a version and the rest of it, e.g. `9.0.0` and `-rc1`.
+VERSION_REGEX = re.compile(r"(\d+(?:\.\d+)*)(.*)", re.DOTALL)
+
+# Header fields that scanned records already hold, the other fields are read from the main file.
+RECORD_FIELDS = {"Plugin Name": "plugin_name", "Version": "version"}
+
+
+class Predicate(NamedTuple):
+    """
+    A comparison of a header field with a value, e.g. `version<2.0.0` or `requires_php>=8.1`.
+
+    Values that both start with a version are compared by `version_key`, other values as strings. A plugin
+    without the header field never matches.
+    """
+    field: str
+    compare: Callable
+    value: str
+
+    @classmethod
+    def parse(cls, pattern: str) -> Optional["Predicate"]:
+        """
+        :return: The predicate, None when the pattern is not a predicate.
+        """
+        match = PREDICATE_REGEX.fullmatch(pattern.strip())
+
+        if not match:
+            return None
+
+        name, symbol, value = match.groups()
+        field = re.sub(r"[\s_-]+", " ", name).strip()
+        field = next((key for key in RECORD_FIELDS if key.lower() == field.lower()), field)
+
+        return cls(field, OPERATORS[symbol], value.strip())
+
+    def matches(self, header: Dict[str, Optional[str]]) -> bool:
+        actual = header.get(self.field)
+
+        if actual is None:
+            return False
+
+        actual_key, value_key = version_key(actual), version_key(self.value)
+
+        if actual_key is None or value_key is None:
+            return self.compare(actual, self.value)
+
+        return self.compare(actual_key, value_key)
+
+
+def version_key(value: str) -> Optional[Tuple]:
+    """
+    Sort key of a version of any number of numeric components, trailing zero components left out so that `8.1`
+    equals `8.1.0`. A suffix such as `-rc1` sorts before the version without it, and by its text otherwise.
+
+    :return: The key, None when the value does not start with a number.
+    """
+    match = VERSION_REGEX.fullmatch(value.strip())
+
+    if not match:
+        return None
+
+    components = [int(component) for component in match.group(1).split(".")]
+
+    while len(components) > 1 and components[-1] == 0:
+        components.pop()
+
+    return tuple(components), not match.group(2), match.group(2)
+
+
+class Patterns:
+    """
+    Include or exclude patterns compiled once: exact plugin names into a set, globs and `re:` regular expressions
+    into a single regular expression, and header predicates.
+    """
+
+    def __init__(self, patterns: Iterable[str] = ()) -> None:
+        self.names: set = set()
+        self.predicates: List[Predicate] = []
+        regexes: List[str] = []
+
+        for pattern in expand(patterns):
+            predicate = Predicate.parse(pattern)
+
+            if predicate is not None:
+                self.predicates.append(predicate)
+            elif pattern.startswith(REGEX_PREFIX):
+                regexes.append(self.__validate(pattern[len(REGEX_PREFIX):]))
+            elif GLOB_CHARACTERS.intersection(pattern):
+                regexes.append(fnmatch.translate(pattern.strip("/")))
+            elif pattern.strip("/"):
+                self.names.add(pattern.strip("/"))
+
+        self.regexes: List[Pattern] = self.__combine(regexes)
+
+    @property
+    def has_names(self) -> bool:
+        return bool(self.names or self.regexes)
+
+    def __bool__(self) -> bool:
+        return self.has_names or bool(self.predicates)
+
+    @property
+    def fields(self) -> List[str]:
+        return [predicate.field for predicate in self.predicates]
+
+    def matches_name(self, name: str) -> bool:
+        return name in self.names or any(regex.fullmatch(name) for regex in self.regexes)
+
+    @staticmethod
+    def __validate(pattern: str) -> str:
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise exceptions.InvalidArgumentError(f"Invalid regular expression '{pattern}': {e}")
+
+        return pattern
+
+    @staticmethod
+    def __combine(regexes: Sequence[str]) -> List[Pattern]:
+        if not regexes:
+            return []
+
+        # Expressions with global flags cannot be part of an alternation and are matched on their own.
+        try:
+            return [re.compile("|".join(f"(?:{regex})" for regex in regexes))]
+        except re.error:
+            return [re.compile(regex) for regex in regexes]
+
+
+def expand(patterns: Iterable[str]) -> List[str]:
+    """
+    Replace every `@file` pattern with the patterns of that file, one per line. Blank lines and lines starting
+    with `#` are skipped.
+
+    :raise BooException: A pattern file cannot be read.
+    """
+    expanded = []
+
+    for pattern in patterns:
+        if not pattern.startswith(FILE_PREFIX):
+            expanded.append(pattern)
+            continue
+
+        try:
+            with open(pattern[len(FILE_PREFIX):], 'r') as file:
+                expanded.extend(line.strip() for line in file if line.strip() and not line.lstrip().startswith("#"))
+        except IOError as e:
+            raise exceptions.BooException(f"An error occurred while reading the patterns '{pattern}': {e}")
+
+    return expanded
+
+
+class Selector:
+    """
+    Selects plugins by `--include` and `--exclude` patterns.
+
+    A plugin is selected when its directory name matches any include name pattern, or there is none, and every
+    include predicate holds. It is left out when its name matches any exclude name pattern or any exclude
+    predicate holds. Names are checked first, header fields are only read for the plugins that remain and only
+    when a predicate needs a field that the record does not hold.
+    """
+
+    def __init__(self, include: Iterable[str] = (), exclude: Iterable[str] = ()) -> None:
+        """
+        :param include: Plugin names, globs such as `acme-*`, `re:` regular expressions, header predicates such
+                        as `version<2.0.0` and `@file` pattern lists.
+        :param exclude: Patterns of the same kinds.
+        """
+        self.include: Patterns = Patterns(include)
+        self.exclude: Patterns = Patterns(exclude)
+
+    def __bool__(self) -> bool:
+        return bool(self.include or self.exclude)
+
+    def select(self, records: Iterable[scanner.PluginRecord]) -> List[scanner.PluginRecord]:
+        """
+        :param records: Scanned plugin records.
+        :return: The selected records, in the given order.
+        """
+        return [record for record in records if self.__selected(record.name, lambda: self.__header(record))]
+
+    def filter(self, abspaths: Iterable[str]) -> List[str]:
+        """
+        :param abspaths: Plugin directory paths.
+        :return: The selected paths, in the given order.
+        """
+        return [path for path in abspaths
+                if self.__selected(os.path.basename(path), lambda: self.__header(self.__record(path)))]
+
+    def __selected(self, name: str, header: Callable[[], Dict[str, Optional[str]]]) -> bool:
+        if self.include.has_names and not self.include.matches_name(name):
+            return False
+
+        if self.exclude.matches_name(name):
+            return False
+
+        if not self.include.predicates and not self.exclude.predicates:
+            return True
+
+        values = header()
+
+        return all(predicate.matches(values) for predicate in self.include.predicates) \
+            and not any(predicate.matches(values) for predicate in self.exclude.predicates)
+
+    def __header(self, record: Optional[scanner.PluginRecord]) -> Dict[str, Optional[str]]:
+        if record is None:
+            return {}
+
+        values = {field: getattr(record, attribute) for field, attribute in RECORD_FIELDS.items()}
+        fields = [field for field in {*self.include.fields, *self.exclude.fields} if values.get(field) is None]
+
+        if fields and record.main_file:
+            try:
+                values.update(versioning.read_header(record.main_file_path, fields))
+            except IOError:
+                pass
+
+        return values
+
+    @staticmethod
+    def __record(path: str) -> Optional[scanner.PluginRecord]:
+        """
+        :return: The record of a plugin directory, None for an entry without a main file, which no predicate matches.
+        """
+        try:
+            main_file_path = helpers.get_main_file_abspath(path)
+        except exceptions.SearchNotFound:
+            return None
+
+        return scanner.PluginRecord(path, os.path.basename(main_file_path), None, None)
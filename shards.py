@@ -0,0 +1,220 @@
+import heapq
+import json
+import os
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import archive
+import exceptions
+import ignore
+import versioning
+
+SCHEMA_VERSION = 1
+SHARD_REGEX = re.compile(r"(\d+)/(\d+)")
+
+# Estimated cost of a plugin besides its bytes: reading and writing the main file, opening the zip file.
+PLUGIN_COST = 4096
+
+Shard = Tuple[int, int]
+
+
+def parse(value: str) -> Shard:
+    """
+    :param value: `i/n`, the i-th of n shards, counted from 1.
+    :return: (i, n)
+    :raise InvalidArgumentError: The value is not a shard.
+    """
+    match = SHARD_REGEX.fullmatch(value.strip())
+
+    if not match or not 1 <= int(match.group(1)) <= int(match.group(2)):
+        raise exceptions.InvalidArgumentError(f"Invalid shard '{value}', expected i/n with 1 <= i <= n")
+
+    return int(match.group(1)), int(match.group(2))
+
+
+def cost(path: str) -> int:
+    """
+    Estimate the cost of updating a plugin from the bytes of the files that are packaged.
+    """
+    total = PLUGIN_COST
+
+    for file_path, _ in archive.Packager.files(path, ignore.Matcher.load(path)):
+        try:
+            total += os.lstat(file_path).st_size
+        except OSError:
+            continue
+
+    return total
+
+
+def assign(costs: Sequence[int], count: int) -> List[int]:
+    """
+    Split items across shards with balanced total costs, the most expensive item first to the least loaded shard.
+
+    The split only depends on the costs and their order, so every runner computes the same one from the same tree.
+
+    :param costs: Cost of every item.
+    :param count: Number of shards.
+    :return: Shard of every item, counted from 1.
+    """
+    loads = [(0, shard) for shard in range(1, count + 1)]
+    shards = [0] * len(costs)
+
+    for position in sorted(range(len(costs)), key=lambda _: (-costs[_], _)):
+        load, shard = heapq.heappop(loads)
+        shards[position] = shard
+        heapq.heappush(loads, (load + costs[position], shard))
+
+    return shards
+
+
+def select(paths: Sequence[str], shard: Shard) -> List[int]:
+    """
+    :param paths: Plugin directory paths, in the same order on every runner.
+    :param shard: (i, n)
+    :return: Positions of the plugins of the i-th shard.
+    """
+    index, count = shard
+    shards = assign([cost(path) for path in paths], count)
+
+    return [position for position, assigned in enumerate(shards) if assigned == index]
+
+
+class Result(NamedTuple):
+    """
+    The outcome of the update of a single plugin by a shard.
+    """
+    name: str
+    main_file: str
+    old_version: Optional[str] = None
+    new_version: Optional[str] = None
+    error: Optional[str] = None
+
+    def updated(self) -> Union[Dict, Exception]:
+        """
+        :return: The updated data of the plugin, as `UpdateCommand.run` returns it, or its error.
+        """
+        if self.error is not None:
+            return exceptions.BooException(self.error)
+
+        return {"plugin_name": self.name, "old_version": self.old_version, "new_version": self.new_version}
+
+
+class Results:
+    """
+    The results of a sharded multi-update, saved by every shard and merged into a single report and commit.
+
+    Main file paths are relative to the working directory of the run, so that the results of runners with
+    different checkout locations apply to the same files when they are merged.
+    """
+
+    def __init__(self, results: Iterable[Result], shards: Iterable[Shard] = ((1, 1),)) -> None:
+        self.results: List[Result] = list(results)
+        self.shards: List[Shard] = [tuple(shard) for shard in shards]
+
+    @classmethod
+    def build(cls, results: Iterable[Tuple[str, str, Union[Dict, Exception]]], shard: Shard) -> "Results":
+        """
+        :param results: (plugin name, main file path, updated data or exception) of every plugin of the shard.
+        """
+        return cls([
+            Result(name, os.path.relpath(main_file), error=str(updated)) if isinstance(updated, Exception)
+            else Result(name, os.path.relpath(main_file), updated["old_version"], updated["new_version"])
+            for name, main_file, updated in results
+        ], [shard])
+
+    @classmethod
+    def merge(cls, partials: Iterable["Results"]) -> "Results":
+        """
+        :raise BooException: The results are not the complete set of shards of a single run.
+        """
+        partials = list(partials)
+        shards = sorted(shard for partial in partials for shard in partial.shards)
+        counts = {count for index, count in shards}
+
+        if len(counts) != 1:
+            raise exceptions.BooException("The results belong to runs with different numbers of shards.")
+
+        count = counts.pop()
+        missing = sorted(set(range(1, count + 1)) - {index for index, _ in shards})
+
+        if len(set(shards)) != len(shards):
+            raise exceptions.BooException("The results contain the same shard more than once.")
+
+        if missing:
+            raise exceptions.BooException(f"The results of the shards {', '.join(map(str, missing))} of {count} "
+                                          f"are missing.")
+
+        results = sorted((result for partial in partials for result in partial.results),
+                         key=lambda result: result.main_file)
+
+        return cls(results, shards)
+
+    def apply(self) -> List[Tuple[Result, Union[Dict, Exception]]]:
+        """
+        Write the new versions of the updated plugins to the main files of this working tree, e.g. to commit
+        them from a single runner. A main file that already has the new version is left as it is.
+
+        :return: (result, updated data or exception) of every plugin.
+        """
+        return [(result, self.__apply(result)) for result in self.results]
+
+    def to_dict(self) -> Dict:
+        return {
+            "version": SCHEMA_VERSION,
+            "shards": [list(shard) for shard in self.shards],
+            "results": [result._asdict() for result in self.results],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Results":
+        if data.get("version") != SCHEMA_VERSION:
+            raise exceptions.InvalidArgumentError(f"Unsupported results version {data.get('version')!r}")
+
+        return cls([Result(**result) for result in data["results"]], data["shards"])
+
+    def save(self, path: str) -> None:
+        try:
+            with open(path, 'w') as file:
+                json.dump(self.to_dict(), file, indent=2)
+                file.write("\n")
+        except IOError as e:
+            raise exceptions.BooException(f"An error occurred while writing the results '{path}': {e}")
+
+    @classmethod
+    def load(cls, path: str) -> "Results":
+        try:
+            with open(path, 'r') as file:
+                return cls.from_dict(json.load(file))
+        except IOError as e:
+            raise exceptions.BooException(f"An error occurred while reading the results '{path}': {e}")
+        except (ValueError, KeyError, TypeError) as e:
+            raise exceptions.InvalidArgumentError(f"Invalid results '{path}': {e}")
+
+    @staticmethod
+    def __apply(result: Result) -> Union[Dict, Exception]:
+        if result.error is not None:
+            return result.updated()
+
+        try:
+            start, end, stat = versioning.locate_version(result.main_file)
+            version = Results.__read(result.main_file, start, end)
+
+            if version == result.old_version:
+                versioning.write_version(result.main_file, start, end, result.new_version)
+            elif version != result.new_version:
+                raise exceptions.BooException(f"The file {result.main_file} has the version {version} instead of "
+                                              f"{result.old_version}")
+        except exceptions.BooException as e:
+            return e
+
+        return result.updated()
+
+    @staticmethod
+    def __read(path: str, start: int, end: int) -> str:
+        try:
+            with open(path, 'rb') as file:
+                file.seek(start)
+                return file.read(end - start).decode(errors='replace')
+        except IOError as e:
+            raise exceptions.BooException(f"An error occurred while reading the file {path}: {e}")
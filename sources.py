@@ -0,0 +1,147 @@
+import os
+import subprocess
+import zipfile
+import zlib
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import click
+
+import exceptions
+import git
+import helpers
+import profiling
+import scanner
+import versioning
+
+ZIP_EXTENSION = ".zip"
+
+# Raised by zipfile for unreadable archives: unsupported compression methods, encrypted members and corrupt data.
+ZIP_ERRORS = (OSError, EOFError, zipfile.BadZipFile, NotImplementedError, RuntimeError, zlib.error)
+
+
+def zip_records(path: str) -> Iterator[scanner.PluginRecord]:
+    """
+    Read the plugins packaged in zip files without extracting them.
+
+    Only the central directory of every zip file and the first `versioning.HEADER_SIZE` bytes of the main file
+    members are read. A plugin is a top-level directory of a zip file with a main file, its record path is the
+    zip file path followed by that directory, e.g. `zips/plugin-10000.zip/plugin`.
+
+    Zip files that cannot be read are skipped with a warning on stderr.
+
+    :param path: A zip file or a directory of zip files, which are read in name order.
+    :raise BooException: The path is neither.
+    """
+    if os.path.isfile(path):
+        zip_paths = [path]
+    else:
+        helpers.validate_path(path)
+
+        with os.scandir(path) as entries:
+            zip_paths = sorted(entry.path for entry in entries
+                               if entry.name.endswith(ZIP_EXTENSION) and entry.is_file())
+
+    for zip_path in zip_paths:
+        try:
+            with zipfile.ZipFile(zip_path) as zip_file:
+                records = list(_zip_records(zip_path, zip_file))
+        except ZIP_ERRORS as e:
+            click.echo(f"Skipped the zip file {zip_path}: {e}", err=True)
+            continue
+
+        yield from records
+
+
+def _zip_records(zip_path: str, zip_file: zipfile.ZipFile) -> Iterator[scanner.PluginRecord]:
+    members: Dict[str, Dict[str, zipfile.ZipInfo]] = {}
+
+    for info in zip_file.infolist():
+        directory, _, name = info.filename.partition("/")
+
+        if name in helpers.MAIN_FILES:
+            members.setdefault(directory, {})[name] = info
+
+    for directory, main_files in sorted(members.items()):
+        main_file = next(main_file for main_file in helpers.MAIN_FILES if main_file in main_files)
+
+        with zip_file.open(main_files[main_file]) as member:
+            content = member.read(versioning.HEADER_SIZE)
+
+        profiling.count("bytes_read", len(content))
+        record = _record(os.path.join(zip_path, directory), main_file, content)
+
+        if record is not None:
+            yield record
+
+
+def ref_records(path: str, revision: str, depth: int = 1) -> Iterator[scanner.PluginRecord]:
+    """
+    Read the plugins of a plugins directory as of a Git revision without checking it out.
+
+    The tree is listed with a single `git ls-tree` process and the main files are read from a single
+    `git cat-file --batch` process. Plugins are found as `scanner.Scanner` finds them in a work tree, their record
+    paths are the paths they have in the work tree.
+
+    :param path: Plugins directory path, inside a Git work tree.
+    :param revision: Any revision `git rev-parse` understands, e.g. a tag or a commit.
+    :param depth: Directory levels below the plugins directory that may contain plugins.
+    :raise BooException: The directory is not in a Git work tree or the revision does not exist.
+    """
+    helpers.validate_path(path)
+
+    try:
+        entries = git.Git.ls_tree(path, revision)
+    except subprocess.CalledProcessError as e:
+        raise exceptions.BooException(f"Could not list the plugins of '{path}' at '{revision}': {e}")
+
+    with git.CatFile(path) as cat_file:
+        for directory, main_file, name in _main_files(entries, depth):
+            blob = cat_file.read(name)
+
+            if blob is None:
+                continue
+
+            profiling.count("bytes_read", len(blob[2]))
+            record = _record(os.path.join(os.path.abspath(path), directory), main_file, blob[2])
+
+            if record is not None:
+                yield record
+
+
+def _main_files(entries: List[Tuple[str, str]], depth: int) -> List[Tuple[str, str, str]]:
+    """
+    Pick the main files of the plugins from the files of a tree, with the rules of `scanner.Scanner`: a
+    directory with a main file is a plugin and is not descended into, ignored directories are skipped.
+
+    :param entries: (object name, path) of every file.
+    :return: (plugin directory, main file name, object name) in the order the scanner would find the plugins.
+    """
+    main_files: Dict[Tuple[str, ...], Dict[str, str]] = {}
+
+    for name, path in entries:
+        *directories, file_name = path.split("/")
+
+        if file_name in helpers.MAIN_FILES and 1 <= len(directories) <= depth \
+                and not scanner.IGNORED_DIRECTORIES.intersection(directories):
+            main_files.setdefault(tuple(directories), {})[file_name] = name
+
+    plugins = []
+
+    for directories in sorted(main_files):
+        if any(directories[:level] in main_files for level in range(1, len(directories))):
+            continue
+
+        names = main_files[directories]
+        main_file = next(main_file for main_file in helpers.MAIN_FILES if main_file in names)
+        plugins.append((os.path.join(*directories), main_file, names[main_file]))
+
+    return plugins
+
+
+def _record(path: str, main_file: str, content: bytes) -> Optional[scanner.PluginRecord]:
+    header = versioning.parse_header(content)
+
+    if not header["Plugin Name"] or not header["Version"]:
+        return None
+
+    return scanner.PluginRecord(path, main_file, header["Plugin Name"], header["Version"])
@@ -0,0 +1,20 @@
+import unittest
+
+from benchmarks.bench_startup import COMMAND_DEPENDENCIES, run
+
+
+class TestStartup(unittest.TestCase):
+
+    def test_help_does_not_import_commands(self):
+        elapsed, imports = run(("--help",))
+
+        self.assertIn("app", imports)
+        self.assertEqual([module for module in COMMAND_DEPENDENCIES if module in imports], [])
+
+    def test_commands_are_resolved_lazily(self):
+        import commands
+
+        self.assertIs(commands.UpgradeCommand, __import__("commands.upgrade").upgrade.UpgradeCommand)
+
+        with self.assertRaises(AttributeError):
+            commands.MissingCommand
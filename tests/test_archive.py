@@ -0,0 +1,318 @@
+import os
+import time
+import unittest
+import zipfile
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import archive
+import profiling
+from archive import Packager, ZipWriter, compress, previous_artifact
+
+
+class TestPackagerMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.plugin_path = os.path.join(self.test_dir.name, 'test_plugin')
+        os.makedirs(os.path.join(self.plugin_path, 'assets'))
+
+        self.files = {
+            'init.php': b"<?php\n/**\n * Plugin Name: Test\n * Version: 1.0.0\n */\n" * 20,
+            os.path.join('assets', 'logo.png'): os.urandom(2048),
+            os.path.join('assets', 'script.js'): b"console.log('boo');\n" * 50,
+            os.path.join('assets', 'ünicode.css'): b"body { color: red; }\n",
+        }
+
+        for name, content in self.files.items():
+            with open(os.path.join(self.plugin_path, name), 'wb') as f:
+                f.write(content)
+
+        self.zip_path = os.path.join(self.test_dir.name, 'output.zip')
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def __arcname(self, name: str) -> str:
+        return f"test_plugin/{name.replace(os.sep, '/')}"
+
+    def test_create(self):
+        Packager(jobs=2).create(self.plugin_path, self.zip_path)
+
+        with zipfile.ZipFile(self.zip_path) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            self.assertEqual(sorted(zip_file.namelist()), sorted(self.__arcname(_) for _ in self.files))
+
+            for name, content in self.files.items():
+                self.assertEqual(zip_file.read(self.__arcname(name)), content)
+
+            self.assertEqual(zip_file.getinfo(self.__arcname('init.php')).compress_type, zipfile.ZIP_DEFLATED)
+            self.assertEqual(
+                zip_file.getinfo(self.__arcname(os.path.join('assets', 'logo.png'))).compress_type,
+                zipfile.ZIP_STORED
+            )
+
+    def test_large_files_are_streamed(self):
+        with mock.patch('archive.STREAM_SIZE', 1024), mock.patch('archive.CHUNK_SIZE', 256):
+            member = compress(os.path.join(self.plugin_path, 'init.php'), 'init.php', zipfile.ZIP_DEFLATED)
+            self.assertIsNone(member.data)
+
+            Packager(jobs=2).create(self.plugin_path, self.zip_path)
+
+            with open(self.zip_path, 'rb') as f:
+                content = f.read()
+
+            Packager(jobs=2).create(self.plugin_path, self.zip_path)
+
+            with open(self.zip_path, 'rb') as f:
+                self.assertEqual(f.read(), content)
+
+        with zipfile.ZipFile(self.zip_path) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+
+            for name, content in self.files.items():
+                self.assertEqual(zip_file.read(self.__arcname(name)), content)
+
+            streamed = [info for info in zip_file.infolist() if info.flag_bits & archive.DATA_DESCRIPTOR_FLAG]
+            self.assertEqual(sorted(info.filename for info in streamed),
+                             [self.__arcname(os.path.join('assets', 'logo.png')), self.__arcname('init.php')])
+
+    def test_store_options(self):
+        Packager(store=['JS']).create(self.plugin_path, self.zip_path)
+
+        with zipfile.ZipFile(self.zip_path) as zip_file:
+            info = zip_file.getinfo(self.__arcname(os.path.join('assets', 'script.js')))
+            self.assertEqual(info.compress_type, zipfile.ZIP_STORED)
+
+        Packager(level=0).create(self.plugin_path, self.zip_path)
+
+        with zipfile.ZipFile(self.zip_path) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            self.assertTrue(all(info.compress_type == zipfile.ZIP_STORED for info in zip_file.infolist()))
+
+    def test_empty_directory(self):
+        empty_dir = os.path.join(self.test_dir.name, 'empty_dir')
+        os.makedirs(empty_dir)
+
+        Packager().create(empty_dir, self.zip_path)
+
+        with zipfile.ZipFile(self.zip_path) as zip_file:
+            self.assertEqual(zip_file.namelist(), [])
+
+
+class TestIgnoredFiles(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.plugin_path = os.path.join(self.test_dir.name, 'test_plugin')
+
+        for name in ('init.php', 'app.js', 'app.js.map', '.distignore', os.path.join('tests', 'test.php'),
+                     os.path.join('node_modules', 'lib', 'index.js'), os.path.join('.git', 'HEAD')):
+            os.makedirs(os.path.dirname(os.path.join(self.plugin_path, name)), exist_ok=True)
+
+            with open(os.path.join(self.plugin_path, name), 'w') as f:
+                f.write("tests/\n*.map\n" if name == '.distignore' else "1234")
+
+        self.zip_path = os.path.join(self.test_dir.name, 'output.zip')
+
+    def tearDown(self):
+        profiling.disable()
+        self.test_dir.cleanup()
+
+    def __namelist(self, packager: Packager) -> list:
+        packager.create(self.plugin_path, self.zip_path)
+
+        with zipfile.ZipFile(self.zip_path) as zip_file:
+            return sorted(zip_file.namelist())
+
+    def test_ignored_files_are_left_out(self):
+        self.assertEqual(self.__namelist(Packager()), ['test_plugin/app.js', 'test_plugin/init.php'])
+        self.assertEqual(self.__namelist(Packager(ignore_patterns=['*.js'])), ['test_plugin/init.php'])
+        self.assertEqual(len(self.__namelist(Packager(ignore_files=False))), 7)
+
+    def test_ignored_directories_are_not_walked(self):
+        walk = os.walk
+        walked = []
+
+        def walk_and_record(*args, **kwargs):
+            for entry in walk(*args, **kwargs):
+                walked.append(os.path.relpath(entry[0], self.plugin_path))
+                yield entry
+
+        with mock.patch('archive.os.walk', side_effect=walk_and_record):
+            list(Packager.files(self.plugin_path, Packager().matcher(self.plugin_path)))
+
+        self.assertEqual(walked, ['.'])
+
+    def test_skipped_files_are_counted(self):
+        recorder = profiling.enable()
+        self.__namelist(Packager())
+
+        self.assertEqual(recorder.totals['files_skipped'], 5)
+        self.assertEqual(recorder.totals['bytes_skipped'], 4 * 4 + len("tests/\n*.map\n"))
+
+
+class TestReproduciblePackagerMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.plugin_path = os.path.join(self.test_dir.name, 'test_plugin')
+        os.makedirs(os.path.join(self.plugin_path, 'assets'))
+
+        for name, content in (('init.php', "<?php\n/**\n * Version: 1.0.0\n */\n"), ('b.js', "b();\n"),
+                              (os.path.join('assets', 'a.css'), "a {}\n")):
+            with open(os.path.join(self.plugin_path, name), 'w') as f:
+                f.write(content)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def __create(self, name: str) -> bytes:
+        zip_path = os.path.join(self.test_dir.name, name)
+        Packager(reproducible=True).create(self.plugin_path, zip_path)
+
+        with open(zip_path, 'rb') as f:
+            return f.read()
+
+    def test_identical_content_gives_identical_zip_files(self):
+        first = self.__create('first.zip')
+
+        for name in os.listdir(self.plugin_path):
+            os.utime(os.path.join(self.plugin_path, name), (1e9, 1e9))
+        os.chmod(os.path.join(self.plugin_path, 'b.js'), 0o600)
+
+        self.assertEqual(self.__create('second.zip'), first)
+
+        with zipfile.ZipFile(os.path.join(self.test_dir.name, 'first.zip')) as zip_file:
+            self.assertEqual(zip_file.namelist(),
+                             ['test_plugin/assets/a.css', 'test_plugin/b.js', 'test_plugin/init.php'])
+            self.assertTrue(all(info.date_time == archive.REPRODUCIBLE_DATE_TIME for info in zip_file.infolist()))
+            self.assertTrue(all(info.external_attr >> 16 == 0o100644 for info in zip_file.infolist()))
+
+    def test_executable_files_keep_their_execute_permission(self):
+        os.chmod(os.path.join(self.plugin_path, 'b.js'), 0o700)
+        self.__create('output.zip')
+
+        with zipfile.ZipFile(os.path.join(self.test_dir.name, 'output.zip')) as zip_file:
+            self.assertEqual(zip_file.getinfo('test_plugin/b.js').external_attr >> 16, 0o100755)
+
+    def test_source_date_epoch(self):
+        with mock.patch.dict(os.environ, {"SOURCE_DATE_EPOCH": "1700000001"}):
+            self.assertEqual(archive.reproducible_date_time(), (2023, 11, 14, 22, 13, 20))
+
+        with mock.patch.dict(os.environ, {"SOURCE_DATE_EPOCH": "0"}):
+            self.assertEqual(archive.reproducible_date_time(), archive.REPRODUCIBLE_DATE_TIME)
+
+    def test_key_follows_content_and_options(self):
+        files = sorted(Packager.files(self.plugin_path), key=lambda pair: pair[1])
+        key = Packager(reproducible=True).key(files)
+
+        self.assertEqual(Packager(reproducible=True).key(files), key)
+        self.assertNotEqual(Packager(level=9, reproducible=True).key(files), key)
+
+        with open(os.path.join(self.plugin_path, 'b.js'), 'a') as f:
+            f.write("c();\n")
+
+        self.assertNotEqual(Packager(reproducible=True).key(files), key)
+
+
+class TestIncrementalPackagerMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.plugin_path = os.path.join(self.test_dir.name, 'test_plugin')
+        os.makedirs(self.plugin_path)
+
+        self.main_file_path = os.path.join(self.plugin_path, 'init.php')
+        self.asset_path = os.path.join(self.plugin_path, 'script.js')
+
+        with open(self.main_file_path, 'w') as f:
+            f.write("<?php\n/**\n * Plugin Name: Test\n * Version: 1.0.0\n */\n")
+
+        with open(self.asset_path, 'w') as f:
+            f.write("console.log('boo');\n" * 100)
+
+        past = time.time() - 60
+        for path in (self.main_file_path, self.asset_path):
+            os.utime(path, (past, past))
+
+        self.previous_zip_path = os.path.join(self.test_dir.name, 'test_plugin-10000.zip')
+        Packager().create(self.plugin_path, self.previous_zip_path)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def test_previous_artifact(self):
+        for name in ('test_plugin-900.zip', 'test_plugin-extra-20000.zip', 'other-30000.zip'):
+            open(os.path.join(self.test_dir.name, name), 'w').close()
+
+        self.assertEqual(previous_artifact(self.test_dir.name, 'test_plugin'), self.previous_zip_path)
+        self.assertIsNone(previous_artifact(self.test_dir.name, 'missing'))
+        self.assertIsNone(previous_artifact(os.path.join(self.test_dir.name, 'missing'), 'test_plugin'))
+
+    def test_reuses_unchanged_members(self):
+        with open(self.main_file_path, 'w') as f:
+            f.write("<?php\n/**\n * Plugin Name: Test\n * Version: 1.0.1\n */\n")
+
+        zip_path = os.path.join(self.test_dir.name, 'test_plugin-10001.zip')
+
+        with mock.patch('archive.compress', wraps=archive.compress) as compress_mock:
+            Packager(incremental=True).create(self.plugin_path, zip_path, self.previous_zip_path)
+
+        self.assertEqual([call.args[1] for call in compress_mock.call_args_list], ['test_plugin/init.php'])
+
+        with zipfile.ZipFile(zip_path) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            self.assertIn(b"Version: 1.0.1", zip_file.read('test_plugin/init.php'))
+            self.assertEqual(zip_file.read('test_plugin/script.js'), b"console.log('boo');\n" * 100)
+
+    def test_other_level_is_not_reused(self):
+        zip_path = os.path.join(self.test_dir.name, 'test_plugin-10001.zip')
+
+        with mock.patch('archive.compress', wraps=archive.compress) as compress_mock:
+            Packager(level=9, incremental=True).create(self.plugin_path, zip_path, self.previous_zip_path)
+
+        self.assertEqual(len(compress_mock.call_args_list), 2)
+
+        with zipfile.ZipFile(zip_path) as zip_file:
+            self.assertEqual(zip_file.comment, b"boo level=9")
+
+        with mock.patch('archive.compress', wraps=archive.compress) as compress_mock:
+            Packager(level=9, incremental=True).create(self.plugin_path, zip_path, zip_path)
+
+        self.assertEqual(compress_mock.call_args_list, [])
+
+    def test_previous_artifact_as_output(self):
+        with open(self.asset_path, 'w') as f:
+            f.write("console.log('new');\n" * 100)
+
+        Packager(incremental=True).create(self.plugin_path, self.previous_zip_path, self.previous_zip_path)
+
+        with zipfile.ZipFile(self.previous_zip_path) as zip_file:
+            self.assertEqual(zip_file.read('test_plugin/script.js'), b"console.log('new');\n" * 100)
+            self.assertEqual(sorted(os.listdir(self.test_dir.name)), ['test_plugin', 'test_plugin-10000.zip'])
+
+
+class TestZipWriterMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.file_path = os.path.join(self.test_dir.name, 'file.txt')
+
+        with open(self.file_path, 'w') as f:
+            f.write("This is a file")
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def test_write_many_members(self):
+        zip_path = os.path.join(self.test_dir.name, 'output.zip')
+        count = 70000
+
+        with ZipWriter(zip_path) as writer:
+            for index in range(count):
+                writer.write(compress(self.file_path, f"file-{index}.txt", zipfile.ZIP_STORED))
+
+        with zipfile.ZipFile(zip_path) as zip_file:
+            self.assertEqual(len(zip_file.infolist()), count)
+            self.assertEqual(zip_file.read(f"file-{count - 1}.txt"), b"This is a file")
@@ -0,0 +1,84 @@
+import os
+import unittest
+import zipfile
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import archive
+import artifacts
+
+
+class TestArtifactStore(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.plugin_path = os.path.join(self.test_dir.name, 'plugin')
+        self.zip_directory = os.path.join(self.test_dir.name, 'zip')
+        os.makedirs(self.plugin_path)
+        os.makedirs(self.zip_directory)
+
+        self.__write("<?php\n/**\n * Plugin Name: Plugin\n * Version: 1.0.0\n */\n")
+        self.store = artifacts.ArtifactStore(self.zip_directory)
+        self.packager = archive.Packager(reproducible=True)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def __write(self, content: str) -> None:
+        with open(os.path.join(self.plugin_path, 'init.php'), 'w') as f:
+            f.write(content)
+
+    def __create(self, name: str) -> str:
+        zip_path = os.path.join(self.zip_directory, name)
+        digest = self.packager.create(self.plugin_path, zip_path, artifact_store=self.store)
+        self.store.record([(zip_path, digest)])
+
+        return digest
+
+    def test_identical_content_is_linked_from_the_store(self):
+        digest = self.__create('plugin-10000.zip')
+
+        with mock.patch('archive.ZipWriter') as zip_writer:
+            self.assertEqual(self.__create('plugin-10000-copy.zip'), digest)
+
+        zip_writer.assert_not_called()
+        self.assertTrue(os.path.samefile(os.path.join(self.zip_directory, 'plugin-10000.zip'),
+                                         os.path.join(self.zip_directory, 'plugin-10000-copy.zip')))
+        self.assertEqual(self.store.digest(os.path.join(self.zip_directory, 'plugin-10000.zip')), digest)
+
+    def test_changed_content_is_written(self):
+        digest = self.__create('plugin-10000.zip')
+
+        self.__write("<?php\n/**\n * Plugin Name: Plugin\n * Version: 1.0.1\n */\n")
+        new_digest = self.__create('plugin-10001.zip')
+
+        self.assertNotEqual(new_digest, digest)
+
+        with zipfile.ZipFile(os.path.join(self.zip_directory, 'plugin-10001.zip')) as zip_file:
+            self.assertIn(b"Version: 1.0.1", zip_file.read('plugin/init.php'))
+
+        self.assertEqual(sorted(os.listdir(os.path.join(self.store.directory, 'objects'))),
+                         sorted([f"{digest}.zip", f"{new_digest}.zip"]))
+
+    def test_checksums(self):
+        digest = self.__create('plugin-10000.zip')
+
+        with open(self.store.checksums_path, 'r') as f:
+            self.assertEqual(f.read(), f"{digest}  plugin-10000.zip\n")
+
+        self.__write("<?php\n/**\n * Plugin Name: Plugin\n * Version: 1.0.1\n */\n")
+        new_digest = self.__create('plugin-10001.zip')
+        self.store.record([(os.path.join(self.zip_directory, 'plugin-10000.zip'), None)])
+
+        self.assertEqual(self.store.checksums(), {'plugin-10000.zip': digest, 'plugin-10001.zip': new_digest})
+
+    def test_missing_object_is_written_again(self):
+        digest = self.__create('plugin-10000.zip')
+        os.remove(self.store.object_path(digest))
+
+        self.assertEqual(self.__create('plugin-10000.zip'), digest)
+        self.assertTrue(os.path.isfile(self.store.object_path(digest)))
+
+
+if __name__ == '__main__':
+    unittest.main()
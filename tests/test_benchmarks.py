@@ -0,0 +1,70 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+import scanner
+from benchmarks import generator, suite
+
+
+class TestGenerator(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.path = self.test_dir.name
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def test_generate_varies_plugins(self):
+        plugins = generator.generate(self.path, 12, main_file_sizes=(0, 20000), index_every=4, asset_heavy_every=5,
+                                     assets=6, asset_size=128)
+
+        self.assertEqual([plugin.main_file for plugin in plugins].count("index.php"), 3)
+        self.assertEqual([plugin.assets for plugin in plugins], [6, 0, 0, 0, 0, 6, 0, 0, 0, 0, 6, 0])
+        self.assertGreater(os.path.getsize(plugins[1].main_file_path), 20000)
+        self.assertLess(os.path.getsize(plugins[0].main_file_path), 1000)
+
+        asset_files = [name for _, _, names in os.walk(os.path.join(plugins[0].path, "assets")) for name in names]
+        self.assertEqual(len(asset_files), 6)
+
+    def test_generate_is_reproducible(self):
+        first = generator.generate(os.path.join(self.path, "first"), 5, seed=3, assets=2)
+        second = generator.generate(os.path.join(self.path, "second"), 5, seed=3, assets=2)
+
+        self.assertEqual([plugin.version for plugin in first], [plugin.version for plugin in second])
+
+    def test_scanner_reads_generated_headers(self):
+        plugins = generator.generate(self.path, 10, asset_heavy_every=0)
+        records = scanner.Scanner.scan(self.path)
+
+        self.assertEqual([(record.name, record.main_file, record.plugin_name, record.version) for record in records],
+                         [(plugin.name, plugin.main_file, plugin.plugin_name, plugin.version) for plugin in plugins])
+
+
+class TestSuite(unittest.TestCase):
+
+    def test_run_and_compare(self):
+        document = suite.run(plugins=5, repeat=2, assets=1, only=("read_header", "VersionColumn"))
+
+        self.assertEqual(list(document["results"]), ["read_header", "VersionColumn"])
+        self.assertEqual(len(document["results"]["read_header"]["runs"]), 2)
+
+        slower = {"results": {name: {"best": result["best"] * 2} for name, result in document["results"].items()}}
+        rows = suite.compare(document, slower, threshold=0.5)
+
+        self.assertEqual([(name, regressed) for name, before, after, regressed in rows],
+                         [("read_header", True), ("VersionColumn", True)])
+        self.assertEqual([regressed for *_, regressed in suite.compare(slower, document)], [False, False])
+
+    def test_save_and_load(self):
+        document = {"schema": suite.SCHEMA_VERSION, "results": {"update": {"skipped": "No module named 'wppcpy'"}}}
+
+        with TemporaryDirectory() as path:
+            results_path = os.path.join(path, "results.json")
+            suite.save(document, results_path)
+
+            self.assertEqual(suite.load(results_path), document)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+import io
+import os
+import subprocess
+import unittest
+from contextlib import redirect_stdout
+from tempfile import TemporaryDirectory
+
+import changes
+import exceptions
+
+
+class TestChanges(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.path = self.test_dir.name
+
+        for name in ("plugin-a", "plugin-b", "plugin-c"):
+            self.__write(name, "init.php", f"<?php\n/**\n * Plugin Name: {name}\n * Version: 1.0.0\n */\n")
+            self.__write(name, os.path.join("assets", "style.css"), "body {}\n")
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def __write(self, plugin: str, name: str, content: str) -> None:
+        file_path = os.path.join(self.path, plugin, name)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+
+        with open(file_path, 'w') as f:
+            f.write(content)
+
+    def __read(self, plugin: str) -> str:
+        with open(os.path.join(self.path, plugin, "init.php"), 'r') as f:
+            return f.read()
+
+    def __git(self, *args: str) -> None:
+        subprocess.check_output(["git", "-c", "user.name=boo", "-c", "user.email=boo@example.com", *args],
+                                cwd=self.path, stderr=subprocess.DEVNULL)
+
+    def __update(self, **kwargs) -> None:
+        from commands import MultiUpdateCommand
+
+        with redirect_stdout(io.StringIO()):
+            MultiUpdateCommand([self.path], "0.0.1", "0.0.0", [], [], "outline", False, None, **kwargs).run()
+
+    def test_changed_since(self):
+        self.__git("init", "--quiet")
+        self.__git("add", ".")
+        self.__git("commit", "--quiet", "-m", "Initial commit")
+
+        self.assertEqual(changes.changed_since(self.path, "HEAD"), set())
+
+        self.__write("plugin-a", os.path.join("assets", "style.css"), "body { margin: 0; }\n")
+        self.__write("plugin-c", "readme.txt", "New file\n")
+
+        self.assertEqual(changes.changed_since(self.path, "HEAD"), {"plugin-a", "plugin-a/assets", "plugin-c"})
+
+        with self.assertRaises(exceptions.BooException):
+            changes.changed_since(self.path, "missing-revision")
+
+    def test_multi_update_changed_since(self):
+        self.__git("init", "--quiet")
+        self.__git("add", ".")
+        self.__git("commit", "--quiet", "-m", "Initial commit")
+        self.__write("plugin-b", os.path.join("assets", "style.css"), "body { margin: 0; }\n")
+
+        self.__update(changed_since="HEAD")
+
+        self.assertIn("Version: 1.0.0", self.__read("plugin-a"))
+        self.assertIn("Version: 1.0.1", self.__read("plugin-b"))
+        self.assertIn("Version: 1.0.0", self.__read("plugin-c"))
+
+    def test_digest_ignores_the_version(self):
+        plugin_path = os.path.join(self.path, "plugin-a")
+        manifest = changes.Manifest(self.path)
+        digest = manifest.digest(plugin_path, "init.php")
+
+        self.__write("plugin-a", "init.php", "<?php\n/**\n * Plugin Name: plugin-a\n * Version: 10.2.3\n */\n")
+        self.assertEqual(changes.Manifest(self.path).digest(plugin_path, "init.php"), digest)
+
+        self.__write("plugin-a", "init.php", "<?php\n/**\n * Plugin Name: plugin-a 2\n * Version: 10.2.3\n */\n")
+        self.assertNotEqual(changes.Manifest(self.path).digest(plugin_path, "init.php"), digest)
+
+    def test_manifest_is_recorded(self):
+        plugin_path = os.path.join(self.path, "plugin-a")
+        manifest = changes.Manifest.load(self.path)
+
+        self.assertTrue(manifest.changed(plugin_path, "init.php"))
+
+        manifest.record([(plugin_path, "init.php")])
+        manifest = changes.Manifest.load(self.path)
+
+        self.assertFalse(manifest.changed(plugin_path, "init.php"))
+        self.assertTrue(manifest.changed(os.path.join(self.path, "plugin-b"), "init.php"))
+
+        self.__write("plugin-a", "readme.txt", "New file\n")
+        self.assertTrue(changes.Manifest.load(self.path).changed(plugin_path, "init.php"))
+
+    def test_unreadable_manifest_is_empty(self):
+        manifest = changes.Manifest(self.path)
+        os.makedirs(os.path.dirname(manifest.manifest_path))
+
+        with open(manifest.manifest_path, 'w') as f:
+            f.write("{")
+
+        self.assertEqual(changes.Manifest.load(self.path).plugins, {})
+
+    def test_multi_update_changed(self):
+        self.__update(changed=True)
+
+        self.assertIn("Version: 1.0.1", self.__read("plugin-a"))
+        self.assertIn("Version: 1.0.1", self.__read("plugin-b"))
+
+        self.__update(changed=True)
+
+        self.assertIn("Version: 1.0.1", self.__read("plugin-a"))
+
+        self.__write("plugin-a", os.path.join("assets", "style.css"), "body { margin: 0; }\n")
+        self.__update(changed=True)
+
+        self.assertIn("Version: 1.0.2", self.__read("plugin-a"))
+        self.assertIn("Version: 1.0.1", self.__read("plugin-b"))
+        self.assertIn("Version: 1.0.1", self.__read("plugin-c"))
+
+    def test_multi_update_without_changed_does_not_record(self):
+        self.__update()
+
+        self.assertIn("Version: 1.0.1", self.__read("plugin-a"))
+        self.assertFalse(os.path.exists(changes.Manifest(self.path).manifest_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+import unittest
+from tempfile import TemporaryDirectory
+
+import daemon
+import index
+
+MAIN_FILE_CONTENT = """<?php
+/**
+ * Plugin Name: {name}
+ * Version: {version}
+ */
+"""
+
+
+class TestPollingDaemon(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.path = self.test_dir.name
+
+        for name in ("first", "second"):
+            self.write(name, "1.0.0")
+
+        self.server = daemon.Server(self.path, self.watcher())
+        self.thread = threading.Thread(target=self.server.serve_forever, kwargs={"poll_interval": 0.05})
+        self.thread.start()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.thread.join()
+        self.server.server_close()
+        self.test_dir.cleanup()
+
+    def watcher(self) -> daemon.Watcher:
+        return daemon.PollingWatcher(self.path, interval=0.05)
+
+    def write(self, name: str, version: str) -> None:
+        os.makedirs(os.path.join(self.path, name), exist_ok=True)
+
+        with open(os.path.join(self.path, name, "init.php"), "w") as f:
+            f.write(MAIN_FILE_CONTENT.format(name=name, version=version))
+
+    def wait_for(self, expected: dict) -> None:
+        deadline = time.monotonic() + 5
+
+        while True:
+            records = daemon.records(self.path) or []
+            versions = {record.name: record.version for record in records}
+
+            if versions == expected or time.monotonic() > deadline:
+                break
+
+            time.sleep(0.02)
+
+        self.assertEqual(versions, expected)
+
+    def test_records_follow_changes(self):
+        self.wait_for({"first": "1.0.0", "second": "1.0.0"})
+
+        self.write("first", "1.0.1")
+        self.write("third", "3.0.0")
+        self.wait_for({"first": "1.0.1", "second": "1.0.0", "third": "3.0.0"})
+
+        os.remove(os.path.join(self.path, "second", "init.php"))
+        self.wait_for({"first": "1.0.1", "third": "3.0.0"})
+
+    def test_lookup(self):
+        with daemon.Client.connect(self.path) as client:
+            self.assertEqual(client.lookup("first").full_path, os.path.join(self.path, "first"))
+            self.assertIsNone(client.lookup("missing"))
+
+        self.assertTrue(os.path.exists(os.path.join(self.path, index.DIRECTORY, ".gitignore")))
+
+
+@unittest.skipUnless(hasattr(os, "uname") and os.uname().sysname == "Linux", "inotify is only available on Linux")
+class TestInotifyDaemon(TestPollingDaemon):
+
+    def watcher(self) -> daemon.Watcher:
+        return daemon.InotifyWatcher(self.path)
+
+
+class TestClient(unittest.TestCase):
+
+    def test_no_daemon(self):
+        with TemporaryDirectory() as path:
+            self.assertIsNone(daemon.records(path))
+
+    def test_long_paths_use_the_temporary_directory(self):
+        socket_path = daemon.socket_path("/" + "plugins/" * 20)
+
+        self.assertEqual(os.path.dirname(socket_path), daemon.tempfile.gettempdir())
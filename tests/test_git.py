@@ -0,0 +1,65 @@
+import os
+import subprocess
+import unittest
+from tempfile import TemporaryDirectory
+
+from git import CatFile, Git
+
+
+class TestGitMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.repo_path = self.test_dir.name
+
+        self.__git("init", "--quiet")
+        self.__git("config", "user.name", "boo")
+        self.__git("config", "user.email", "boo@example.com")
+
+        self.paths = []
+        for name in ('first plugin', 'second*plugin', 'third'):
+            os.makedirs(os.path.join(self.repo_path, name))
+            path = os.path.join(self.repo_path, name, 'init.php')
+
+            with open(path, 'w') as f:
+                f.write(f"<?php // {name}\n")
+
+            self.paths.append(path)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def __git(self, *args: str) -> str:
+        return subprocess.check_output(["git", *args], cwd=self.repo_path).decode()
+
+    def test_add_and_commit(self):
+        Git.add(self.paths[:2], self.repo_path)
+        Git.commit("Add plugins\n\nWith a body.", repo_path=self.repo_path)
+
+        self.assertEqual(self.__git("log", "-1", "--format=%B").strip(), "Add plugins\n\nWith a body.")
+        self.assertEqual(
+            self.__git("show", "--name-only", "--format=", "HEAD").split("\n"),
+            ["first plugin/init.php", "second*plugin/init.php", ""]
+        )
+        self.assertIn("third/", self.__git("status", "--porcelain"))
+
+    def test_commit_each(self):
+        Git.commit_each([(f"Update {index}", [path]) for index, path in enumerate(self.paths)], self.repo_path)
+
+        self.assertEqual(self.__git("log", "--format=%s").split(), ["Update", "2", "Update", "1", "Update", "0"])
+        self.assertEqual(self.__git("show", "--name-only", "--format=", "HEAD~1").strip(), "second*plugin/init.php")
+        self.assertEqual(self.__git("status", "--porcelain"), "")
+
+    def test_rev_parse_and_cat_file(self):
+        Git.add(self.paths, self.repo_path)
+        Git.commit("Add plugins", repo_path=self.repo_path)
+
+        head, tree = Git.rev_parse(self.repo_path, "HEAD", "HEAD^{tree}")
+        self.assertEqual(head, self.__git("rev-parse", "HEAD").strip())
+
+        with CatFile(self.repo_path) as cat_file:
+            self.assertEqual(cat_file.resolve("HEAD", "HEAD^{tree}", "missing"), [head, tree, None])
+
+            name, object_type, content = cat_file.read("HEAD:third/init.php")
+            self.assertEqual(object_type, "blob")
+            self.assertEqual(content, b"<?php // third\n")
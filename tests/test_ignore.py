@@ -0,0 +1,62 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+import ignore
+
+
+class TestMatcher(unittest.TestCase):
+
+    def test_patterns(self):
+        matcher = ignore.Matcher(["*.map", "/tests/", "docs/**", "src/**/*.ts", "[!x]y.txt", "\\#notes", "# comment"])
+
+        self.assertTrue(matcher.ignored("app.js.map"))
+        self.assertTrue(matcher.ignored("assets/js/app.js.map"))
+        self.assertTrue(matcher.ignored("tests", directory=True))
+        self.assertFalse(matcher.ignored("tests"))
+        self.assertFalse(matcher.ignored("vendor/tests", directory=True))
+        self.assertTrue(matcher.ignored("docs/index.md"))
+        self.assertFalse(matcher.ignored("docs", directory=True))
+        self.assertTrue(matcher.ignored("src/main.ts"))
+        self.assertTrue(matcher.ignored("src/a/b/main.ts"))
+        self.assertFalse(matcher.ignored("lib/main.ts"))
+        self.assertTrue(matcher.ignored("zy.txt"))
+        self.assertFalse(matcher.ignored("xy.txt"))
+        self.assertTrue(matcher.ignored("#notes"))
+        self.assertFalse(matcher.ignored("# comment"))
+
+    def test_last_matching_pattern_wins(self):
+        matcher = ignore.Matcher(["*.php", "!init.php", "lib/init.php"])
+
+        self.assertTrue(matcher.ignored("functions.php"))
+        self.assertFalse(matcher.ignored("init.php"))
+        self.assertTrue(matcher.ignored("lib/init.php"))
+        self.assertFalse(matcher.ignored("style.css"))
+
+    def test_default_patterns(self):
+        matcher = ignore.Matcher(ignore.DEFAULT_PATTERNS)
+
+        self.assertTrue(matcher.ignored(".git", directory=True))
+        self.assertTrue(matcher.ignored("assets/node_modules", directory=True))
+        self.assertTrue(matcher.ignored(".distignore"))
+        self.assertFalse(matcher.ignored("init.php"))
+
+    def test_load_ignore_files(self):
+        with TemporaryDirectory() as path:
+            with open(os.path.join(path, ".distignore"), 'w') as f:
+                f.write("tests/\n*.map\n")
+
+            with open(os.path.join(path, ".booignore"), 'w') as f:
+                f.write("!keep.map\n!node_modules/\n")
+
+            matcher = ignore.Matcher.load(path)
+
+        self.assertTrue(matcher.ignored("tests", directory=True))
+        self.assertTrue(matcher.ignored("app.js.map"))
+        self.assertFalse(matcher.ignored("keep.map"))
+        self.assertFalse(matcher.ignored("node_modules", directory=True))
+        self.assertTrue(matcher.ignored(".git", directory=True))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+from index import HeaderIndex
+from scanner import Scanner
+
+MAIN_FILE_CONTENT = """
+<?php
+/**
+  * Plugin Name: {name}
+  * Version: {version}
+*/
+"""
+
+
+class TestHeaderIndexMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.plugin_path = os.path.join(self.test_dir.name, 'test_plugin')
+        os.makedirs(self.plugin_path)
+
+        self.init_file_path = os.path.join(self.plugin_path, 'init.php')
+        self.index_file_path = os.path.join(self.plugin_path, 'index.php')
+        self.__write(self.index_file_path, "Index Plugin", "1.0.0")
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    @staticmethod
+    def __write(path: str, name: str, version: str, stat: os.stat_result = None) -> None:
+        with open(path, 'w') as f:
+            f.write(MAIN_FILE_CONTENT.format(name=name, version=version))
+
+        if stat is not None:
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    def __scan(self) -> list:
+        with HeaderIndex(self.test_dir.name) as header_index:
+            return Scanner.scan(self.test_dir.name, header_index)
+
+    def test_warm_scan_uses_index(self):
+        self.assertEqual(self.__scan()[0].version, "1.0.0")
+        self.assertTrue(os.path.isfile(os.path.join(self.test_dir.name, '.boo', 'index.sqlite3')))
+
+        # Same size and mtime: the cached header is trusted without reading the file.
+        self.__write(self.index_file_path, "Index Plugin", "9.9.9", os.stat(self.index_file_path))
+        self.assertEqual(self.__scan()[0].version, "1.0.0")
+
+        self.assertEqual(Scanner.scan(self.test_dir.name)[0].version, "9.9.9")
+
+    def test_changed_signature_is_reparsed(self):
+        self.__scan()
+
+        self.__write(self.index_file_path, "Index Plugin", "1.0.10")
+        self.assertEqual(self.__scan()[0].version, "1.0.10")
+
+    def test_main_file_resolution_change(self):
+        self.__scan()
+
+        self.__write(self.init_file_path, "Init Plugin", "2.0.0")
+        record = self.__scan()[0]
+
+        self.assertEqual(record.main_file, 'init.php')
+        self.assertEqual(record.plugin_name, "Init Plugin")
+        self.assertEqual(record.version, "2.0.0")
+
+    def test_unwritable_index_is_disabled(self):
+        with open(os.path.join(self.test_dir.name, '.boo'), 'w') as f:
+            f.write("not a directory")
+
+        self.assertEqual(self.__scan()[0].version, "1.0.0")
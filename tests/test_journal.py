@@ -0,0 +1,191 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import exceptions
+import index
+import journal
+
+
+class TestTransaction(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.path = self.test_dir.name
+        self.targets = [os.path.join(self.path, name) for name in ("first.php", "second.php", "new.zip")]
+
+        for target in self.targets[:2]:
+            self.__write(target, "old")
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    @staticmethod
+    def __write(path: str, content: str) -> None:
+        with open(path, 'w') as f:
+            f.write(content)
+
+    @staticmethod
+    def __read(path: str) -> str:
+        with open(path) as f:
+            return f.read()
+
+    def __stage(self, transaction: journal.Transaction) -> None:
+        for target in self.targets:
+            signature = index.signature(os.stat(target)) if os.path.exists(target) else None
+            self.__write(transaction.stage(target, signature), "new")
+
+    def __crash(self) -> None:
+        """Commit and fail after the first file has been replaced."""
+        replace = os.replace
+        calls = []
+
+        def interrupted_replace(source, target):
+            if target in self.targets:
+                calls.append(target)
+
+                if len(calls) > 1:
+                    raise KeyboardInterrupt
+
+            replace(source, target)
+
+        with journal.Transaction(self.path) as transaction:
+            self.__stage(transaction)
+
+            with mock.patch("os.replace", interrupted_replace), self.assertRaises(KeyboardInterrupt):
+                transaction.commit()
+
+    def test_commit(self):
+        with journal.Transaction(self.path) as transaction:
+            self.__stage(transaction)
+            transaction.commit()
+
+        self.assertEqual([self.__read(target) for target in self.targets], ["new"] * 3)
+        self.assertEqual(sorted(os.listdir(self.path)), [".boo", "first.php", "new.zip", "second.php"])
+        self.assertEqual(sorted(os.listdir(os.path.join(self.path, index.DIRECTORY))), [".gitignore", journal.LOCK])
+
+    def test_discard(self):
+        with journal.Transaction(self.path) as transaction:
+            self.__stage(transaction)
+
+        self.assertEqual([self.__read(target) for target in self.targets[:2]], ["old"] * 2)
+        self.assertFalse(os.path.exists(self.targets[2]))
+        self.assertFalse(os.path.exists(transaction.directory))
+
+    def test_concurrent_transaction_fails(self):
+        with journal.Transaction(self.path) as transaction:
+            self.__stage(transaction)
+
+            with self.assertRaisesRegex(exceptions.BooException, "Another transaction"):
+                journal.Transaction(self.path).open()
+
+            transaction.commit()
+
+        self.assertEqual([self.__read(target) for target in self.targets], ["new"] * 3)
+
+        with journal.Transaction(self.path):
+            pass
+
+    def test_changed_target_is_not_committed(self):
+        with journal.Transaction(self.path) as transaction:
+            self.__stage(transaction)
+            self.__write(self.targets[1], "changed meanwhile")
+
+            with self.assertRaises(exceptions.BooException):
+                transaction.commit()
+
+        self.assertEqual(self.__read(self.targets[0]), "old")
+
+    def test_recover_forward(self):
+        self.__crash()
+
+        with self.assertRaises(exceptions.BooException):
+            journal.Transaction(self.path).open()
+
+        self.assertEqual(journal.Transaction.recover(self.path, journal.FORWARD), 3)
+        self.assertEqual([self.__read(target) for target in self.targets], ["new"] * 3)
+        self.assertFalse(os.path.exists(os.path.join(self.path, index.DIRECTORY, journal.DIRECTORY)))
+
+    def test_failed_replace_asks_for_recovery(self):
+        replace = os.replace
+
+        def failing_replace(source, target):
+            if target == self.targets[1]:
+                raise PermissionError(13, "Permission denied")
+
+            replace(source, target)
+
+        with journal.Transaction(self.path) as transaction:
+            self.__stage(transaction)
+
+            with mock.patch("os.replace", failing_replace), \
+                    self.assertRaisesRegex(exceptions.BooException, "recover it with '--recover forward'"):
+                transaction.commit()
+
+        self.assertEqual(journal.Transaction.recover(self.path, journal.BACK), 3)
+        self.assertEqual([self.__read(target) for target in self.targets[:2]], ["old"] * 2)
+
+    def test_recover_back(self):
+        self.__crash()
+
+        self.assertEqual(self.__read(self.targets[0]), "new")
+        self.assertEqual(journal.Transaction.recover(self.path, journal.BACK), 3)
+        self.assertEqual([self.__read(target) for target in self.targets[:2]], ["old"] * 2)
+        self.assertFalse(os.path.exists(self.targets[2]))
+        self.assertEqual(journal.Transaction.recover(self.path, journal.BACK), 0)
+
+
+class TestTransactionalUpdate(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.path = self.test_dir.name
+        self.main_files = [os.path.join(self.path, "group", name, "init.php") for name in ("p1", "p2")]
+
+        for main_file in self.main_files:
+            os.makedirs(os.path.dirname(main_file))
+
+            with open(main_file, 'w') as f:
+                f.write(f"<?php\n/**\n * Plugin Name: {os.path.basename(os.path.dirname(main_file))}\n"
+                        f" * Version: 1.0.0\n */\n")
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def __versions(self) -> list:
+        import versioning
+
+        return [versioning.read_header(main_file, ("Version",))["Version"] for main_file in self.main_files]
+
+    def __command(self, **kwargs):
+        from commands import MultiUpdateCommand
+
+        return MultiUpdateCommand([self.path], "0.0.1", "0.0.0", [], [], "outline", False, None, depth=2, **kwargs)
+
+    def test_recover_nested_plugins(self):
+        replace = os.replace
+
+        def interrupted_replace(source, target):
+            if target == self.main_files[1]:
+                raise KeyboardInterrupt
+
+            replace(source, target)
+
+        with mock.patch("os.replace", interrupted_replace), self.assertRaises(KeyboardInterrupt), \
+                mock.patch("click.echo"):
+            self.__command(transactional=True).run()
+
+        self.assertEqual(self.__versions(), ["1.0.1", "1.0.0"])
+        self.assertTrue(os.path.isdir(os.path.join(self.path, index.DIRECTORY, journal.DIRECTORY)))
+
+        with mock.patch("click.echo") as echo:
+            self.__command(recover=journal.BACK).run()
+
+        self.assertIn("Rolled back the 2 files", echo.call_args[0][0])
+        self.assertEqual(self.__versions(), ["1.0.0", "1.0.0"])
+
+        with mock.patch("click.echo"):
+            self.__command(transactional=True).run()
+
+        self.assertEqual(self.__versions(), ["1.0.1", "1.0.1"])
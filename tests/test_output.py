@@ -0,0 +1,42 @@
+import io
+import json
+import unittest
+
+import output
+
+FIELDS = ("name", "version")
+RECORDS = [{"name": "first", "version": "1.0.0"}, {"name": "second, quoted", "version": "2.0.0", "extra": True}]
+
+
+class TestWriters(unittest.TestCase):
+
+    def __write(self, output_format: str) -> str:
+        stream = io.StringIO()
+
+        with output.writer(output_format, FIELDS, stream) as writer:
+            for record in RECORDS:
+                writer.write(record)
+
+        return stream.getvalue()
+
+    def test_json(self):
+        self.assertEqual(json.loads(self.__write("json")), [
+            {"name": "first", "version": "1.0.0"},
+            {"name": "second, quoted", "version": "2.0.0"},
+        ])
+
+    def test_empty_json(self):
+        stream = io.StringIO()
+
+        with output.writer("json", FIELDS, stream):
+            pass
+
+        self.assertEqual(json.loads(stream.getvalue()), [])
+
+    def test_ndjson(self):
+        lines = self.__write("ndjson").splitlines()
+
+        self.assertEqual([json.loads(line)["name"] for line in lines], ["first", "second, quoted"])
+
+    def test_csv(self):
+        self.assertEqual(self.__write("csv"), 'name,version\nfirst,1.0.0\n"second, quoted",2.0.0\n')
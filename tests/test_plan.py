@@ -0,0 +1,94 @@
+import io
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+import exceptions
+import plan
+import scanner
+
+MAIN_FILE_CONTENT = """<?php
+/**
+ * Plugin Name: {name}
+ * Version: {version}
+ */
+"""
+
+
+class TestPlan(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+
+        for name, version in (("first", "1.0.99"), ("second", "1.0.0-beta"), ("third", "2.3.4")):
+            os.makedirs(os.path.join(self.test_dir.name, name))
+
+            with open(os.path.join(self.test_dir.name, name, "init.php"), "w") as f:
+                f.write(MAIN_FILE_CONTENT.format(name=name, version=version))
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def __build(self) -> plan.Plan:
+        return plan.Plan.build(scanner.Scanner.scan(self.test_dir.name), "0.0.1", "0.0.0", self.test_dir.name)
+
+    def __content(self, name: str) -> str:
+        with open(os.path.join(self.test_dir.name, name, "init.php")) as f:
+            return f.read()
+
+    def test_build_does_not_touch_files(self):
+        first, second, third = self.__build().changes
+
+        self.assertEqual((first.old_version, first.new_version), ("1.0.99", "1.1.0"))
+        self.assertEqual(first.write_bytes, len(MAIN_FILE_CONTENT.format(name="first", version="1.1.0")))
+        self.assertEqual(first.zip_path, os.path.join(os.path.abspath(self.test_dir.name), "first-10100.zip"))
+        self.assertEqual(second.error, "Invalid version '1.0.0-beta'")
+        self.assertEqual(third.write_bytes, len("2.3.5"))
+        self.assertIn("Version: 1.0.99", self.__content("first"))
+
+    def test_saved_plan_is_applied(self):
+        stream = io.StringIO()
+        self.__build().save(stream)
+
+        path = os.path.join(self.test_dir.name, "plan.json")
+        with open(path, "w") as f:
+            f.write(stream.getvalue())
+
+        first, second, third = plan.Plan.load(path).changes
+
+        plan.apply(first)
+        plan.apply(third)
+
+        self.assertEqual(self.__content("first"), MAIN_FILE_CONTENT.format(name="first", version="1.1.0"))
+        self.assertEqual(self.__content("third"), MAIN_FILE_CONTENT.format(name="third", version="2.3.5"))
+
+        with self.assertRaises(exceptions.BooException):
+            plan.apply(second)
+
+    def test_changed_file_is_not_applied(self):
+        first = self.__build().changes[0]
+
+        with open(os.path.join(self.test_dir.name, "first", "init.php"), "a") as f:
+            f.write("// changed\n")
+
+        with self.assertRaisesRegex(exceptions.BooException, "has changed since the plan was made"):
+            plan.apply(first)
+
+        self.assertIn("Version: 1.0.99", self.__content("first"))
+
+    def test_duplicate_zip_paths_are_rejected(self):
+        from commands import MultiUpdateCommand
+
+        root = os.path.join(self.test_dir.name, "other")
+        os.makedirs(os.path.join(root, "first"))
+
+        with open(os.path.join(root, "first", "init.php"), "w") as f:
+            f.write(MAIN_FILE_CONTENT.format(name="first", version="1.0.99"))
+
+        command = MultiUpdateCommand([self.test_dir.name, root], "0.0.1", zip=os.path.join(self.test_dir.name, "zips"))
+
+        with self.assertRaisesRegex(exceptions.BooException, "would both be zipped to .*first-10100.zip"):
+            command.run()
+
+        self.assertIn("Version: 1.0.99", self.__content("first"))
+        self.assertFalse(os.path.exists(os.path.join(self.test_dir.name, "zips")))
@@ -0,0 +1,124 @@
+import json
+import os
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import profiling
+import versioning
+
+
+class TestProfiling(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = profiling.enable()
+
+    def tearDown(self):
+        profiling.disable()
+
+    def test_span_is_a_no_op_while_disabled(self):
+        profiling.disable()
+
+        with profiling.span("phase"):
+            profiling.count("bytes_read", 10)
+
+        self.assertEqual(self.recorder.spans, [])
+
+    def test_counters_add_up_to_nested_spans(self):
+        with profiling.span("phase"):
+            with profiling.span("plugin", plugin="first"):
+                profiling.count("bytes_read", 10)
+
+            profiling.count("subprocesses")
+
+        plugin, phase = self.recorder.spans
+
+        self.assertEqual(plugin.counters, {"bytes_read": 10})
+        self.assertEqual(phase.counters, {"bytes_read": 10, "subprocesses": 1})
+        self.assertEqual(self.recorder.totals, {"bytes_read": 10, "bytes_written": 0, "subprocesses": 1,
+                                                "files_skipped": 0, "bytes_skipped": 0})
+        self.assertGreaterEqual(phase.wall, plugin.wall)
+
+    def test_propagate_counts_pool_threads_into_open_spans(self):
+        with profiling.span("phase"), ThreadPoolExecutor(max_workers=4) as executor:
+            count = profiling.propagate(profiling.count)
+
+            for future in [executor.submit(count, "bytes_written", 5) for _ in range(8)]:
+                future.result()
+
+        self.assertEqual(self.recorder.spans[0].counters, {"bytes_written": 40})
+
+    def test_failed_span_records_the_error(self):
+        with self.assertRaises(ValueError), profiling.span("phase"):
+            raise ValueError
+
+        self.assertEqual(self.recorder.spans[0].attributes, {"error": "ValueError"})
+
+    def test_version_io_is_counted(self):
+        with TemporaryDirectory() as path:
+            main_file = os.path.join(path, "init.php")
+
+            with open(main_file, 'w') as f:
+                f.write("<?php\n/*\n * Plugin Name: First\n * Version: 1.0.0\n */\n")
+
+            with profiling.span("plugin", plugin="first"):
+                versioning.read_header(main_file)
+                versioning.set_version_to_file(main_file, "1.0.10")
+
+            size = os.path.getsize(main_file)
+
+        write_version, plugin = self.recorder.spans
+
+        self.assertEqual(write_version.name, "write_version")
+        self.assertEqual(plugin.counters["bytes_written"], size)
+        self.assertGreaterEqual(plugin.counters["bytes_read"], 2 * (size - len("1.0.10")))
+
+    def test_git_processes_are_counted(self):
+        import git
+
+        with mock.patch("subprocess.run"), profiling.span("commit"):
+            git.Git.commit_each([("first", ["a.php"]), ("second", ["b.php"])])
+
+        self.assertEqual(self.recorder.totals["subprocesses"], 3)
+        self.assertEqual([span.attributes["command"] for span in self.recorder.spans if span.name == "git"],
+                         ["add", "commit", "commit"])
+
+    def test_trace_and_summary(self):
+        with profiling.span("update"):
+            with profiling.span("plugin", plugin="first"):
+                profiling.count("bytes_read", 3)
+
+        trace = json.loads(json.dumps(self.recorder.trace()))
+        events = {event["name"]: event for event in trace["traceEvents"]}
+
+        self.assertEqual(events["plugin"]["ph"], "X")
+        self.assertEqual(events["plugin"]["args"]["plugin"], "first")
+        self.assertEqual(events["plugin"]["args"]["bytes_read"], 3)
+        self.assertLessEqual(events["update"]["ts"], events["plugin"]["ts"])
+
+        summary = self.recorder.summary()
+
+        self.assertIn("update", summary)
+        self.assertIn("first", summary)
+
+    def test_start_writes_the_trace_on_report(self):
+        profiling.disable()
+
+        with TemporaryDirectory() as path:
+            trace_path = os.path.join(path, "trace.json")
+            report = profiling.start(profiling.TRACE, trace_path)
+
+            with profiling.span("phase"):
+                pass
+
+            report()
+
+            with open(trace_path) as f:
+                names = [event["name"] for event in json.load(f)["traceEvents"]]
+
+        self.assertEqual(names, ["phase", "command"])
+
+
+if __name__ == '__main__':
+    unittest.main()
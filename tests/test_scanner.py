@@ -0,0 +1,99 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+import exceptions
+from scanner import Scanner, PluginRecord
+
+
+class TestScannerMethods(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+
+        self.plugin_path = self.__create_plugin('test_plugin', 'init.php', "Plugin Name", "1.0.0")
+        self.index_plugin_path = self.__create_plugin('index_plugin', 'index.php', "Index Plugin", "2.1.3")
+
+        self.headerless_plugin_path = os.path.join(self.test_dir.name, 'headerless_plugin')
+        os.makedirs(self.headerless_plugin_path)
+        with open(os.path.join(self.headerless_plugin_path, 'init.php'), 'w') as f:
+            f.write("<?php\n")
+
+        self.invalid_plugin_path = os.path.join(self.test_dir.name, 'invalid_plugin')
+        os.makedirs(self.invalid_plugin_path)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def __create_plugin(self, directory: str, main_file: str, name: str, version: str) -> str:
+        path = os.path.join(self.test_dir.name, directory)
+        os.makedirs(path)
+
+        with open(os.path.join(path, main_file), 'w') as f:
+            f.write(f"""
+<?php
+/**
+  * Plugin Name: {name}
+  * Version: {version}
+*/
+            """)
+
+        return path
+
+    def test_read(self):
+        record = Scanner.read(self.plugin_path)
+
+        self.assertEqual(record, PluginRecord(self.plugin_path, 'init.php', "Plugin Name", "1.0.0"))
+        self.assertEqual(record.name, 'test_plugin')
+        self.assertEqual(record.main_file_path, os.path.join(self.plugin_path, 'init.php'))
+
+        with self.assertRaises(AttributeError):
+            record.version = "2.0.0"
+
+    def test_read_index_main_file(self):
+        record = Scanner.read(self.index_plugin_path)
+
+        self.assertEqual(record.main_file, 'index.php')
+        self.assertEqual(record.version, "2.1.3")
+
+    def test_read_invalid(self):
+        with self.assertRaises(exceptions.SearchNotFound):
+            Scanner.read(self.invalid_plugin_path)
+
+        with self.assertRaises(exceptions.SearchNotFound):
+            Scanner.read(self.headerless_plugin_path)
+
+    def test_scan(self):
+        records = Scanner.scan(self.test_dir.name)
+
+        self.assertEqual([record.path for record in records], [self.index_plugin_path, self.plugin_path])
+
+        with self.assertRaises(exceptions.InvalidDirectoryError):
+            Scanner.scan(os.path.join(self.test_dir.name, 'missing'))
+
+    def test_scan_depth(self):
+        nested_plugin_path = self.__create_plugin(os.path.join('group', 'nested_plugin'), 'init.php', "Nested", "1.0.0")
+        self.__create_plugin(os.path.join('group', 'node_modules', 'package'), 'index.php', "Ignored", "1.0.0")
+        self.__create_plugin(os.path.join('group', 'deeper', 'plugin'), 'init.php', "Deeper", "1.0.0")
+
+        self.assertNotIn(nested_plugin_path, [record.path for record in Scanner.scan(self.test_dir.name)])
+        self.assertEqual(
+            [record.path for record in Scanner.scan(self.test_dir.name, depth=2)],
+            [nested_plugin_path, self.index_plugin_path, self.plugin_path]
+        )
+        self.assertEqual(len(Scanner.scan(self.test_dir.name, depth=3)), 4)
+
+    def test_discover(self):
+        with TemporaryDirectory() as other_root:
+            other_plugin_path = os.path.join(other_root, 'other_plugin')
+            os.makedirs(other_plugin_path)
+
+            with open(os.path.join(other_plugin_path, 'init.php'), 'w') as f:
+                f.write("<?php\n/*\n * Plugin Name: Other\n * Version: 3.0.0\n */\n")
+
+            records = list(Scanner.discover([other_root, self.test_dir.name, other_root]))
+
+        self.assertEqual(
+            [record.path for record in records],
+            [other_plugin_path, self.index_plugin_path, self.plugin_path]
+        )
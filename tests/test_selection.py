@@ -0,0 +1,102 @@
+import os
+import unittest
+from tempfile import TemporaryDirectory
+
+import exceptions
+import scanner
+import selection
+
+
+class TestSelection(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.path = self.test_dir.name
+
+        for name, version, requires_php in (("acme-forms", "1.2.0", "7.4"), ("acme-seo", "2.0.0", "8.1"),
+                                            ("blog", "1.10.0", "8.2"), ("shop", "3.0.0", None)):
+            os.makedirs(os.path.join(self.path, name))
+
+            with open(os.path.join(self.path, name, "init.php"), 'w') as f:
+                f.write(f"<?php\n/**\n * Plugin Name: {name}\n * Version: {version}\n")
+                f.write(f" * Requires PHP: {requires_php}\n */\n" if requires_php else " */\n")
+
+        self.records = scanner.Scanner.scan(self.path)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def __select(self, include=(), exclude=()):
+        return [record.name for record in selection.Selector(include, exclude).select(self.records)]
+
+    def test_names(self):
+        self.assertEqual(self.__select(), ["acme-forms", "acme-seo", "blog", "shop"])
+        self.assertEqual(self.__select(["blog/", "shop"]), ["blog", "shop"])
+        self.assertEqual(self.__select(exclude=["blog"]), ["acme-forms", "acme-seo", "shop"])
+        self.assertEqual(self.__select(["missing"]), [])
+
+    def test_globs_and_regexes(self):
+        self.assertEqual(self.__select(["acme-*"]), ["acme-forms", "acme-seo"])
+        self.assertEqual(self.__select(["acme-*"], ["*-seo"]), ["acme-forms"])
+        self.assertEqual(self.__select(["re:(blog|sh.p)"]), ["blog", "shop"])
+        self.assertEqual(self.__select(["re:acme"]), [])
+        self.assertEqual(self.__select(["re:(?i)BLOG", "shop"]), ["blog", "shop"])
+
+        with self.assertRaises(exceptions.InvalidArgumentError):
+            selection.Selector(["re:("])
+
+    def test_predicates(self):
+        self.assertEqual(self.__select(["version<2.0.0"]), ["acme-forms", "blog"])
+        self.assertEqual(self.__select(["version>=1.10"]), ["acme-seo", "blog", "shop"])
+        self.assertEqual(self.__select(["requires_php>=8.1"]), ["acme-seo", "blog"])
+        self.assertEqual(self.__select(["acme-*", "requires-php >= 8.0"]), ["acme-seo"])
+        self.assertEqual(self.__select(exclude=["requires_php<8"]), ["acme-seo", "blog", "shop"])
+        self.assertEqual(self.__select(["plugin_name=blog"]), ["blog"])
+        self.assertEqual(self.__select(["version!=2.0.0", "version!=3.0.0"]), ["acme-forms", "blog"])
+
+    def test_version_predicates(self):
+        def matches(pattern, version):
+            return selection.Predicate.parse(pattern).matches({"Version": version})
+
+        for version in ("4.1.0.2", "9.0.0-rc1", "9.9.9.9", "10.0.0-beta"):
+            self.assertTrue(matches("version<10.0.0", version), version)
+
+        for version in ("12.0.0.1", "10.0.0", "10", "10.0.0.1"):
+            self.assertFalse(matches("version<10.0.0", version), version)
+
+        self.assertTrue(matches("version=8.1", "8.1.0"))
+        self.assertTrue(matches("version<9.0.0", "9.0.0-rc1"))
+        self.assertTrue(matches("version<9.0.0-rc2", "9.0.0-rc1"))
+        self.assertTrue(matches("version>1.9", "1.10"))
+        self.assertTrue(matches("version<beta", "alpha"))
+
+    def test_pattern_files(self):
+        patterns_path = os.path.join(self.path, "plugins.txt")
+
+        with open(patterns_path, 'w') as f:
+            f.write("# Plugins of the release\n\nacme-forms\nblog\n")
+
+        self.assertEqual(self.__select([f"@{patterns_path}"]), ["acme-forms", "blog"])
+        self.assertEqual(self.__select([f"@{patterns_path}", "shop"], ["blog"]), ["acme-forms", "shop"])
+
+        with self.assertRaises(exceptions.BooException):
+            selection.Selector([f"@{patterns_path}.missing"])
+
+    def test_filter_paths(self):
+        paths = [os.path.join(self.path, name) for name in ("acme-forms", "acme-seo", "blog", "shop")]
+        selector = selection.Selector(["acme-*", "version>1.5"])
+
+        self.assertEqual(selector.filter(paths), [paths[1]])
+        self.assertEqual(selection.Selector().filter(paths), paths)
+
+    def test_filter_entries_without_main_file(self):
+        import helpers
+
+        open(os.path.join(self.path, "README.txt"), 'w').close()
+        os.makedirs(os.path.join(self.path, "empty"))
+
+        self.assertEqual([os.path.basename(path) for path in
+                          helpers.get_filtered_plugin_paths(self.path, ["version<2.0.0"], [])], ["acme-forms", "blog"])
+        self.assertEqual([os.path.basename(path) for path in
+                          helpers.get_filtered_plugin_paths(self.path, [], ["version<2.0.0"])],
+                         ["README.txt", "acme-seo", "empty", "shop"])
@@ -0,0 +1,157 @@
+import io
+import os
+import unittest
+from contextlib import redirect_stdout
+from tempfile import TemporaryDirectory
+
+import exceptions
+import shards
+
+
+class TestShards(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.path = self.test_dir.name
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(self.path)
+
+        for name, size in (("plugin-a", 40000), ("plugin-b", 30000), ("plugin-c", 20000), ("plugin-d", 10000)):
+            self.__write(name, "init.php", f"<?php\n/**\n * Plugin Name: {name}\n * Version: 1.0.0\n */\n")
+            self.__write(name, "data.txt", "x" * size)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def __write(self, plugin: str, name: str, content: str) -> None:
+        os.makedirs(os.path.join(self.path, plugin), exist_ok=True)
+
+        with open(os.path.join(self.path, plugin, name), 'w') as f:
+            f.write(content)
+
+    def __read(self, plugin: str) -> str:
+        with open(os.path.join(self.path, plugin, "init.php"), 'r') as f:
+            return f.read()
+
+    def __update(self, shard: str, **kwargs) -> None:
+        from commands import MultiUpdateCommand
+
+        with redirect_stdout(io.StringIO()):
+            MultiUpdateCommand([self.path], "0.0.1", "0.0.0", [], [], "outline", False, None, shard=shard,
+                               **kwargs).run()
+
+    def test_parse(self):
+        self.assertEqual(shards.parse("2/3"), (2, 3))
+        self.assertEqual(shards.parse(" 1/1 "), (1, 1))
+
+        for value in ("0/2", "3/2", "1", "a/b", "1/0", "-1/2"):
+            with self.assertRaises(exceptions.InvalidArgumentError):
+                shards.parse(value)
+
+    def test_assign(self):
+        self.assertEqual(shards.assign([5, 4, 3, 3, 2, 1], 2), [1, 2, 2, 1, 2, 1])
+        self.assertEqual(shards.assign([1, 1, 1], 3), [1, 2, 3])
+        self.assertEqual(shards.assign([], 2), [])
+
+        costs = [100, 1, 1, 1, 50, 49]
+        loads = {}
+
+        for cost, shard in zip(costs, shards.assign(costs, 2)):
+            loads[shard] = loads.get(shard, 0) + cost
+
+        self.assertEqual(loads, {1: 101, 2: 101})
+
+    def test_select(self):
+        paths = [os.path.join(self.path, name) for name in ("plugin-a", "plugin-b", "plugin-c", "plugin-d")]
+        selected = [shards.select(paths, (index, 2)) for index in (1, 2)]
+
+        self.assertEqual(selected, [[0, 3], [1, 2]])
+        self.assertEqual(shards.select(paths, (1, 1)), [0, 1, 2, 3])
+        self.assertGreater(shards.cost(paths[0]), 40000)
+
+    def test_sharded_update(self):
+        self.__update("1/2")
+        self.__update("2/2", results_path="second.json")
+
+        for name in ("plugin-a", "plugin-b", "plugin-c", "plugin-d"):
+            self.assertIn("Version: 1.0.1", self.__read(name))
+
+        first, second = shards.Results.load("boo-results-1-of-2.json"), shards.Results.load("second.json")
+
+        self.assertEqual(first.shards, [(1, 2)])
+        self.assertEqual([result.name for result in first.results], ["plugin-a", "plugin-d"])
+        self.assertEqual([result.name for result in second.results], ["plugin-b", "plugin-c"])
+        self.assertEqual(first.results[0], shards.Result("plugin-a", os.path.join("plugin-a", "init.php"),
+                                                         "1.0.0", "1.0.1"))
+
+        merged = shards.Results.merge([second, first])
+
+        self.assertEqual(merged.shards, [(1, 2), (2, 2)])
+        self.assertEqual([result.name for result in merged.results], ["plugin-a", "plugin-b", "plugin-c", "plugin-d"])
+
+    def test_shard_commit(self):
+        from commands import MultiUpdateCommand
+
+        with self.assertRaises(exceptions.BooException):
+            MultiUpdateCommand([self.path], "0.0.1", "0.0.0", [], [], "outline", True, None, shard="1/2")
+
+    def test_merge_incomplete(self):
+        first = shards.Results([], [(1, 3)])
+        third = shards.Results([], [(3, 3)])
+
+        with self.assertRaisesRegex(exceptions.BooException, "shards 2 of 3"):
+            shards.Results.merge([first, third])
+
+        with self.assertRaisesRegex(exceptions.BooException, "more than once"):
+            shards.Results.merge([first, first, shards.Results([], [(2, 3)]), third])
+
+        with self.assertRaisesRegex(exceptions.BooException, "different numbers"):
+            shards.Results.merge([first, shards.Results([], [(2, 2)])])
+
+    def test_apply(self):
+        results = shards.Results([
+            shards.Result("plugin-a", os.path.join("plugin-a", "init.php"), "1.0.0", "1.0.1"),
+            shards.Result("plugin-b", os.path.join("plugin-b", "init.php"), "1.0.0", "1.0.1"),
+            shards.Result("plugin-c", os.path.join("plugin-c", "init.php"), "0.9.0", "0.9.1"),
+            shards.Result("plugin-d", os.path.join("plugin-d", "init.php"), error="Version header does not exist"),
+        ])
+        self.__write("plugin-b", "init.php", "<?php\n/**\n * Plugin Name: plugin-b\n * Version: 1.0.1\n */\n")
+
+        applied = [updated for result, updated in results.apply()]
+
+        self.assertEqual(applied[0], {"plugin_name": "plugin-a", "old_version": "1.0.0", "new_version": "1.0.1"})
+        self.assertEqual(applied[1], {"plugin_name": "plugin-b", "old_version": "1.0.0", "new_version": "1.0.1"})
+        self.assertIsInstance(applied[2], exceptions.BooException)
+        self.assertEqual(str(applied[3]), "Version header does not exist")
+
+        self.assertIn("Version: 1.0.1", self.__read("plugin-a"))
+        self.assertIn("Version: 1.0.1", self.__read("plugin-b"))
+        self.assertIn("Version: 1.0.0", self.__read("plugin-c"))
+
+    def test_merge_results_command(self):
+        from commands import MergeResultsCommand
+
+        shards.Results([shards.Result("plugin-a", os.path.join("plugin-a", "init.php"), "1.0.0", "1.0.1")],
+                       [(1, 2)]).save("first.json")
+        shards.Results([shards.Result("plugin-c", os.path.join("plugin-c", "init.php"), "1.0.0", "1.0.1")],
+                       [(2, 2)]).save("second.json")
+
+        stdout = io.StringIO()
+
+        with redirect_stdout(stdout):
+            MergeResultsCommand(["first.json", "second.json"], output_format="ndjson").run()
+
+        self.assertEqual(stdout.getvalue().count("\"status\": \"updated\""), 2)
+        self.assertIn("Version: 1.0.0", self.__read("plugin-a"))
+
+        with self.assertRaises(exceptions.BooException):
+            MergeResultsCommand(["first.json"]).run()
+
+    def test_invalid_results(self):
+        self.__write(".", "results.json", "{\"version\": 99, \"shards\": [], \"results\": []}")
+
+        with self.assertRaises(exceptions.InvalidArgumentError):
+            shards.Results.load("results.json")
+
+        with self.assertRaises(exceptions.BooException):
+            shards.Results.load("missing.json")
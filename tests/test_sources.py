@@ -0,0 +1,154 @@
+import io
+import json
+import os
+import subprocess
+import unittest
+import zipfile
+from contextlib import redirect_stderr, redirect_stdout
+from tempfile import TemporaryDirectory
+
+import exceptions
+import sources
+
+
+class TestSources(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.path = os.path.join(self.test_dir.name, "plugins")
+        os.makedirs(self.path)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def __write(self, name: str, version: str, main_file: str = "init.php") -> None:
+        main_file_path = os.path.join(self.path, name, main_file)
+        os.makedirs(os.path.dirname(main_file_path), exist_ok=True)
+
+        with open(main_file_path, 'w') as f:
+            f.write(f"<?php\n/**\n * Plugin Name: {os.path.basename(name)}\n * Version: {version}\n */\n")
+
+    def __git(self, *args: str) -> None:
+        subprocess.check_output(["git", "-c", "user.name=boo", "-c", "user.email=boo@example.com", *args],
+                                cwd=self.path, stderr=subprocess.DEVNULL)
+
+    def __commit(self, tag: str) -> None:
+        self.__git("add", "--all")
+        self.__git("commit", "--quiet", "-m", tag)
+        self.__git("tag", tag)
+
+    def test_zip_records(self):
+        zip_directory = os.path.join(self.test_dir.name, "zips")
+        os.makedirs(zip_directory)
+
+        with zipfile.ZipFile(os.path.join(zip_directory, "first-10000.zip"), 'w', zipfile.ZIP_DEFLATED) as zip_file:
+            zip_file.writestr("first/index.php", "<?php\n/**\n * Plugin Name: First\n * Version: 1.0.0\n */\n")
+            zip_file.writestr("first/assets/init.php", "<?php\n")
+
+        with zipfile.ZipFile(os.path.join(zip_directory, "second-20300.zip"), 'w') as zip_file:
+            zip_file.writestr("second/init.php", "<?php\n/**\n * Plugin Name: Second\n * Version: 2.3.0\n */\n")
+
+        with open(os.path.join(zip_directory, "broken.zip"), 'w') as f:
+            f.write("not a zip file")
+
+        records = list(sources.zip_records(zip_directory))
+
+        self.assertEqual([(record.name, record.plugin_name, record.version, record.main_file) for record in records],
+                         [("first", "First", "1.0.0", "index.php"), ("second", "Second", "2.3.0", "init.php")])
+        self.assertEqual(records[0].path, os.path.join(zip_directory, "first-10000.zip", "first"))
+        self.assertEqual(len(list(sources.zip_records(os.path.join(zip_directory, "second-20300.zip")))), 1)
+
+    def test_unreadable_zip_files_are_skipped(self):
+        zip_directory = os.path.join(self.test_dir.name, "zips")
+        os.makedirs(zip_directory)
+        content = b"<?php\n/**\n * Plugin Name: Plugin\n * Version: 1.0.0\n */\n"
+
+        for name, compression in (("deflate64", zipfile.ZIP_STORED), ("corrupt", zipfile.ZIP_DEFLATED),
+                                  ("valid", zipfile.ZIP_DEFLATED)):
+            with zipfile.ZipFile(os.path.join(zip_directory, f"{name}.zip"), 'w', compression) as zip_file:
+                zip_file.writestr(f"{name}/init.php", content * 20)
+
+        with open(os.path.join(zip_directory, "deflate64.zip"), 'r+b') as f:
+            data = bytearray(f.read())
+            # Compression method 9 in the local file header and the central directory.
+            central_directory = data.index(b"PK\x01\x02")
+            data[8:10] = data[central_directory + 10:central_directory + 12] = (9).to_bytes(2, "little")
+            f.seek(0)
+            f.write(data)
+
+        with open(os.path.join(zip_directory, "corrupt.zip"), 'r+b') as f:
+            f.seek(30 + len("corrupt/init.php"))
+            f.write(b"\xff" * 8)
+
+        stderr = io.StringIO()
+
+        with redirect_stderr(stderr):
+            records = list(sources.zip_records(zip_directory))
+
+        self.assertEqual([record.name for record in records], ["valid"])
+        self.assertIn("corrupt.zip", stderr.getvalue())
+        self.assertIn("deflate64.zip", stderr.getvalue())
+
+    def test_ref_records(self):
+        self.__git("init", "--quiet")
+        self.__write("alpha", "1.0.0")
+        self.__write(os.path.join("group", "beta"), "2.0.0", "index.php")
+        self.__write(os.path.join("alpha", "nested"), "9.0.0")
+        self.__write(os.path.join("vendor", "lib"), "1.0.0")
+        self.__commit("v1")
+
+        self.__write("alpha", "1.1.0")
+
+        records = list(sources.ref_records(self.path, "v1"))
+        self.assertEqual([(record.name, record.version) for record in records], [("alpha", "1.0.0")])
+        self.assertEqual(records[0].full_path, os.path.join(os.path.abspath(self.path), "alpha"))
+
+        records = list(sources.ref_records(self.path, "v1", depth=2))
+        self.assertEqual([(record.name, record.version, record.main_file) for record in records],
+                         [("alpha", "1.0.0", "init.php"), ("beta", "2.0.0", "index.php")])
+
+        with self.assertRaises(exceptions.BooException):
+            list(sources.ref_records(self.path, "missing"))
+
+    def test_diff_versions(self):
+        from commands import DiffVersionsCommand
+
+        self.__git("init", "--quiet")
+        self.__write("alpha", "1.0.0")
+        self.__write("beta", "2.0.0")
+        self.__write("gamma", "3.0.0")
+        self.__commit("v1")
+
+        self.__write("alpha", "1.1.0")
+        self.__write("beta", "1.9.0")
+        self.__write("delta", "1.0.0")
+        self.__git("rm", "--quiet", "-r", "gamma")
+        self.__commit("v2")
+
+        with redirect_stdout(io.StringIO()) as stdout:
+            DiffVersionsCommand("v1", "v2", self.path, output_format="json").run()
+
+        self.assertEqual([(row["name"], row["change"], row["old_version"], row["new_version"])
+                          for row in json.loads(stdout.getvalue())],
+                         [("alpha", "upgraded", "1.0.0", "1.1.0"), ("beta", "downgraded", "2.0.0", "1.9.0"),
+                          ("delta", "added", None, "1.0.0"), ("gamma", "removed", "3.0.0", None)])
+
+    def test_versions_of_a_ref(self):
+        from commands import VersionsCommand
+
+        self.__git("init", "--quiet")
+        self.__write("alpha", "1.0.0")
+        self.__commit("v1")
+        self.__write("alpha", "2.0.0")
+
+        with redirect_stdout(io.StringIO()) as stdout:
+            VersionsCommand(self.path, output_format="ndjson", ref="v1").run()
+
+        self.assertEqual(json.loads(stdout.getvalue())["version"], "1.0.0")
+
+        with self.assertRaises(exceptions.BooException):
+            VersionsCommand(self.path, ref="v1", strict=True).run()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,148 @@
+import io
+import os
+import subprocess
+import time
+import unittest
+from contextlib import redirect_stdout
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import exceptions
+import git
+import updates
+
+
+class TestUpdateCheck(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.remote_path = os.path.join(self.test_dir.name, "remote.git")
+        self.repo_path = os.path.join(self.test_dir.name, "boo")
+        self.publisher_path = os.path.join(self.test_dir.name, "publisher")
+        self.cache_path = os.path.join(self.test_dir.name, "cache")
+
+        self.__git(self.test_dir.name, "init", "--quiet", "--bare", "--initial-branch=main", self.remote_path)
+        self.__git(self.test_dir.name, "clone", "--quiet", self.remote_path, self.publisher_path)
+        self.__publish("Initial commit")
+        self.__git(self.test_dir.name, "clone", "--quiet", self.remote_path, self.repo_path)
+
+        self.environment = mock.patch.dict(os.environ, {"XDG_CACHE_HOME": self.cache_path})
+        self.environment.start()
+
+    def tearDown(self):
+        self.environment.stop()
+        self.test_dir.cleanup()
+
+    @staticmethod
+    def __git(path: str, *args: str) -> str:
+        return subprocess.check_output(["git", *args], cwd=path, stderr=subprocess.DEVNULL).decode()
+
+    def __publish(self, message: str) -> None:
+        self.__git(self.publisher_path, "-c", "user.name=boo", "-c", "user.email=boo@example.com",
+                   "commit", "--quiet", "--allow-empty", "-m", message)
+        self.__git(self.publisher_path, "push", "--quiet", "origin", "HEAD:main")
+
+    def __check(self, **kwargs) -> updates.UpdateCheck:
+        return updates.UpdateCheck(self.repo_path, **kwargs)
+
+    def test_cache_directory(self):
+        self.assertEqual(updates.cache_directory(), os.path.join(self.cache_path, "boo"))
+
+    def test_refresh_finds_new_commits(self):
+        check = self.__check()
+
+        self.assertFalse(check.refresh().available)
+
+        self.__publish("New feature")
+        status = check.refresh()
+
+        self.assertTrue(status.available)
+        self.assertIsNone(status.error)
+        self.assertEqual(check.cached(), status)
+
+    def test_fresh_status_is_answered_from_the_cache(self):
+        check = self.__check()
+        first, refreshing = check.check()
+
+        self.__publish("New feature")
+
+        with mock.patch.object(git.Git, "fetch") as fetch:
+            status, refreshing = check.check()
+
+        fetch.assert_not_called()
+        self.assertEqual(status, first)
+        self.assertFalse(refreshing)
+
+    def test_stale_status_is_refreshed_in_the_background(self):
+        check = self.__check(ttl=0)
+        first = check.refresh()
+
+        self.__publish("New feature")
+
+        processes = []
+        refresh_in_background = check.refresh_in_background
+
+        def background():
+            processes.append(refresh_in_background())
+            return processes[-1]
+
+        with mock.patch.object(check, "refresh_in_background", side_effect=background):
+            status, refreshing = check.check()
+
+        self.assertEqual(status, first)
+        self.assertTrue(refreshing)
+        self.assertEqual(processes[0].wait(timeout=30), 0)
+        self.assertTrue(check.cached().available)
+        self.assertGreater(check.cached().checked, first.checked)
+
+    def test_slow_remote_times_out(self):
+        self.__git(self.repo_path, "config", "remote.origin.uploadpack", "sleep 30; git-upload-pack")
+        check = self.__check(timeout=0.5)
+
+        started = time.monotonic()
+        status = check.refresh()
+
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertIn("timed out", status.error)
+        self.assertFalse(status.available)
+        self.assertEqual(check.cached(), status)
+
+    def test_unreadable_cache_is_ignored(self):
+        check = self.__check()
+        os.makedirs(check.directory)
+
+        with open(check.cache_path, 'w') as f:
+            f.write("{")
+
+        self.assertIsNone(check.cached())
+
+    def test_check_updates_command(self):
+        from commands import CheckUpdatesCommand
+
+        self.__publish("New feature")
+
+        with redirect_stdout(io.StringIO()) as stdout:
+            CheckUpdatesCommand(self.repo_path).run()
+
+        self.assertIn("boo has new updates!", stdout.getvalue())
+
+        self.__git(self.repo_path, "config", "remote.origin.uploadpack", "false")
+
+        with self.assertRaises(exceptions.BooException):
+            CheckUpdatesCommand(self.repo_path, refresh=True).run()
+
+    def test_upgrade_command_pulls_and_updates_the_cache(self):
+        from commands import UpgradeCommand
+
+        self.__publish("New feature")
+
+        with redirect_stdout(io.StringIO()) as stdout:
+            UpgradeCommand(self.repo_path).run()
+
+        self.assertIn("Update complete!", stdout.getvalue())
+        self.assertEqual(self.__git(self.repo_path, "log", "-1", "--format=%s").strip(), "New feature")
+        self.assertFalse(self.__check().cached().available)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import os
+import sys
+import unittest
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import exceptions
+import validation
+import versioning
+
+
+class TestValidation(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.path = os.path.join(self.test_dir.name, "plugin")
+        os.makedirs(self.path)
+        validation.clear()
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def __write(self, main_file: str, content: str) -> str:
+        main_file_path = os.path.join(self.path, main_file)
+
+        with open(main_file_path, 'w') as f:
+            f.write(content)
+
+        return main_file_path
+
+    def test_valid_header(self):
+        self.__write("init.php", "<?php\n/**\n * Plugin Name: Plugin\n * Version: 1.0.0\n */\n")
+
+        self.assertTrue(validation.validate(self.path))
+
+    def test_index_php_main_file(self):
+        self.__write("index.php", "<?php\n/**\n * Plugin Name: Plugin\n * Version: 1.0.0\n */\n")
+
+        self.assertTrue(validation.validate(self.path))
+
+    def test_invalid_plugins(self):
+        self.assertFalse(validation.validate(self.path))
+        self.assertFalse(validation.validate(os.path.join(self.path, "missing")))
+
+        self.__write("init.php", "<?php\n/**\n * Plugin Name: Plugin\n */\n")
+        self.assertFalse(validation.validate(self.path))
+
+    def test_first_main_file_decides(self):
+        self.__write("init.php", "<?php\n/**\n * Version: 1.0.0\n */\n")
+        self.__write("index.php", "<?php\n/**\n * Plugin Name: Plugin\n * Version: 1.0.0\n */\n")
+
+        self.assertFalse(validation.validate(self.path))
+
+    def test_results_are_memoized_by_signature(self):
+        main_file_path = self.__write("init.php", "<?php\n/**\n * Plugin Name: Plugin\n * Version: 1.0.0\n */\n")
+
+        with mock.patch.object(versioning, "read_header", wraps=versioning.read_header) as read_header:
+            self.assertTrue(validation.validate(self.path))
+            self.assertTrue(validation.validate(self.path))
+            self.assertEqual(read_header.call_count, 1)
+
+            with open(main_file_path, 'w') as f:
+                f.write("<?php\n/**\n * Plugin Name: Plugin without a version header\n */\n")
+
+            self.assertFalse(validation.validate(self.path))
+            self.assertEqual(read_header.call_count, 2)
+
+    def test_strict_requires_wppcpy(self):
+        self.__write("init.php", "<?php\n/**\n * Plugin Name: Plugin\n * Version: 1.0.0\n */\n")
+
+        with mock.patch.dict(sys.modules, {"wppcpy": None}), self.assertRaises(exceptions.BooException):
+            validation.validate(self.path, strict=True)
+
+    def test_strict_uses_the_actual_main_file(self):
+        self.__write("index.php", "<?php\n/**\n * Plugin Name: Plugin\n * Version: 1.0.0\n */\n")
+        wppcpy = mock.MagicMock()
+        wppcpy.constraints.file.MainFile.return_value.validate.return_value = True
+        wppcpy.constraints.header.PluginName.return_value.validate.return_value = True
+        wppcpy.constraints.header.Version.return_value.validate.return_value = True
+
+        with mock.patch.dict(sys.modules, {"wppcpy": wppcpy}):
+            self.assertTrue(validation.validate(self.path, strict=True))
+
+        wppcpy.constraints.file.MainFile.assert_called_once_with(self.path, files="index.php")
+        wppcpy.constraints.header.Version.assert_called_once_with(self.path, main_file_name="index.php")
+
+
+if __name__ == '__main__':
+    unittest.main()
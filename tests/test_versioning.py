@@ -0,0 +1,245 @@
+import os
+import random
+import stat
+import unittest
+from tempfile import TemporaryDirectory
+
+import exceptions
+import versioning
+
+MAIN_FILE_CONTENT = """<?php
+/**
+ * Plugin Name: Test Plugin
+ * Version:     1.0.0
+ */
+
+/*
+ * Version: 1.0.0 of the bundled library.
+ */
+"""
+
+
+class TestSetVersionToFile(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.main_file_path = os.path.join(self.test_dir.name, 'init.php')
+
+        with open(self.main_file_path, 'w') as f:
+            f.write(MAIN_FILE_CONTENT)
+
+        os.chmod(self.main_file_path, 0o640)
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def __content(self) -> str:
+        with open(self.main_file_path, 'r') as f:
+            return f.read()
+
+    def test_same_length_is_patched_in_place(self):
+        inode = os.stat(self.main_file_path).st_ino
+
+        versioning.set_version_to_file(self.main_file_path, "1.0.1")
+
+        self.assertEqual(self.__content(), MAIN_FILE_CONTENT.replace("Version:     1.0.0", "Version:     1.0.1"))
+        self.assertEqual(os.stat(self.main_file_path).st_ino, inode)
+
+    def test_different_length_is_replaced(self):
+        versioning.set_version_to_file(self.main_file_path, "1.0.10")
+
+        self.assertEqual(self.__content(), MAIN_FILE_CONTENT.replace("Version:     1.0.0", "Version:     1.0.10"))
+        self.assertEqual(stat.S_IMODE(os.stat(self.main_file_path).st_mode), 0o640)
+        self.assertEqual(os.listdir(self.test_dir.name), ['init.php'])
+
+    def test_body_occurrences_are_kept(self):
+        versioning.set_version_to_file(self.main_file_path, "2.0.0")
+
+        self.assertIn(" * Version: 1.0.0 of the bundled library.", self.__content())
+
+    def test_header_outside_header_region(self):
+        with open(self.main_file_path, 'w') as f:
+            f.write("<?php\n" + "//\n" * versioning.HEADER_SIZE + MAIN_FILE_CONTENT)
+
+        with self.assertRaises(exceptions.SearchNotFound):
+            versioning.set_version_to_file(self.main_file_path, "2.0.0")
+
+
+class TestReadHeader(unittest.TestCase):
+
+    def setUp(self):
+        self.test_dir = TemporaryDirectory()
+        self.main_file_path = os.path.join(self.test_dir.name, 'init.php')
+
+    def tearDown(self):
+        self.test_dir.cleanup()
+
+    def __write(self, content: str) -> None:
+        with open(self.main_file_path, 'w') as f:
+            f.write(content)
+
+    def test_read_header(self):
+        self.__write(MAIN_FILE_CONTENT + "<?php echo 'body';\n" * 10000)
+
+        self.assertEqual(versioning.read_header(self.main_file_path), {
+            "Plugin Name": "Test Plugin",
+            "Version": "1.0.0",
+        })
+        self.assertEqual(versioning.extract_version_from_file(self.main_file_path), "1.0.0")
+
+    def test_value_across_chunks(self):
+        prefix = "<?php\n/**\n * Plugin Name: Test Plugin\n"
+        padding = " *" + " " * (versioning.HEADER_CHUNK_SIZE - len(prefix) - len(" * Version: 1.") - 3) + "\n"
+        self.__write(prefix + padding + " * Version: 1.22.333\n */\n")
+
+        self.assertEqual(versioning.read_header(self.main_file_path)["Version"], "1.22.333")
+
+    def test_header_outside_header_region(self):
+        self.__write("<?php\n" + "//\n" * versioning.HEADER_SIZE + MAIN_FILE_CONTENT)
+
+        self.assertEqual(versioning.read_header(self.main_file_path), {"Plugin Name": None, "Version": None})
+
+        with self.assertRaises(exceptions.SearchNotFound):
+            versioning.extract_version_from_file(self.main_file_path)
+
+    def test_parse_header_matches_read_header(self):
+        for content in (MAIN_FILE_CONTENT + "<?php echo 'body';\n" * 1000,
+                        "<?php\n" + "//\n" * versioning.HEADER_SIZE + MAIN_FILE_CONTENT):
+            self.__write(content)
+
+            self.assertEqual(versioning.parse_header(content.encode()), versioning.read_header(self.main_file_path))
+
+    def test_read_other_header_fields(self):
+        self.__write("<?php\n/**\n * Plugin Name: Plugin\n * Version: 1.0.0\n * Requires PHP: 8.1\n"
+                     " * requires at least: 6.2 */\n")
+
+        self.assertEqual(versioning.read_header(self.main_file_path, ("Requires PHP", "Requires at least", "Author")),
+                         {"Requires PHP": "8.1", "Requires at least": "6.2", "Author": None})
+
+
+def legacy_to_int(version: str) -> int:
+    """The packing both version implementations used before `VersionNumber`."""
+    return sum(int(piece) * factor for piece, factor in zip(version.split('.'), [10000, 100, 1]))
+
+
+def legacy_to_str(version: int) -> str:
+    return f"{version // 10000}.{version % 10000 // 100}.{version % 100}"
+
+
+def random_version(rng: random.Random) -> str:
+    components = [rng.randint(0, 999), rng.randint(0, 99), rng.randint(0, 99)][:rng.randint(1, 3)]
+
+    return ".".join(str(component) for component in components)
+
+
+class TestVersionNumber(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(8192)
+
+    def test_matches_legacy_packing(self):
+        for _ in range(2000):
+            version = random_version(self.rng)
+            number = versioning.VersionNumber.parse(version)
+
+            self.assertEqual(int(number), legacy_to_int(version))
+            self.assertEqual(str(number), legacy_to_str(legacy_to_int(version)))
+            self.assertEqual(versioning.VersionNumber.parse(str(number)), number)
+
+    def test_arithmetic_and_ordering_match_integers(self):
+        for _ in range(2000):
+            a, b = random_version(self.rng), random_version(self.rng)
+            x, y = versioning.VersionNumber.parse(a), versioning.VersionNumber.parse(b)
+
+            self.assertEqual(str(x + b), legacy_to_str(legacy_to_int(a) + legacy_to_int(b)))
+            self.assertEqual(x < y, legacy_to_int(a) < legacy_to_int(b))
+            self.assertEqual(x == y, hash(x) == hash(y) and legacy_to_int(a) == legacy_to_int(b))
+
+            if x >= y:
+                self.assertEqual(str(x - y), legacy_to_str(legacy_to_int(a) - legacy_to_int(b)))
+            else:
+                with self.assertRaises(exceptions.InvalidArgumentError):
+                    x - y
+
+    def test_carry(self):
+        self.assertEqual(versioning.VersionNumber.parse("1.0.99") + "0.0.1", versioning.VersionNumber.of(1, 1, 0))
+
+    def test_bounds(self):
+        for version in ("1.100.0", "1.0.100", "100000.0.0", "1.0.0.0", "1.0.0-beta", "", "v1"):
+            with self.assertRaises(exceptions.InvalidArgumentError, msg=version):
+                versioning.VersionNumber.parse(version)
+
+        with self.assertRaises(exceptions.InvalidArgumentError):
+            versioning.VersionNumber(versioning.VersionNumber.MAX + 1)
+
+    def test_versions_command_reports_out_of_bounds_versions(self):
+        import io
+        import json
+        from contextlib import redirect_stdout
+
+        from commands import VersionsCommand
+        from version import Version
+
+        self.assertEqual(Version.to_int("1.100.0"), 0)
+
+        with self.assertRaises(exceptions.InvalidArgumentError):
+            Version.to_int("1.100.0", strict=True)
+
+        with TemporaryDirectory() as path:
+            for name, version in (("first", "1.2.3"), ("second", "4.1.0.2"), ("third", "1.100.0")):
+                os.makedirs(os.path.join(path, name))
+
+                with open(os.path.join(path, name, "init.php"), 'w') as f:
+                    f.write(f"<?php\n/**\n * Plugin Name: {name}\n * Version: {version}\n */\n")
+
+            stdout = io.StringIO()
+
+            with redirect_stdout(stdout):
+                VersionsCommand(path, cache=False, output_format="ndjson").run()
+
+        records = [json.loads(line) for line in stdout.getvalue().splitlines()]
+
+        self.assertEqual([(record["version_int"], record["error"]) for record in records],
+                         [(10203, None), (None, "Invalid version '4.1.0.2'"), (None, "Version minor 100 is out of range 0-99")])
+
+    def test_immutable(self):
+        number = versioning.VersionNumber.parse("1.2.3")
+
+        with self.assertRaises(AttributeError):
+            number.major = 2
+
+        self.assertEqual((number.major, number.minor, number.micro), (1, 2, 3))
+        self.assertEqual(len({number, versioning.VersionNumber.of(1, 2, 3)}), 1)
+
+
+class TestVersionColumn(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = random.Random(1024)
+
+    def test_matches_scalar_operations(self):
+        for size in (10, versioning.VECTORIZE_THRESHOLD + 10):
+            versions = [random_version(self.rng) for _ in range(size)] + ["1.0.0-beta", "1.100.0", "0.0.1"]
+            delta = self.rng.randint(-20000, 20000)
+
+            column = versioning.VersionColumn.parse(versions)
+            bumped = column.bump(delta)
+
+            for version, old, new, formatted, sign in zip(
+                    versions, column, bumped, bumped.format(), column.compare(bumped)):
+                try:
+                    expected = versioning.VersionNumber.parse(version)
+                except exceptions.InvalidArgumentError:
+                    self.assertEqual((old, new, formatted), (None, None, None))
+                    continue
+
+                self.assertEqual(old, expected)
+
+                if int(expected) + delta < 0:
+                    self.assertIsNone(new)
+                    self.assertIsNone(formatted)
+                    self.assertEqual(sign, 1)
+                else:
+                    self.assertEqual(int(new), int(expected) + delta)
+                    self.assertEqual(formatted, str(new))
+                    self.assertEqual(sign, (delta < 0) - (delta > 0))
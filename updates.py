@@ -0,0 +1,153 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import NamedTuple, Optional, Tuple
+
+import git
+import helpers
+
+DEFAULT_TTL = 3600.0
+DEFAULT_TIMEOUT = 10.0
+SCHEMA_VERSION = 1
+
+
+def cache_directory() -> str:
+    """Return `$XDG_CACHE_HOME/boo`, `~/.cache/boo` by default."""
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "boo")
+
+
+class Status(NamedTuple):
+    """
+    Result of the last update check of a repository.
+    """
+    checked: float
+    local: Optional[str] = None
+    remote: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def available(self) -> bool:
+        return self.error is None and self.local != self.remote
+
+
+class UpdateCheck:
+    """
+    Checks a repository for new commits on its upstream, caching the answer for a TTL.
+
+    Fetches run with a hard timeout. A fresh cached answer is returned without starting any process, a stale one
+    is returned as well while a detached process refreshes it, and only a repository that was never checked is
+    fetched in the foreground.
+    """
+
+    def __init__(self, repo_path: str, ttl: float = DEFAULT_TTL, timeout: float = DEFAULT_TIMEOUT,
+                 directory: Optional[str] = None) -> None:
+        """
+        :param repo_path: The path to the Git repository.
+        :param ttl: Seconds a cached answer is fresh.
+        :param timeout: Seconds after which a fetch is killed.
+        :param directory: Cache directory. Default: `cache_directory()`.
+        """
+        self.repo_path: str = os.path.abspath(repo_path)
+        self.ttl: float = ttl
+        self.timeout: float = timeout
+        self.directory: str = directory or cache_directory()
+
+        key = hashlib.sha1(self.repo_path.encode()).hexdigest()[:16]
+        self.cache_path: str = os.path.join(self.directory, f"updates-{key}.json")
+        self.lock_path: str = f"{self.cache_path}.lock"
+
+    def check(self) -> Tuple[Status, bool]:
+        """
+        :return: (status, whether a background refresh was started for a stale status)
+        """
+        status = self.cached()
+
+        if status is None:
+            return self.refresh(), False
+
+        if self.fresh(status):
+            return status, False
+
+        return status, self.refresh_in_background() is not None
+
+    def cached(self) -> Optional[Status]:
+        """
+        :return: The cached status, None when the repository was never checked or the cache is unreadable.
+        """
+        try:
+            with open(self.cache_path, 'r') as file:
+                data = json.load(file)
+
+            if data.get("schema") != SCHEMA_VERSION or data.get("repository") != self.repo_path:
+                return None
+
+            return Status(**data["status"])
+        except (OSError, ValueError, TypeError, KeyError, AttributeError):
+            return None
+
+    def fresh(self, status: Status) -> bool:
+        return time.time() - status.checked < self.ttl
+
+    def refresh(self, blocking: bool = True) -> Optional[Status]:
+        """
+        Fetch and cache the result. Failures are cached too, so that callers within the TTL do not wait on an
+        unreachable remote again.
+
+        :param blocking: Wait for a refresh running in another process instead of returning None.
+        """
+        with self.__lock(blocking) as locked:
+            if not locked:
+                return None
+
+            status = self.__fetch()
+            self.store(status)
+
+        return status
+
+    def refresh_in_background(self) -> Optional[subprocess.Popen]:
+        """
+        Start a detached process that refreshes the cache, unless a refresh is already running.
+
+        :return: The started process, None when another refresh holds the lock.
+        """
+        with self.__lock(blocking=False) as locked:
+            if not locked:
+                return None
+
+        return subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), self.repo_path, str(self.timeout), self.directory],
+            stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+        )
+
+    def store(self, status: Status) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        data = {"schema": SCHEMA_VERSION, "repository": self.repo_path, "status": status._asdict()}
+
+        helpers.atomic_write(self.cache_path, [json.dumps(data).encode()])
+
+    def __fetch(self) -> Status:
+        try:
+            git.Git.fetch(self.repo_path, self.timeout)
+            local, remote = git.Git.rev_parse(self.repo_path, "@{0}", "@{u}")
+        except subprocess.TimeoutExpired:
+            return Status(time.time(), error=f"Fetching from the remote timed out after {self.timeout:g} seconds")
+        except subprocess.CalledProcessError as e:
+            return Status(time.time(), error=f"An error occurred while executing a Git command: {e}")
+
+        return Status(time.time(), local, remote)
+
+    def __lock(self, blocking: bool) -> helpers.FileLock:
+        os.makedirs(self.directory, exist_ok=True)
+        return helpers.FileLock(self.lock_path, blocking)
+
+
+def _refresh(repo_path: str, timeout: str, directory: str) -> None:
+    """Entry point of the background refresh process."""
+    UpdateCheck(repo_path, timeout=float(timeout), directory=directory).refresh(blocking=False)
+
+
+if "__main__" == __name__:
+    _refresh(*sys.argv[1:])
@@ -0,0 +1,97 @@
+import os
+import stat
+import threading
+from typing import Dict, Optional, Tuple
+
+import exceptions
+import index
+import versioning
+from helpers import MAIN_FILES
+
+# Headers a valid plugin must have, both are read by a single bounded header parse.
+REQUIRED_HEADERS = ("Plugin Name", "Version")
+
+_results: Dict[Tuple[str, bool], Tuple[index.Signature, bool]] = {}
+_lock = threading.Lock()
+
+
+def validate(path: str, strict: bool = False) -> bool:
+    """
+    Check that a directory is a plugin: its main file, the first existing file of `MAIN_FILES`, has a non-empty
+    'Plugin Name' and 'Version' header.
+
+    Results are memoized for the process by the stat signature of the main file, so validating an unchanged
+    plugin again costs a single `stat` per main file candidate.
+
+    :param path: Plugin directory path.
+    :param strict: Validate with the `wppcpy` constraints instead of the built-in header check.
+    :raise BooException: Strict validation was requested but `wppcpy` is not installed.
+    """
+    main_file_path, signature = _main_file(path)
+
+    if main_file_path is None:
+        return False
+
+    key = (main_file_path, strict)
+
+    with _lock:
+        cached = _results.get(key)
+
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    valid = _validate_strict(path, os.path.basename(main_file_path)) if strict else _validate_header(main_file_path)
+
+    with _lock:
+        _results[key] = (signature, valid)
+
+    return valid
+
+
+def clear() -> None:
+    """Forget every memoized result."""
+    with _lock:
+        _results.clear()
+
+
+def _main_file(path: str) -> Tuple[Optional[str], Optional[index.Signature]]:
+    for main_file in MAIN_FILES:
+        main_file_path = os.path.join(path, main_file)
+
+        try:
+            stat_result = os.stat(main_file_path)
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+
+        if stat.S_ISREG(stat_result.st_mode):
+            return main_file_path, index.signature(stat_result)
+
+    return None, None
+
+
+def _validate_header(main_file_path: str) -> bool:
+    try:
+        header = versioning.read_header(main_file_path, REQUIRED_HEADERS)
+    except IOError:
+        return False
+
+    return all(header[field] for field in REQUIRED_HEADERS)
+
+
+def _validate_strict(path: str, main_file: str) -> bool:
+    try:
+        import wppcpy
+    except ImportError:
+        raise exceptions.BooException("Strict validation requires the 'wppcpy' package, install it with "
+                                      "'pip install wppcpy'.")
+
+    constraints = [
+        wppcpy.constraints.file.MainFile(path, files=main_file),
+        wppcpy.constraints.header.PluginName(path, main_file_name=main_file),
+        wppcpy.constraints.header.Version(path, main_file_name=main_file),
+    ]
+
+    try:
+        return all(constraint.validate() for constraint in constraints)
+    except wppcpy.exceptions.base.PcpyException:
+        return False
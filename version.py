@@ -1,17 +1,13 @@
-import os.path
-import re
 from typing import List, Union
 
 import exceptions
-import file
+import versioning
 
 
 class Version:
-    FACTORS = [10000, 100, 1]
     PATTERN = r'\* Version:\s*([^\s\*]+)'
 
     def __init__(self, plugin: str):
-        file.Plugin.validate(os.path.dirname(plugin))
         self._plugin = plugin
 
     def __str__(self) -> str:
@@ -25,64 +21,34 @@ class Version:
         return self._plugin
 
     @classmethod
-    def add(cls, versions: List[Union[str, int]]):
-        refactored = [cls.to_int(version) if isinstance(version, str) else version for version in versions]
-
-        if refactored:
-            versions = refactored
-
-        return sum(versions)
+    def add(cls, versions: List[Union[str, int]]) -> int:
+        return sum(int(versioning.VersionNumber.coerce(version)) if isinstance(version, str) else version
+                   for version in versions)
 
     @classmethod
-    def to_int(cls, version: str) -> int:
-        pieces = version.split('.')
-        result = 0
-
+    def to_int(cls, version: str, strict: bool = False) -> int:
+        """
+        :param strict: Raise instead of returning 0 when the version cannot be parsed.
+        :return: The packed version, 0 when the version cannot be parsed.
+        :raise InvalidArgumentError: The version cannot be parsed, with `strict`.
+        """
         try:
-            for index, piece in enumerate(pieces):
-                result += int(piece) * cls.FACTORS[index]
-        except Exception:
-            result = 0
+            return int(versioning.VersionNumber.parse(version))
+        except exceptions.InvalidArgumentError:
+            if strict:
+                raise
 
-        return result
+            return 0
 
     @classmethod
     def to_str(cls, version: int) -> str:
-        if version <= 0:
-            exceptions.InvalidArgumentError(f"Version must be greater than 0")
-
-
-        components = []
-        remaining_value = version
-
-        for factor in Version.FACTORS:
-            component = remaining_value // factor
-            components.append(str(component))
-
-            remaining_value %= factor
-
-        return ".".join(components)
+        return str(versioning.VersionNumber(version))
 
     def extract(self):
         try:
-            with open (self._plugin, 'r') as plugin:
-                content = plugin.read()
-                match = re.search(self.PATTERN, content)
-
-                if match:
-                    return match.group(1)
+            return versioning.read_header(self._plugin, ("Version",))["Version"]
         except IOError as e:
             raise exceptions.BooException(f"An error occurred while reading the '{self._plugin}': {e}")
 
     def update(self, version: str):
-        plugin = file.Plugin(os.path.dirname(self._plugin))
-
-        content = plugin.content()
-
-        content = re.sub(
-            Version.PATTERN,
-            f"* Version: {version}",
-            content
-        )
-
-        plugin.update(content)
\ No newline at end of file
+        versioning.set_version_to_file(self._plugin, version)
@@ -2,17 +2,60 @@ from warnings import catch_warnings
 
 import exceptions
 import helpers
+import os
+import profiling
 import re
+import shutil
+from array import array
+from functools import lru_cache, total_ordering
+from typing import BinaryIO, Iterable, Iterator, List, Optional, Pattern, Tuple, Union
 
 from exceptions import BooException
 
+# WordPress only looks for plugin headers in the first 8 KB of the main file.
+HEADER_SIZE = 8192
+HEADER_CHUNK_SIZE = 1024
+COPY_CHUNK_SIZE = 65536
+
 VERSION_COMPONENTS = {
     "major": 10000,
     "minor": 100,
     "micro": 1
 }
 
+# Bounds of every component. Minor and micro are limited by their packing factor, major keeps packed values far
+# below the 64-bit array range so that bumping two bounded versions can never overflow.
+VERSION_BOUNDS = {
+    "major": 99999,
+    "minor": 99,
+    "micro": 99
+}
+
+# Columns of at least this many versions are bumped and compared with NumPy when it is installed.
+VECTORIZE_THRESHOLD = 256
+
 VERSION_PATTERN = r'\* Version:\s*([^\s\*]+)'
+PLUGIN_NAME_PATTERN = r'Plugin Name:\s*([^\r\n\*]+)'
+
+VERSION_BYTES_REGEX = re.compile(VERSION_PATTERN.encode())
+DOT_NOTATION_REGEX = re.compile(r'(\d+)(?:\.(\d+))?(?:\.(\d+))?')
+
+HEADER_REGEXES = {
+    "Plugin Name": re.compile(PLUGIN_NAME_PATTERN.encode()),
+    "Version": VERSION_BYTES_REGEX,
+}
+
+
+@lru_cache(maxsize=None)
+def header_regex(field: str) -> Pattern:
+    """
+    :param field: A key of `HEADER_REGEXES`, or any other header field, e.g. `Requires PHP`, which is matched
+                  case-insensitively at the start of a comment line as WordPress matches it.
+    """
+    if field in HEADER_REGEXES:
+        return HEADER_REGEXES[field]
+
+    return re.compile(rb"(?im)^[ \t/*#@]*" + re.escape(field.encode()) + rb":[ \t]*([^\r\n*]*)")
 
 
 def extract_versions(plugin_absolute_paths: list) -> dict:
@@ -30,57 +73,378 @@ def extract_versions(plugin_absolute_paths: list) -> dict:
 
 def extract_version_from_file(path: str) -> str:
     try:
-        with open(path, 'r') as file:
-            content = file.read()
-            match = re.search(VERSION_PATTERN, content)
-            if match:
-                return match.group(1)
-            raise exceptions.SearchNotFound
+        version = read_header(path, ("Version",))["Version"]
     except IOError as e:
         raise exceptions.BooException(f"An error occurred while reading the file {path}: {e}")
 
+    if version is None:
+        raise exceptions.SearchNotFound
+
+    return version
+
+
+def read_header(path: str, fields: Iterable[str] = tuple(HEADER_REGEXES)) -> dict:
+    """
+    Read header values from the header region of a main file.
+
+    The file is read in `HEADER_CHUNK_SIZE` chunks, never past `HEADER_SIZE` bytes, and reading stops as soon as
+    every requested field has been found.
+
+    :param path: Main file path.
+    :param fields: Header fields to read, see `header_regex`.
+    :return: Values by field, None for fields that were not found.
+    """
+    header = {field: None for field in fields}
+    buffer = b""
+
+    with open(path, 'rb') as file:
+        while True:
+            chunk = file.read(min(HEADER_CHUNK_SIZE, HEADER_SIZE - len(buffer)))
+            buffer += chunk
+            complete = not chunk or len(buffer) >= HEADER_SIZE
+
+            for field in [field for field, value in header.items() if value is None]:
+                match = header_regex(field).search(buffer)
+
+                # A match touching the end of the buffer may continue in the next chunk.
+                if match and (complete or match.end() < len(buffer)):
+                    header[field] = match.group(1).decode(errors='replace').strip()
+
+            if complete or all(value is not None for value in header.values()):
+                profiling.count("bytes_read", len(buffer))
+                return header
+
+
+def parse_header(content: bytes, fields: Iterable[str] = tuple(HEADER_REGEXES)) -> dict:
+    """
+    Read header values from main file content that is already in memory, e.g. a zip member or a Git blob. Only
+    the first `HEADER_SIZE` bytes are searched, as `read_header` does.
+
+    :param content: Main file content, or at least its first `HEADER_SIZE` bytes.
+    :param fields: Header fields to read, see `header_regex`.
+    :return: Values by field, None for fields that were not found.
+    """
+    header = content[:HEADER_SIZE]
+    matches = {field: header_regex(field).search(header) for field in fields}
+
+    return {field: match.group(1).decode(errors='replace').strip() if match else None
+            for field, match in matches.items()}
+
 
 def set_version_to_file(path: str, dn_version: str) -> None:
+    """
+    Replace the value of the first 'Version' header found in the header region of a main file.
+
+    Only the first `HEADER_SIZE` bytes are searched, so later '* Version:' occurrences in the body are left
+    untouched. A value of the same length is patched in place, otherwise the file is streamed through a
+    temporary file that replaces the original atomically.
+    """
+    start, end, stat = locate_version(path)
+    write_version(path, start, end, dn_version)
+
+
+def locate_version(path: str) -> Tuple[int, int, os.stat_result]:
+    """
+    Find the byte range of the first 'Version' header value in the header region of a main file.
+
+    :return: (start, end, stat result of the file taken while it was open)
+    """
     try:
-        with open(path, 'r') as file:
-            file_content = file.read()
+        with open(path, 'rb') as file:
+            stat = os.fstat(file.fileno())
+            header = file.read(HEADER_SIZE)
     except IOError as e:
         raise exceptions.BooException(f"An error occurred while reading the file {path}: {e}")
 
-    updated_content = re.sub(VERSION_PATTERN, f"* Version: {dn_version}", file_content)
+    profiling.count("bytes_read", len(header))
+    match = VERSION_BYTES_REGEX.search(header)
+
+    if not match:
+        raise exceptions.SearchNotFound(f"Version header does not exist in the file {path}")
+
+    start, end = match.span(1)
+
+    return start, end, stat
+
+
+def write_version(path: str, start: int, end: int, dn_version: str) -> None:
+    """
+    Replace the byte range `start:end` of a main file, found by `locate_version`, with a version.
+    """
+    value = dn_version.encode()
 
     try:
-        with open(path, 'w') as file:
-            file.write(updated_content)
+        with profiling.span("write_version"):
+            if len(value) == end - start:
+                with open(path, 'r+b') as file:
+                    file.seek(start)
+                    file.write(value)
+
+                profiling.count("bytes_written", len(value))
+            else:
+                with open(path, 'rb') as file:
+                    helpers.atomic_write(path, _replace_range(file, start, end, value))
     except IOError as e:
         raise exceptions.BooException(f"An error occurred while writing the file {path}: {e}")
 
 
-def version_to_int(dot_notation_version: str) -> int:
-    version_pieces = dot_notation_version.split('.')
-
+def stage_version(path: str, start: int, end: int, dn_version: str, staged_path: str) -> None:
+    """
+    Write a copy of a main file with the byte range `start:end` replaced by a version, leaving the file itself
+    untouched. The copy keeps the permissions of the file and is flushed to disk.
+    """
     try:
-        parse_version_component = lambda: int(version_pieces.pop(0)) if len(version_pieces) else 0
+        with profiling.span("stage_version"), open(path, 'rb') as file, open(staged_path, 'wb') as staged_file:
+            for chunk in _replace_range(file, start, end, dn_version.encode()):
+                staged_file.write(chunk)
+                profiling.count("bytes_written", len(chunk))
+
+            staged_file.flush()
+            os.fsync(staged_file.fileno())
+
+        shutil.copymode(path, staged_path)
+    except IOError as e:
+        raise exceptions.BooException(f"An error occurred while staging the file {path}: {e}")
 
-        major = parse_version_component() * VERSION_COMPONENTS.get('major')
-        minor = parse_version_component() * VERSION_COMPONENTS.get('minor')
-        micro = parse_version_component() * VERSION_COMPONENTS.get('micro')
 
-        return major + minor + micro
-    except ValueError:
-        raise exceptions.InvalidArgumentError(dot_notation_version)
+def _replace_range(file: BinaryIO, start: int, end: int, value: bytes) -> Iterator[bytes]:
+    head = file.read(start)
+    profiling.count("bytes_read", len(head))
+    yield head
+    yield value
+
+    file.seek(end)
+
+    for chunk in iter(lambda: file.read(COPY_CHUNK_SIZE), b""):
+        profiling.count("bytes_read", len(chunk))
+        yield chunk
+
+
+def version_to_int(dot_notation_version: str) -> int:
+    return int(VersionNumber.parse(dot_notation_version))
 
 
 def version_to_dn(version_int: int) -> str:
-    major = version_int // VERSION_COMPONENTS['major']
-    version_int %= VERSION_COMPONENTS['major']
+    return str(VersionNumber(version_int))
+
+
+@total_ordering
+class VersionNumber:
+    """
+    An immutable `major.minor.micro` version packed into a single integer.
+
+    The packing is `major * 10000 + minor * 100 + micro`, the same integer used in zip file names. Components
+    outside `VERSION_BOUNDS` raise `InvalidArgumentError` instead of overflowing into the next component.
+    Arithmetic works on the packed value, so `1.0.99 + 0.0.1` carries over to `1.1.0`.
+    """
+    __slots__ = ("_value",)
+
+    MAX = sum(VERSION_BOUNDS[component] * factor for component, factor in VERSION_COMPONENTS.items())
+
+    def __init__(self, value: int = 0) -> None:
+        """
+        :param value: Packed version.
+        """
+        if not 0 <= value <= self.MAX:
+            raise exceptions.InvalidArgumentError(f"Version {value} is out of range 0.0.0-{version_to_dn(self.MAX)}")
+
+        object.__setattr__(self, "_value", int(value))
+
+    @classmethod
+    def parse(cls, dot_notation_version: str) -> "VersionNumber":
+        """
+        Parse a version of one to three numeric components, missing components are 0.
 
-    minor = version_int // VERSION_COMPONENTS['minor']
-    version_int %= VERSION_COMPONENTS['minor']
+        :raise InvalidArgumentError: The version is not numeric or a component is out of bounds.
+        """
+        match = DOT_NOTATION_REGEX.fullmatch(dot_notation_version.strip())
 
-    micro = version_int // VERSION_COMPONENTS['micro']
+        if not match:
+            raise exceptions.InvalidArgumentError(f"Invalid version '{dot_notation_version}'")
+
+        return cls.of(*(int(component or 0) for component in match.groups()))
+
+    @classmethod
+    def of(cls, major: int = 0, minor: int = 0, micro: int = 0) -> "VersionNumber":
+        components = {"major": major, "minor": minor, "micro": micro}
+
+        for component, value in components.items():
+            if not 0 <= value <= VERSION_BOUNDS[component]:
+                raise exceptions.InvalidArgumentError(
+                    f"Version {component} {value} is out of range 0-{VERSION_BOUNDS[component]}"
+                )
+
+        return cls(sum(value * VERSION_COMPONENTS[component] for component, value in components.items()))
+
+    @classmethod
+    def coerce(cls, version: Union["VersionNumber", int, str]) -> "VersionNumber":
+        if isinstance(version, VersionNumber):
+            return version
+
+        if isinstance(version, str):
+            return cls.parse(version)
+
+        return cls(version)
+
+    @property
+    def major(self) -> int:
+        return self._value // VERSION_COMPONENTS["major"]
+
+    @property
+    def minor(self) -> int:
+        return self._value % VERSION_COMPONENTS["major"] // VERSION_COMPONENTS["minor"]
+
+    @property
+    def micro(self) -> int:
+        return self._value % VERSION_COMPONENTS["minor"]
+
+    def __setattr__(self, name, value) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __int__(self) -> int:
+        return self._value
+
+    def __str__(self) -> str:
+        return f"{self.major}.{self.minor}.{self.micro}"
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}('{self}')"
+
+    def __hash__(self) -> int:
+        return hash(self._value)
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, VersionNumber):
+            return NotImplemented
+
+        return self._value == other._value
+
+    def __lt__(self, other) -> bool:
+        if not isinstance(other, VersionNumber):
+            return NotImplemented
+
+        return self._value < other._value
+
+    def __add__(self, other: Union["VersionNumber", int, str]) -> "VersionNumber":
+        return VersionNumber(self._value + int(VersionNumber.coerce(other)))
+
+    def __sub__(self, other: Union["VersionNumber", int, str]) -> "VersionNumber":
+        return VersionNumber(self._value - int(VersionNumber.coerce(other)))
+
+
+class VersionColumn:
+    """
+    A column of packed versions stored in a signed 64-bit `array`.
+
+    Whole columns are parsed, bumped, compared and formatted at once. Entries that cannot be parsed or whose
+    bump leaves `VersionNumber` bounds hold `INVALID` instead of raising, so one bad plugin does not fail the
+    column. Bumps and comparisons of columns of `VECTORIZE_THRESHOLD` versions or more run on NumPy when it is
+    installed.
+    """
+    __slots__ = ("values",)
+
+    INVALID = -1
+
+    def __init__(self, values: Iterable[int] = ()) -> None:
+        """
+        :param values: Packed versions, `INVALID` for missing entries.
+        """
+        self.values: array = values if isinstance(values, array) else array('q', values)
+
+    @classmethod
+    def parse(cls, dot_notation_versions: Iterable[Optional[str]]) -> "VersionColumn":
+        """
+        Parse versions, every distinct string is parsed once.
+        """
+        parsed = {}
+        values = array('q')
+
+        for dot_notation_version in dot_notation_versions:
+            if dot_notation_version not in parsed:
+                try:
+                    parsed[dot_notation_version] = int(VersionNumber.parse(dot_notation_version))
+                except (exceptions.InvalidArgumentError, AttributeError):
+                    parsed[dot_notation_version] = cls.INVALID
+
+            values.append(parsed[dot_notation_version])
+
+        return cls(values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index: int) -> Optional[VersionNumber]:
+        value = self.values[index]
+
+        return VersionNumber(value) if value != self.INVALID else None
+
+    def __iter__(self) -> Iterator[Optional[VersionNumber]]:
+        return (self[index] for index in range(len(self)))
+
+    def bump(self, delta: Union[VersionNumber, int]) -> "VersionColumn":
+        """
+        Add a packed delta, which may be negative, to every version.
+        """
+        delta = int(delta)
+        numpy = _numpy(len(self))
+
+        if numpy is None:
+            return VersionColumn(array('q', (
+                value + delta if value != self.INVALID and 0 <= value + delta <= VersionNumber.MAX else self.INVALID
+                for value in self.values
+            )))
+
+        values = numpy.frombuffer(self.values, dtype=numpy.int64)
+        bumped = values + delta
+        bumped[(values == self.INVALID) | (bumped < 0) | (bumped > VersionNumber.MAX)] = self.INVALID
+
+        return VersionColumn(array('q', bumped.tobytes()))
+
+    def compare(self, other: "VersionColumn") -> array:
+        """
+        Compare with a column of the same length.
+
+        :return: -1, 0 or 1 per entry, like `cmp`. `INVALID` entries are lower than any version.
+        """
+        if len(self) != len(other):
+            raise exceptions.InvalidArgumentError(f"Cannot compare {len(self)} versions with {len(other)}")
+
+        numpy = _numpy(len(self))
+
+        if numpy is None:
+            return array('b', ((a > b) - (a < b) for a, b in zip(self.values, other.values)))
+
+        signs = numpy.sign(numpy.frombuffer(self.values, dtype=numpy.int64)
+                           - numpy.frombuffer(other.values, dtype=numpy.int64))
+
+        return array('b', signs.astype(numpy.int8).tobytes())
+
+    def format(self) -> List[Optional[str]]:
+        """
+        :return: Dot notation versions, None for `INVALID` entries. Every distinct version is formatted once.
+        """
+        formatted = {self.INVALID: None}
+
+        for value in self.values:
+            if value not in formatted:
+                formatted[value] = str(VersionNumber(value))
+
+        return [formatted[value] for value in self.values]
+
+
+def _numpy(size: int):
+    """
+    :return: The NumPy module for columns worth vectorizing, None when the column is small or NumPy is missing.
+    """
+    if size < VECTORIZE_THRESHOLD:
+        return None
+
+    try:
+        import numpy
+    except ImportError:
+        return None
 
-    return f"{major}.{minor}.{micro}"
+    return numpy
 
 
 def update_plugin_version(plugin_absolute_path: str, increase: int, decrease: int):